@@ -0,0 +1,79 @@
+"""base tables
+
+Revision ID: 0f6d2a8b4c17
+Revises: c020ad25056f
+Create Date: 2026-10-18 13:52:41.562907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0f6d2a8b4c17'
+down_revision: Union[str, Sequence[str], None] = 'c020ad25056f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # init 리비전은 비어 있고 테이블은 예전에 create_all로 만들었음.
+    # 이미 테이블이 있는 DB는 건너뛰고(if_not_exists), 새 DB는 여기서 그때(init 시점) 모양 그대로 만듦
+    op.create_table(
+        "schools",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("region", sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index("ix_schools_id", "schools", ["id"], unique=False, if_not_exists=True)
+    op.create_index("ix_schools_name", "schools", ["name"], unique=True, if_not_exists=True)
+
+    op.create_table(
+        "cafeterias",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("school_id", sa.Integer(), nullable=True),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("url", sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(["school_id"], ["schools.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index("ix_cafeterias_id", "cafeterias", ["id"], unique=False, if_not_exists=True)
+
+    op.create_table(
+        "menus",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("cafeteria_id", sa.Integer(), nullable=True),
+        sa.Column("date", sa.Date(), nullable=True),
+        sa.Column("meal_type", sa.String(), nullable=True),
+        sa.Column("menu_text", sa.Text(), nullable=True),
+        sa.Column("image_url_2d", sa.String(), nullable=True),
+        sa.Column("image_url_3d", sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(["cafeteria_id"], ["cafeterias.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index("ix_menus_id", "menus", ["id"], unique=False, if_not_exists=True)
+    op.create_index("ix_menus_date", "menus", ["date"], unique=False, if_not_exists=True)
+
+    op.create_table(
+        "inquiries",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("category", sa.String(), nullable=True),
+        sa.Column("content", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index("ix_inquiries_id", "inquiries", ["id"], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # 운영 DB는 이 리비전 전부터(create_all) 테이블이 있었으니 되돌릴 때 지우지 않음
+    pass
@@ -0,0 +1,49 @@
+"""menu day summaries
+
+Revision ID: 3b8e6f2d7a14
+Revises: e17b3d5a9c42
+Create Date: 2026-10-18 23:12:40.318902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8e6f2d7a14'
+down_revision: Union[str, Sequence[str], None] = 'e17b3d5a9c42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "menu_day_summaries",
+        sa.Column("school_id", sa.Integer(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("menu_count", sa.Integer(), nullable=False),
+        sa.Column("cafeteria_count", sa.Integer(), nullable=False),
+        sa.Column("image_count", sa.Integer(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["school_id"], ["schools.id"]),
+        sa.PrimaryKeyConstraint("school_id", "date"),
+    )
+
+    # 기존 메뉴로 요약을 한 번에 채움 (저장/청소 때 계산하는 것과 같은 집계)
+    op.get_bind().execute(sa.text(
+        "INSERT INTO menu_day_summaries "
+        "(school_id, date, menu_count, cafeteria_count, image_count, version, updated_at) "
+        "SELECT cafeterias.school_id, menus.date, COUNT(menus.id), COUNT(DISTINCT menus.cafeteria_id), "
+        "COUNT(menus.image_url_3d), 1, CURRENT_TIMESTAMP "
+        "FROM menus JOIN cafeterias ON cafeterias.id = menus.cafeteria_id "
+        "GROUP BY cafeterias.school_id, menus.date"
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("menu_day_summaries")
@@ -0,0 +1,44 @@
+"""menus unique (cafeteria_id, date, meal_type)
+
+Revision ID: 5b7e2c9d41a3
+Revises: 0f6d2a8b4c17
+Create Date: 2026-10-18 14:05:12.204118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2c9d41a3'
+down_revision: Union[str, Sequence[str], None] = '0f6d2a8b4c17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 예전 저장 로직이 동시에 돌면서 생긴 중복 행이 있으면 유니크 인덱스가 안 만들어지니까
+    # (식당, 날짜, 식사)마다 가장 마지막에 저장된 것만 남기고 지움
+    op.execute(
+        """
+        DELETE FROM menus
+        WHERE id NOT IN (
+            SELECT MAX(id) FROM menus GROUP BY cafeteria_id, date, meal_type
+        )
+        """
+    )
+    op.create_index(
+        "uq_menus_cafeteria_date_meal",
+        "menus",
+        ["cafeteria_id", "date", "meal_type"],
+        unique=True,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_menus_cafeteria_date_meal", table_name="menus", if_exists=True)
@@ -0,0 +1,47 @@
+"""hot query indexes
+
+Revision ID: 8d3f6a1c2e90
+Revises: 5b7e2c9d41a3
+Create Date: 2026-10-18 16:40:27.913402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3f6a1c2e90'
+down_revision: Union[str, Sequence[str], None] = '5b7e2c9d41a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 학교 -> 식당 찾기 (/daily 조인, 저장할 때 식당 이름 조회)
+    op.create_index(
+        "ix_cafeterias_school_id_name",
+        "cafeterias",
+        ["school_id", "name"],
+        unique=False,
+        if_not_exists=True,
+    )
+    # 아직 이미지가 없는 메뉴만 담는 작은 인덱스 (AIService가 날짜별로 찾음, 이미지가 생기면 인덱스에서 빠짐)
+    # (식당, 날짜) 조회는 uq_menus_cafeteria_date_meal 앞부분으로 이미 됨
+    op.create_index(
+        "ix_menus_date_missing_image",
+        "menus",
+        ["date"],
+        unique=False,
+        sqlite_where=sa.text("image_url_3d IS NULL"),
+        postgresql_where=sa.text("image_url_3d IS NULL"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_menus_date_missing_image", table_name="menus", if_exists=True)
+    op.drop_index("ix_cafeterias_school_id_name", table_name="cafeterias", if_exists=True)
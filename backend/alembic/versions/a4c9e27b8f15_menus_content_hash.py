@@ -0,0 +1,77 @@
+"""menus content_hash
+
+Revision ID: a4c9e27b8f15
+Revises: 8d3f6a1c2e90
+Create Date: 2026-10-18 19:12:44.508127
+
+"""
+import hashlib
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c9e27b8f15'
+down_revision: Union[str, Sequence[str], None] = '8d3f6a1c2e90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH = 1000
+
+# app/services/normalizer.py의 normalize_item 규칙을 그대로 옮겨둠 (마이그레이션은 앱 코드를 import하지 않음)
+FULLWIDTH_TABLE = {code: code - 0xFEE0 for code in range(0xFF01, 0xFF5F)}
+FULLWIDTH_TABLE[0x3000] = ord(" ")
+NOISE = re.compile(r"\(\s*[0-9.,\s]+\)|[\[(]\s*[0-9.,]+\s*원\s*[\])]")
+WHITESPACE = re.compile(r"\s+")
+PRICE_ONLY = re.compile(r"^[0-9.,]+\s*원?$")
+HAS_TEXT = re.compile(r"[가-힣A-Za-z\u4e00-\u9fff]")
+NOTICE_KEYWORDS = ("※", "운영시간", "원산지", "등록된 식단이 없습니다")
+
+
+def _normalize_item(text: str) -> str:
+    text = NOISE.sub("", text.translate(FULLWIDTH_TABLE))
+    text = WHITESPACE.sub(" ", text).strip().strip('"').strip()
+    if not text or PRICE_ONLY.match(text) or not HAS_TEXT.search(text):
+        return ""
+    if any(keyword in text for keyword in NOTICE_KEYWORDS):
+        return ""
+    return text
+
+
+def _content_hash(menu_text: str) -> str:
+    """
+    예전 정리 방식으로 저장된 menu_text를 줄 단위로 다시 정리한 뒤 해시
+    (= 다음 크롤링 때 db_service가 만들 menu_text의 normalizer.content_hash)
+    """
+    items = []
+    for line in (menu_text or "").split("\n"):
+        item = _normalize_item(line)
+        if item and item not in items:
+            items.append(item)
+    return hashlib.sha256("\n".join(items).encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("menus", sa.Column("content_hash", sa.String(), nullable=True))
+
+    # 기존 메뉴도 해시를 채워둠 (비어 있으면 다음 크롤링 때 전부 '변경'으로 잡혀서 이미지가 다 지워짐)
+    # 저장된 menu_text는 새 normalizer를 거치기 전 모양이라, 같은 규칙으로 다시 정리한 결과로 해시를 냄.
+    # menu_text 자체는 그대로 둠 (이미지/번역/요약이 이 글자 기준이라 잡음 차이로 다시 만들 필요 없음)
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT id, menu_text FROM menus WHERE content_hash IS NULL")).all()
+    update = sa.text("UPDATE menus SET content_hash = :hash WHERE id = :id")
+    for i in range(0, len(rows), BACKFILL_BATCH):
+        bind.execute(update, [
+            {"id": row_id, "hash": _content_hash(menu_text)}
+            for row_id, menu_text in rows[i:i + BACKFILL_BATCH]
+        ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("menus") as batch_op:
+        batch_op.drop_column("content_hash")
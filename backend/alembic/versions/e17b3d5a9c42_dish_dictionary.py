@@ -0,0 +1,70 @@
+"""dish dictionary
+
+Revision ID: e17b3d5a9c42
+Revises: a4c9e27b8f15
+Create Date: 2026-10-18 21:03:51.774260
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e17b3d5a9c42'
+down_revision: Union[str, Sequence[str], None] = 'a4c9e27b8f15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH = 1000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "dishes",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("name_en", sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_dishes_name", "dishes", ["name"], unique=True)
+
+    op.create_table(
+        "menu_dishes",
+        sa.Column("menu_id", sa.Integer(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("dish_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["dish_id"], ["dishes.id"]),
+        sa.ForeignKeyConstraint(["menu_id"], ["menus.id"]),
+        sa.PrimaryKeyConstraint("menu_id", "position"),
+    )
+    op.create_index("ix_menu_dishes_dish_id", "menu_dishes", ["dish_id"], unique=False)
+
+    # 기존 메뉴도 줄(항목)마다 요리 사전에 연결 (저장 때와 같은 규칙: menu_text를 줄바꿈으로 나눔)
+    bind = op.get_bind()
+    menus = [
+        (menu_id, [name for name in (menu_text or "").split("\n") if name])
+        for menu_id, menu_text in bind.execute(sa.text("SELECT id, menu_text FROM menus")).all()
+    ]
+    names = list(dict.fromkeys(name for _, items in menus for name in items))
+    for i in range(0, len(names), BACKFILL_BATCH):
+        bind.execute(sa.text("INSERT INTO dishes (name) VALUES (:name)"), [{"name": name} for name in names[i:i + BACKFILL_BATCH]])
+
+    dish_ids = dict(bind.execute(sa.text("SELECT name, id FROM dishes")).all())
+    links = [
+        {"menu_id": menu_id, "position": position, "dish_id": dish_ids[name]}
+        for menu_id, items in menus for position, name in enumerate(items)
+    ]
+    insert_link = sa.text("INSERT INTO menu_dishes (menu_id, position, dish_id) VALUES (:menu_id, :position, :dish_id)")
+    for i in range(0, len(links), BACKFILL_BATCH):
+        bind.execute(insert_link, links[i:i + BACKFILL_BATCH])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_menu_dishes_dish_id", table_name="menu_dishes")
+    op.drop_table("menu_dishes")
+    op.drop_index("ix_dishes_name", table_name="dishes")
+    op.drop_table("dishes")
@@ -0,0 +1,29 @@
+from datetime import date
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.services.menu_archive import menu_archive
+
+router = APIRouter()
+
+@router.get("/archive")
+def get_archived_menus(
+    school_name: str = Query(..., description="학교 이름 (예: KAIST)"),
+    start: date = Query(..., description="시작 날짜 (예: 2026-03-02)"),
+    end: date = Query(..., description="끝 날짜 (예: 2026-03-31)"),
+):
+    """
+    청소 작업이 보관한 지난 메뉴 (DB는 안 보고 보관 파일만 읽음).
+    한 줄에 메뉴 하나씩 JSON (NDJSON)으로 흘려보내서 기간이 길어도 서버 메모리를 거의 안 씀.
+    """
+    if end < start:
+        raise HTTPException(status_code=400, detail="끝 날짜가 시작 날짜보다 빠릅니다.")
+    if (end - start).days + 1 > settings.MENU_ARCHIVE_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {settings.MENU_ARCHIVE_MAX_DAYS}일까지 조회할 수 있습니다.")
+
+    # 일반 제너레이터라 Starlette가 스레드에서 돌림 (파일 읽기가 이벤트 루프를 안 막음)
+    return StreamingResponse(
+        menu_archive.iter_lines(start, end, school_name),
+        media_type="application/x-ndjson",
+    )
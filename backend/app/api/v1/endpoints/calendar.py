@@ -0,0 +1,67 @@
+import calendar as month_calendar
+from datetime import date, datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+
+from app.db.session import get_read_db
+from app.db import models
+from app.schemas.response import CalendarDayResponse, CalendarResponse
+from app.services.dimension_cache import dimension_cache
+from app.core.http_cache import cached_response, daily_max_age
+from app.services.response_cache import CachedBody, daily_cache
+
+router = APIRouter()
+
+
+@router.get("/calendar", response_model=CalendarResponse)
+async def get_calendar(
+    request: Request,
+    school_name: str = Query(..., description="학교 이름 (예: KAIST)"),
+    month: str = Query(..., description="월 (예: 2026-03)"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    한 달 동안 어떤 날짜에 메뉴/이미지가 있는지 (캘린더 점 표시용).
+    menus를 세지 않고 저장/이미지 생성/청소가 같이 고쳐두는 요약(menu_day_summaries)만 읽음.
+    메뉴가 없는 날짜는 안 들어감. 캐시/ETag/압축은 /daily와 같음
+    """
+    try:
+        first = datetime.strptime(month, "%Y-%m").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="월은 YYYY-MM 형식이어야 합니다.")
+    last = date(first.year, first.month, month_calendar.monthrange(first.year, first.month)[1])
+
+    cached = daily_cache.get("calendar", school_name, first, last)
+    if cached is not None:
+        return cached_response(request, cached, daily_max_age(last))
+    generation = daily_cache.generation
+
+    school = await dimension_cache.get_school(db, school_name)
+    if not school:
+        raise HTTPException(status_code=404, detail="해당 학교를 찾을 수 없습니다.")
+
+    # (학교, 날짜) 기본 키 범위 검색 한 번 (한 달이면 최대 31행)
+    summary = models.MenuDaySummary
+    stmt = (
+        select(summary.date, summary.menu_count, summary.cafeteria_count, summary.image_count, summary.version)
+        .where(summary.school_id == school.id, summary.date.between(first, last))
+        .order_by(summary.date)
+    )
+    result = await db.execute(stmt)
+
+    entry = CachedBody(CalendarResponse(
+        school_name=school.name,
+        month=first.strftime("%Y-%m"),
+        days=[
+            CalendarDayResponse(
+                date=row.date,
+                menu_count=row.menu_count,
+                cafeteria_count=row.cafeteria_count,
+                image_count=row.image_count,
+                version=row.version,
+            ) for row in result.all()
+        ],
+    ).model_dump_json().encode("utf-8"))
+    daily_cache.put("calendar", school_name, first, last, entry, generation)
+    return cached_response(request, entry, daily_max_age(last))
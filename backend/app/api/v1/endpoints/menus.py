@@ -1,69 +1,140 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from sqlalchemy.orm import contains_eager
-from datetime import date
+from sqlalchemy import select
+from datetime import date, timedelta
+from typing import List
 
-from app.db.session import get_db
+from app.core.config import settings
+from app.db.session import get_read_db
 from app.db import models
-from app.schemas.response import DailyMenuResponse, CafeteriaResponse, MenuResponse
+from app.schemas.response import DailyMenuResponse, CafeteriaResponse, MenuResponse, DayMenuResponse, RangeMenuResponse
+from app.services.dimension_cache import SchoolEntry, dimension_cache
+from app.core.http_cache import cached_response, daily_max_age
+from app.services.response_cache import CachedBody, daily_cache
 
 router = APIRouter()
 
+
+def _cafeteria_responses(school: SchoolEntry, menus_by_cafeteria: dict) -> List[CafeteriaResponse]:
+    """식당 id -> 메뉴들을 응답 모양으로 (식당 순서는 등록 순서, 메뉴가 있는 식당만)"""
+    cafeteria_responses = []
+    for caf_name, caf_id in school.cafeterias.items():
+        caf_menus = menus_by_cafeteria.get(caf_id)
+        if caf_menus:
+            menu_list = [
+                MenuResponse(
+                    meal_type=m.meal_type,
+                    menu_text=m.menu_text,
+                    image_url_3d=m.image_url_3d
+                ) for m in caf_menus
+            ]
+            cafeteria_responses.append(CafeteriaResponse(name=caf_name, menus=menu_list))
+    return cafeteria_responses
+
+
 @router.get("/daily", response_model=DailyMenuResponse)
 async def get_daily_menu(
+    request: Request, # ETag/압축 헤더 확인용
     school_name: str = Query(..., description="학교 이름 (예: KAIST)"),
     target_date: date = Query(..., description="날짜 (예: 2026-01-16)"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db), # 읽기 전용 연결 (크롤링이 쓰는 중에도 안 기다림)
 ):
-    # 1. 학교 존재 여부 먼저 확인 (이건 가벼우니까 따로 해도 됨)
-    # 쿼리 한 번으로 합칠 수도 있지만, 404 에러를 명확히 주려고 남겨둠
-    school_result = await db.execute(select(models.School).where(models.School.name == school_name))
-    school = school_result.scalars().first()
+    # 0. 만들어둔 응답이 있으면 그대로 (DB 연결도 안 받음, ETag가 같으면 본문 없이 304)
+    cached = daily_cache.get("daily", school_name, target_date, target_date)
+    if cached is not None:
+        return cached_response(request, cached, daily_max_age(target_date))
+    generation = daily_cache.generation
+
+    # 1. 학교 존재 여부 확인 (학교/식당 이름 -> id는 메모리 캐시에서, DB 안 감)
+    school = await dimension_cache.get_school(db, school_name)
     
     if not school:
         raise HTTPException(status_code=404, detail="해당 학교를 찾을 수 없습니다.")
 
-    # 2. [핵심] 식당 + 메뉴(해당 날짜) 한 방에 조회 (Join & Contains Eager)
-    # 설명: "식당(Cafeteria)을 찾는데, 메뉴(Menu) 테이블이랑 합쳐(Outer Join). 
-    #       단, 메뉴는 날짜가 target_date인 것만 합쳐.
-    #       그리고 그 합친 결과(메뉴 데이터)를 파이썬 객체의 .menus 속성에 미리 채워놔(contains_eager)."
+    # 2. [핵심] 이 학교 식당들의 해당 날짜 메뉴만 한 방에 조회
+    # 식당 id를 이미 알고 있으니 학교/식당 테이블 조인 없이 메뉴 테이블만 봄
+    # ((식당, 날짜, 식사) 유니크 인덱스 앞부분으로 바로 찾아감)
     stmt = (
-        select(models.Cafeteria)
-        .join(models.School)  # 학교로 필터링하기 위해 조인
-        .outerjoin(
-            models.Menu, 
-            and_(
-                models.Menu.cafeteria_id == models.Cafeteria.id,
-                models.Menu.date == target_date
-            )
+        select(models.Menu)
+        .where(
+            models.Menu.cafeteria_id.in_(list(school.cafeterias.values())),
+            models.Menu.date == target_date,
         )
-        .where(models.School.name == school_name)
-        .options(contains_eager(models.Cafeteria.menus)) # 👈 이게 마법의 키워드야!
+        .order_by(models.Menu.cafeteria_id, models.Menu.id)
     )
 
     result = await db.execute(stmt)
-    # unique()는 식당이 중복되어 나오는 걸 방지해 (1:N 조인이라서 필수)
-    cafeterias = result.unique().scalars().all()
+    menus_by_cafeteria = {}
+    for m in result.scalars().all():
+        menus_by_cafeteria.setdefault(m.cafeteria_id, []).append(m)
     
-    # 3. 데이터 변환 (이제 DB 조회 안 함! 메모리에 있는 거 꺼내 쓰기만 하면 됨)
-    cafeteria_responses = []
+    # 3. 데이터 변환 (식당 순서는 등록 순서, 메뉴가 있는 식당만)
+    cafeteria_responses = _cafeteria_responses(school, menus_by_cafeteria)
 
-    for caf in cafeterias:
-        # 이미 caf.menus 안에 해당 날짜 메뉴가 들어있음! (쿼리 안 날아감)
-        if caf.menus:
-            menu_list = [
-                MenuResponse(
-                    meal_type=m.meal_type,
-                    menu_text=m.menu_text,
-                    image_url_3d=m.image_url_3d
-                ) for m in caf.menus
-            ]
-            cafeteria_responses.append(CafeteriaResponse(name=caf.name, menus=menu_list))
-
-    # 4. 최종 결과 반환
-    return DailyMenuResponse(
+    # 4. 최종 결과를 JSON 바이트로 만들고 (ETag + 압축본도 같이) 캐시에 넣고 반환
+    entry = CachedBody(DailyMenuResponse(
         school_name=school.name,
         date=target_date,
         cafeterias=cafeteria_responses
-    )
\ No newline at end of file
+    ).model_dump_json().encode("utf-8"))
+    daily_cache.put("daily", school_name, target_date, target_date, entry, generation)
+    return cached_response(request, entry, daily_max_age(target_date))
+
+
+@router.get("/range", response_model=RangeMenuResponse)
+async def get_menu_range(
+    request: Request,
+    school_name: str = Query(..., description="학교 이름 (예: KAIST)"),
+    start: date = Query(..., description="시작 날짜 (예: 2026-03-02)"),
+    end: date = Query(..., description="끝 날짜 (예: 2026-03-08)"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    기간(최대 MENU_RANGE_MAX_DAYS일) 메뉴를 날짜별로 묶어서 한 번에 (캘린더/주간 보기에서 날짜마다 /daily를 부르지 않게).
+    메뉴가 없는 날짜도 빈 식당 목록으로 들어감. 캐시/ETag/압축은 /daily와 같음
+    """
+    if end < start:
+        raise HTTPException(status_code=400, detail="끝 날짜가 시작 날짜보다 빠릅니다.")
+    if (end - start).days + 1 > settings.MENU_RANGE_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {settings.MENU_RANGE_MAX_DAYS}일까지 조회할 수 있습니다.")
+
+    cached = daily_cache.get("range", school_name, start, end)
+    if cached is not None:
+        return cached_response(request, cached, daily_max_age(end))
+    generation = daily_cache.generation
+
+    school = await dimension_cache.get_school(db, school_name)
+    if not school:
+        raise HTTPException(status_code=404, detail="해당 학교를 찾을 수 없습니다.")
+
+    # 기간 전체를 쿼리 한 번으로 ((식당, 날짜, 식사) 유니크 인덱스: 식당마다 날짜 범위만 훑음)
+    # 응답에 쓰는 컬럼만 읽음 (ORM 객체를 메뉴 수백 개만큼 만들 필요 없음)
+    stmt = (
+        select(
+            models.Menu.date, models.Menu.cafeteria_id, models.Menu.meal_type,
+            models.Menu.menu_text, models.Menu.image_url_3d,
+        )
+        .where(
+            models.Menu.cafeteria_id.in_(list(school.cafeterias.values())),
+            models.Menu.date.between(start, end),
+        )
+        .order_by(models.Menu.date, models.Menu.cafeteria_id, models.Menu.id)
+    )
+    result = await db.execute(stmt)
+    menus_by_day = {}
+    for row in result.all():
+        menus_by_day.setdefault(row.date, {}).setdefault(row.cafeteria_id, []).append(row)
+
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    entry = CachedBody(RangeMenuResponse(
+        school_name=school.name,
+        start=start,
+        end=end,
+        days=[
+            DayMenuResponse(date=day, cafeterias=_cafeteria_responses(school, menus_by_day.get(day, {})))
+            for day in days
+        ],
+    ).model_dump_json().encode("utf-8"))
+    daily_cache.put("range", school_name, start, end, entry, generation)
+    # 기간의 마지막 날짜 기준 (그 날이 지났으면 기간 전체가 지난 날짜)
+    return cached_response(request, entry, daily_max_age(end))
@@ -1,14 +1,85 @@
 import os
+from typing import Dict
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite+aiosqlite:////data/haksik.db"
 
+    # SQLite 튜닝 (연결할 때마다 PRAGMA로 적용, sqlite일 때만)
+    DB_JOURNAL_MODE: str = "WAL"            # WAL이면 크롤링이 쓰는 중에도 API 읽기가 안 막힘
+    DB_SYNCHRONOUS: str = "NORMAL"          # WAL에서는 NORMAL이어도 DB가 안 깨짐 (전원이 나가면 마지막 커밋만 잃을 수 있음)
+    DB_BUSY_TIMEOUT_MS: int = 5000          # 잠겨 있으면 바로 에러 내지 말고 이만큼 기다림
+    DB_MMAP_SIZE: int = 64 * 1024 * 1024    # 파일을 메모리에 매핑해서 읽기 (256MB VM이라 작게)
+    DB_CACHE_SIZE_KB: int = 4096            # 연결 하나당 페이지 캐시
+    DB_READ_POOL_SIZE: int = 4              # API 읽기 전용 연결 수 (쓰기 연결은 항상 1개)
+    DB_WRITE_POOL_TIMEOUT: float = 300.0    # 쓰기 연결이 비기를 기다리는 최대 시간 (초, 크롤링 저장이 줄을 섬)
+    # 학교/식당 이름 -> id 메모리 캐시를 DB에서 다시 읽는 주기 (초, 다른 프로세스가 추가한 걸 반영)
+    DIMENSION_CACHE_TTL: float = 600.0
+    # /daily 응답 메모리 캐시 (0이면 끔). 이 프로세스의 저장/이미지/청소는 바로 반영, 다른 프로세스가 바꾼 건 TTL 뒤에
+    DAILY_CACHE_MAX_BYTES: int = 8 * 1024 * 1024
+    DAILY_CACHE_TTL: float = 600.0
+    # /daily HTTP 캐시 (ETag + Cache-Control). 지난 날짜는 거의 안 바뀌니까 길게, 오늘/앞으로는 짧게 (초)
+    DAILY_MAX_AGE_PAST: int = 24 * 60 * 60
+    DAILY_MAX_AGE_CURRENT: int = 60
+    DAILY_BROTLI_QUALITY: int = 5    # 11은 크기가 몇 % 더 줄 뿐인데 응답 하나에 ~18ms라 이벤트 루프가 밀림
+    MENU_RANGE_MAX_DAYS: int = 31    # /range 한 번에 볼 수 있는 최대 기간 (일)
+
+    # 지난 메뉴 보관 (청소 작업이 DB에서 지우기 전에 날짜별 jsonl.gz로 옮겨둠)
+    MENU_ARCHIVE_DIR: str = "/data/archive/menus"
+    MENU_DELETE_CHUNK: int = 500        # 한 번에 지우는 메뉴 수 (지울 때마다 커밋해서 쓰기 잠금을 짧게)
+    MENU_ARCHIVE_MAX_DAYS: int = 366    # 보관 조회 API 한 번에 볼 수 있는 최대 기간 (일)
+
+    # DB 정리 작업 (매일 새벽: 지난 메뉴 보관/삭제 -> 빈 페이지 반납 -> 통계 갱신, sqlite일 때만 뒤쪽 단계)
+    DB_AUTO_VACUUM: str = "INCREMENTAL"     # 지운 만큼 파일을 조금씩 줄일 수 있게 (NONE이면 파일이 계속 커지기만 함)
+    DB_MAINT_BUDGET: float = 120.0          # 정리 작업 전체에 쓸 수 있는 최대 시간 (초, 남은 건 다음 날)
+    DB_MAINT_CHUNK_SECONDS: float = 0.2     # 삭제/vacuum 한 조각이 쓰기 잠금을 잡는 목표 시간 (넘으면 조각을 줄임)
+    DB_MAINT_VACUUM_PAGES: int = 512        # incremental_vacuum 한 번에 반납하는 페이지 수 (시작값)
+    DB_ANALYSIS_LIMIT: int = 1000           # ANALYZE가 인덱스마다 훑는 최대 행 수 (통계는 대충이면 충분)
+
     # .env 파일에 DISCORD_WEBHOOK_URL=... 형식으로 추가해야 해!
     DISCORD_WEBHOOK_URL: str = ""
 
+    # 크롤러 HTTP 클라이언트 (호스트별 커넥션 풀)
+    CRAWLER_HTTP2: bool = True                  # h2 패키지가 있으면 HTTP/2 사용
+    CRAWLER_MAX_CONNECTIONS_PER_HOST: int = 5   # 호스트당 최대 동시 연결 수
+    CRAWLER_MAX_KEEPALIVE_PER_HOST: int = 5     # 호스트당 유지할 keep-alive 연결 수
+    CRAWLER_KEEPALIVE_EXPIRY: float = 60.0      # 놀고 있는 연결을 닫기까지의 시간 (초)
+    # 학교별 예의 규칙 덮어쓰기 (JSON, 예: {"ewha": {"max_in_flight": 2, "min_interval": 0.5}})
+    CRAWLER_POLITENESS: Dict[str, Dict[str, float]] = {}
+    # 조건부 요청 캐시 (ETag/Last-Modified + 본문 해시) 저장 위치
+    CRAWLER_CACHE_PATH: str = "/data/crawler/fetch_cache.json"
+    # HTML 원본 스냅샷 저장소 (재파싱/오프라인 디버깅/벤치마크용)
+    CRAWLER_SNAPSHOT_DIR: str = "/data/snapshots"
+    CRAWLER_SNAPSHOT_MAX_BYTES: int = 200 * 1024 * 1024  # 이 용량을 넘으면 오래된 것부터 삭제
+    CRAWLER_REPLAY: bool = False    # True면 네트워크 대신 스냅샷 저장소에서 읽음 (학교 사이트 안 건드림)
+    CRAWLER_HTML_BACKEND: str = "auto"  # auto / selectolax / lxml / html.parser (없는 건 알아서 건너뜀)
+
+    # 크롤러 장애 대응 (타임아웃 / 재시도 / 서킷 브레이커)
+    CRAWLER_CONNECT_TIMEOUT: float = 5.0    # 연결 타임아웃 (읽기 타임아웃은 학교별로 따로)
+    CRAWLER_JOB_DEADLINE: float = 90.0      # 학교 하나 수집에 쓸 수 있는 최대 시간 (초)
+    CRAWLER_MAX_RETRIES: int = 2            # 일시적 오류(429/5xx/연결 끊김) 재시도 횟수
+    CRAWLER_BACKOFF_BASE: float = 0.5       # 재시도 대기 시작값 (지수 증가 + 랜덤 흔들기)
+    CRAWLER_BACKOFF_MAX: float = 8.0        # 재시도 대기 최댓값
+    CRAWLER_BREAKER_THRESHOLD: int = 5      # 연속 실패가 이만큼 쌓이면 그 호스트는 잠시 차단
+    CRAWLER_BREAKER_COOLDOWN: float = 120.0 # 차단 유지 시간 (초)
+
+    # AutoFiller 파이프라인 (수집 -> 파싱 -> 저장 -> 이미지)
+    SYNC_FETCH_WORKERS: int = 4     # 동시에 사이트를 긁는 작업자 수
+    SYNC_PARSE_WORKERS: int = 2     # HTML 파싱 작업자 수
+    # 파싱(CPU 작업)을 이벤트 루프 밖에서 돌리는 방식: thread / process / off (루프에서 바로)
+    # thread(기본값): 메모리 추가 없음, 루프는 안 막힘 (GIL 때문에 파싱 중엔 API가 조금 느려질 수 있음)
+    # process: 코어를 여러 개 쓰지만 작업자마다 파이썬 + bs4/lxml/selectolax를 다시 올려서 하나당 수십 MB.
+    #          fly.toml VM(256MB, CPU 1개)에서는 쓰지 말고, 메모리/코어가 넉넉할 때만 켤 것
+    SYNC_PARSE_POOL: str = "thread"
+    SYNC_PARSE_POOL_SIZE: int = 2
+    SYNC_IMAGE_WORKERS: int = 1     # 이미지 생성 작업자 수 (DB 저장은 항상 1명)
+    SYNC_QUEUE_SIZE: int = 8        # 단계 사이 대기열 크기 (꽉 차면 앞 단계가 기다림)
+
+    # AI 이미지 생성
+    AI_TRANSLATE_MAX_DISHES: int = 200  # 한 번에 번역할 최대 요리 수 (나머지는 다음 실행 때)
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -0,0 +1,80 @@
+from datetime import date, datetime
+from typing import Dict, Optional
+from fastapi import Request, Response
+from pytz import timezone
+from app.core.config import settings
+from app.services.response_cache import CachedBody
+
+KST = timezone("Asia/Seoul")
+# 압축 방식마다 ETag 뒤에 붙이는 표시 (표현이 다르면 강한 ETag도 달라야 해서)
+ETAG_SUFFIX = {"br": "-br", "gzip": "-gz"}
+
+
+def daily_max_age(day: date) -> int:
+    """
+    지난 날짜는 메뉴가 더 안 바뀌니까 길게, 오늘/앞으로는 크롤링/이미지 생성으로 바뀔 수 있어서 짧게.
+    기간(/range)은 마지막 날짜로 판단
+    """
+    if day < datetime.now(KST).date():
+        return settings.DAILY_MAX_AGE_PAST
+    return settings.DAILY_MAX_AGE_CURRENT
+
+
+def choose_encoding(accept_encoding: Optional[str], available: Dict[str, bytes]) -> Optional[str]:
+    """Accept-Encoding 중에서 미리 압축해둔 게 있는 것 (br > gzip, q=0이면 제외). 없으면 None(원본)"""
+    if not accept_encoding or not available:
+        return None
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        params = params.replace(" ", "").lower()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if quality > 0:
+            accepted.add(name.strip().lower())
+    for encoding in ("br", "gzip"):
+        if encoding in available and (encoding in accepted or "*" in accepted):
+            return encoding
+    return None
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match에 같은 내용의 ETag가 있는지 (압축 표시/W/ 는 떼고 내용 해시만 비교)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        candidate = candidate.removeprefix("W/").strip('"')
+        for suffix in ETAG_SUFFIX.values():
+            candidate = candidate.removesuffix(suffix)
+        if candidate == etag:
+            return True
+    return False
+
+
+def cached_response(request: Request, entry: CachedBody, max_age: int) -> Response:
+    """
+    캐시된 응답을 HTTP로 내보냄.
+    - If-None-Match가 맞으면 본문 없이 304
+    - 아니면 Accept-Encoding에 맞춰 미리 압축해둔 걸 골라서 (압축은 여기서 안 함)
+    """
+    headers = request.headers
+    encoding = choose_encoding(headers.get("accept-encoding"), entry.encoded)
+    response_headers = {
+        "ETag": f'"{entry.etag}{ETAG_SUFFIX.get(encoding, "")}"',
+        "Cache-Control": f"public, max-age={max_age}",
+        "Vary": "Accept-Encoding",
+    }
+
+    if etag_matches(headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=response_headers)
+    if encoding:
+        response_headers["Content-Encoding"] = encoding
+        return Response(content=entry.encoded[encoding], media_type="application/json", headers=response_headers)
+    return Response(content=entry.body, media_type="application/json", headers=response_headers)
@@ -1,6 +1,7 @@
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.models import School, Cafeteria
+from app.services.crawler.registry import SCRAPER_REGISTRY
+from app.services.dimension_cache import dimension_cache
 
 async def initialize_school_data(session: AsyncSession):
     """
@@ -8,45 +9,38 @@ async def initialize_school_data(session: AsyncSession):
     """
     print("🌱 [시스템] 기초 데이터 점검 및 초기화 시작...")
 
-    # 여기에 등록하고 싶은 학교/식당 리스트를 다 적어둬
+    # 학교/식당 목록은 스크래퍼 레지스트리(registry.py)에 한 번만 적어둠 (스크래퍼 모듈은 import 안 함)
     target_data = [
-        {
-            "name": "KAIST",
-            "region": "대전",
-            "cafeterias": ["카이마루", "서맛골", "교수회관", "문지캠퍼스", "화암 기숙사 식당"]
-        },
-        {
-            "name": "서울시립대학교",
-            "region": "서울",
-            "cafeterias": ["학생회관 1층", "이룸라운지", "양식당", "자연과학관"]
-        }
+        {"name": spec.school_name, "region": spec.region, "cafeterias": spec.cafeterias}
+        for spec in SCRAPER_REGISTRY.values()
     ]
 
+    # 학교/식당 캐시를 한 번에 채우고(쿼리 2번), 캐시에 없는 것만 추가함
+    await dimension_cache.load(session)
+
     for school_info in target_data:
         # 1. 학교 확인 및 생성
-        result = await session.execute(select(School).where(School.name == school_info["name"]))
-        school = result.scalars().first()
+        school = dimension_cache.get(school_info["name"])
 
         if not school:
             print(f"  ➕ 학교 생성: {school_info['name']}")
-            school = School(name=school_info["name"], region=school_info["region"])
-            session.add(school)
+            new_school = School(name=school_info["name"], region=school_info["region"])
+            session.add(new_school)
             await session.commit()
-            await session.refresh(school)
+            dimension_cache.add_school(new_school.id, new_school.name, new_school.region)
+            school = dimension_cache.get(school_info["name"])
         
         # 2. 식당 확인 및 생성
-        for caf_name in school_info["cafeterias"]:
-            c_result = await session.execute(
-                select(Cafeteria).where(
-                    Cafeteria.school_id == school.id,
-                    Cafeteria.name == caf_name
-                )
-            )
-            cafeteria = c_result.scalars().first()
+        new_cafeterias = [
+            Cafeteria(school_id=school.id, name=caf_name)
+            for caf_name in school_info["cafeterias"] if caf_name not in school.cafeterias
+        ]
+        for cafeteria in new_cafeterias:
+            print(f"    ➕ 식당 추가: {cafeteria.name} ({school.name})")
+
+        if new_cafeterias:
+            session.add_all(new_cafeterias)
+            await session.commit()
+            dimension_cache.add_cafeterias(school.name, new_cafeterias)
 
-            if not cafeteria:
-                print(f"    ➕ 식당 추가: {caf_name} ({school.name})")
-                session.add(Cafeteria(school_id=school.id, name=caf_name))
-            
-    await session.commit()
-    print("✅ [시스템] 기초 데이터 준비 완료!")
\ No newline at end of file
+    print("✅ [시스템] 기초 데이터 준비 완료!")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date, Text, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, Text, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from sqlalchemy.sql import func # 자동으로 시간 넣기 위해 필요
@@ -26,6 +26,11 @@ class Cafeteria(Base):
     school = relationship("School", back_populates="cafeterias")
     menus = relationship("Menu", back_populates="cafeteria")
 
+    __table_args__ = (
+        # 학교 -> 식당 찾기 (/daily 조인, 저장할 때 식당 이름 조회)
+        Index("ix_cafeterias_school_id_name", "school_id", "name"),
+    )
+
 # 3. 메뉴 테이블
 class Menu(Base):
     __tablename__ = "menus"
@@ -35,6 +40,7 @@ class Menu(Base):
     date = Column(Date, index=True) # 날짜 (2026-01-16)
     meal_type = Column(String)      # 식사 종류 (BREAKFAST, LUNCH, DINNER)
     menu_text = Column(Text)        # 메뉴 내용 (소세지야채볶음, 쌀밥...)
+    content_hash = Column(String, nullable=True) # menu_text 해시 (같으면 다시 안 씀, 바뀌면 이미지 다시 생성)
     
     # AI 이미지 URL 저장 공간
     image_url_2d = Column(String, nullable=True) # 2D 이미지 경로
@@ -42,6 +48,19 @@ class Menu(Base):
 
     cafeteria = relationship("Cafeteria", back_populates="menus")
 
+    __table_args__ = (
+        # 식당 + 날짜 + 식사 종류마다 메뉴는 딱 하나 (저장할 때 INSERT ... ON CONFLICT로 덮어씀)
+        # (식당, 날짜) 조회(/daily 조인)도 이 인덱스 앞부분으로 해결됨
+        Index("uq_menus_cafeteria_date_meal", "cafeteria_id", "date", "meal_type", unique=True),
+        # 아직 이미지가 없는 메뉴만 담는 부분 인덱스 (AIService가 날짜별로 찾음)
+        Index(
+            "ix_menus_date_missing_image",
+            "date",
+            sqlite_where=image_url_3d.is_(None),
+            postgresql_where=image_url_3d.is_(None),
+        ),
+    )
+
 # 4. 고객 문의 테이블 (가장 아래에 추가)
 class Inquiry(Base):
     __tablename__ = "inquiries"
@@ -49,4 +68,33 @@ class Inquiry(Base):
     id = Column(Integer, primary_key=True, index=True)
     category = Column(String)    # 문의 사유 (버그, 제안 등)
     content = Column(Text)       # 상세 내용
-    created_at = Column(DateTime, default=func.now()) # 생성 시간
\ No newline at end of file
+    created_at = Column(DateTime, default=func.now()) # 생성 시간
+
+# 5. 요리 사전 (메뉴 항목 하나 = 요리 하나, 정리된 이름이 같으면 같은 요리)
+class Dish(Base):
+    __tablename__ = "dishes"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, unique=True, index=True)  # 정리된 이름 (normalizer 결과, 예: 배추김치)
+    name_en = Column(String, nullable=True)         # 영어 이름 캐시 (이미지 프롬프트용, 요리마다 한 번만 번역)
+
+# 6. 메뉴 <-> 요리 연결 (메뉴 안 순서 그대로)
+class MenuDish(Base):
+    __tablename__ = "menu_dishes"
+
+    menu_id = Column(Integer, ForeignKey("menus.id"), primary_key=True)
+    position = Column(Integer, primary_key=True)  # 메뉴 안에서 몇 번째 항목인지 (0부터)
+    dish_id = Column(Integer, ForeignKey("dishes.id"), index=True)  # 이 요리가 어느 메뉴에 나왔는지 찾기용
+
+# 7. 학교별 하루 요약 (캘린더용: 그날 메뉴가 있는지, 이미지가 얼마나 됐는지)
+# 메뉴 저장/이미지 생성/청소가 바뀐 (학교, 날짜)만 다시 계산해서 채움 (db_service.refresh_day_summaries)
+class MenuDaySummary(Base):
+    __tablename__ = "menu_day_summaries"
+
+    school_id = Column(Integer, ForeignKey("schools.id"), primary_key=True)
+    date = Column(Date, primary_key=True)  # (학교, 날짜) 기본 키 = 캘린더 한 달 조회가 범위 검색 한 번
+    menu_count = Column(Integer, nullable=False, default=0)       # 메뉴(식사) 수
+    cafeteria_count = Column(Integer, nullable=False, default=0)  # 메뉴가 있는 식당 수
+    image_count = Column(Integer, nullable=False, default=0)      # 이미지까지 만들어진 메뉴 수
+    version = Column(Integer, nullable=False, default=1)          # 숫자가 바뀔 때마다 +1
+    updated_at = Column(DateTime, default=func.now())
@@ -1,19 +1,65 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from typing import AsyncGenerator
 from app.core.config import settings
 
-# 1. SQLite 전용 설정 (쓰레드 에러 방지)
-connect_args = {}
-if "sqlite" in settings.DATABASE_URL:
-    connect_args = {"check_same_thread": False}
+IS_SQLITE = "sqlite" in settings.DATABASE_URL
 
-# 2. 엔진 생성
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=False, # 로그 보기
-    connect_args=connect_args
-)
+
+def sqlite_pragmas(readonly: bool = False):
+    """연결할 때마다 실행할 PRAGMA 목록 (설정값 기준)"""
+    pragmas = [
+        f"PRAGMA busy_timeout={settings.DB_BUSY_TIMEOUT_MS}",  # 제일 먼저 (journal_mode 바꿀 때도 잠금을 기다리게)
+        f"PRAGMA journal_mode={settings.DB_JOURNAL_MODE}",  # DB 파일에 기록되는 값이라 사실상 한 번만 바뀜
+        f"PRAGMA synchronous={settings.DB_SYNCHRONOUS}",
+        f"PRAGMA mmap_size={settings.DB_MMAP_SIZE}",
+        f"PRAGMA cache_size=-{settings.DB_CACHE_SIZE_KB}",  # 음수면 페이지 수가 아니라 KB 단위
+    ]
+    if not readonly:
+        # 새 DB 파일일 때만 바로 적용됨 (이미 있는 DB는 vacuum_db.py로 VACUUM 한 번 해서 전환)
+        pragmas.insert(1, f"PRAGMA auto_vacuum={settings.DB_AUTO_VACUUM}")
+    if readonly:
+        # 읽기 전용 엔진으로 실수로 쓰려고 하면 바로 에러 (쓰기는 쓰기 엔진 한 곳으로만)
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def build_engine(url: str = settings.DATABASE_URL, readonly: bool = False, pool_size: int = 1, **kwargs) -> AsyncEngine:
+    """
+    SQLite용 엔진 만들기.
+    - 쓰기 엔진(readonly=False): 연결 1개. SQLite는 어차피 한 번에 한 명만 쓸 수 있으니까
+      크롤링/청소/이미지 저장이 DB 잠금 대신 커넥션 풀에서 차례로 줄을 섬
+    - 읽기 엔진(readonly=True): 연결 여러 개 + query_only. WAL이라 쓰는 중에도 안 기다림
+    """
+    if "sqlite" not in url:
+        return create_async_engine(url, echo=False, **kwargs)
+
+    engine = create_async_engine(
+        url,
+        echo=False, # 로그 보기
+        connect_args={"check_same_thread": False}, # 쓰레드 에러 방지
+        pool_size=pool_size,
+        max_overflow=0,
+        **kwargs,
+    )
+    pragmas = sqlite_pragmas(readonly)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return engine
+
+
+# 1. 쓰기 엔진 (스케줄러 작업, 스크립트, 문의 저장) - 연결 1개
+engine = build_engine(pool_timeout=settings.DB_WRITE_POOL_TIMEOUT)
+
+# 2. 읽기 전용 엔진 (API 조회) - 크롤링이 쓰고 있어도 바로 읽음
+read_engine = build_engine(readonly=True, pool_size=settings.DB_READ_POOL_SIZE) if IS_SQLITE else engine
 
 # 3. 세션 생성기
 AsyncSessionLocal = sessionmaker(
@@ -24,7 +70,20 @@ AsyncSessionLocal = sessionmaker(
     autoflush=False,
 )
 
+AsyncReadSessionLocal = sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
 # 🔴 [복구 완료] 이 함수가 없어서 아까 에러가 났던 거야!
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+# 조회만 하는 API용 (메뉴 조회 등)
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncReadSessionLocal() as session:
+        yield session
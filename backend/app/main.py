@@ -8,14 +8,17 @@ from pytz import timezone
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
-from app.db.session import AsyncSessionLocal, engine
+from app.db.session import AsyncSessionLocal, engine, read_engine
 from app.db.models import Base
-from app.api.v1.endpoints import menus, inquiry
+from app.api.v1.endpoints import menus, inquiry, archive, calendar
 from app.services.auto_filler import AutoFiller
+from app.services.crawler.http_client import crawler_http
+from app.services.crawler.snapshot_store import snapshot_store
+from app.services.crawler.parse_pool import parse_pool
 
 from app.db.init_data import initialize_school_data
 
-from app.services.db_service import delete_old_menus
+from app.services.db_maintenance import run_maintenance
 
 # 1. 스케줄러 인스턴스 생성 (AsyncIO 전용!)
 scheduler = AsyncIOScheduler()
@@ -35,11 +38,11 @@ async def scheduled_crawling_job():
         print(f"❌ [스케줄러] 실행 중 에러 발생: {e}")
 
 async def scheduled_cleanup_job():
-    print("🧹 [스케줄러] DB 청소 시작 (오래된 데이터 삭제)")
+    print("🧹 [스케줄러] DB 청소 시작 (오래된 데이터 삭제 + 파일 정리)")
     try:
         async with AsyncSessionLocal() as session:
-            # 3일 지난 메뉴 삭제
-            await delete_old_menus(session, days=3)
+            # 3일 지난 메뉴는 보관 파일로 옮기고 삭제 -> 빈 공간 반납 -> 통계 갱신 (DB_MAINT_BUDGET 안에서만)
+            await run_maintenance(session, days=3)
     except Exception as e:
         print(f"❌ [스케줄러] 청소 중 에러 발생: {e}")
 
@@ -54,6 +57,11 @@ async def lifespan(app: FastAPI):
     async with AsyncSessionLocal() as session:
         await initialize_school_data(session)
 
+    # 크롤러 공용 HTTP 커넥션 풀 준비
+    await crawler_http.start()
+    # HTML 파싱용 작업자 풀 (API 응답이 크롤링 때문에 밀리지 않게)
+    parse_pool.start()
+
     # (2) 스케줄러 설정 및 시작
     # 매일 00:01분에 실행
     scheduler.add_job(
@@ -82,6 +90,11 @@ async def lifespan(app: FastAPI):
     
     # [꺼질 때 실행할 코드]
     scheduler.shutdown()
+    await crawler_http.aclose()
+    parse_pool.shutdown()
+    await snapshot_store.flush()
+    await read_engine.dispose()
+    await engine.dispose()
     print("👋 서버 및 스케줄러 종료.")
 
 # 3. FastAPI 앱 생성
@@ -104,6 +117,8 @@ app.add_middleware(
 # 라우터 등록
 app.include_router(menus.router, prefix="/api/v1", tags=["menus"])
 app.include_router(inquiry.router, prefix="/api/v1/inquiries", tags=["inquiries"])
+app.include_router(archive.router, prefix="/api/v1", tags=["archive"])
+app.include_router(calendar.router, prefix="/api/v1", tags=["calendar"])
 
 @app.get("/")
 def read_root():
@@ -19,4 +19,10 @@ class CafeteriaData(BaseModel):
 class SchoolData(BaseModel):
     school_name: str         # 학교 이름 (예: 한국대)
     school_region: str       # 지역 (예: 서울)
-    cafeterias: List[CafeteriaData]
\ No newline at end of file
+    cafeterias: List[CafeteriaData]
+
+# 크롤러가 받아온 HTML 원본 한 장 (파싱 전 단계)
+class RawPage(BaseModel):
+    key: str                 # 페이지 구분용 키 (예: 식당 코드, 단일 페이지면 "main")
+    html: str
+    target_date: Optional[date] = None  # 어느 날짜를 위해 받은 페이지인지 (주간 페이지면 그 주의 월요일)
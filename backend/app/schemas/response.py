@@ -17,4 +17,28 @@ class CafeteriaResponse(BaseModel):
 class DailyMenuResponse(BaseModel):
     school_name: str
     date: date
-    cafeterias: List[CafeteriaResponse]
\ No newline at end of file
+    cafeterias: List[CafeteriaResponse]
+
+# 4. 기간 응답 (날짜별로 묶음, 메뉴가 없는 날도 빈 목록으로)
+class DayMenuResponse(BaseModel):
+    date: date
+    cafeterias: List[CafeteriaResponse]
+
+class RangeMenuResponse(BaseModel):
+    school_name: str
+    start: date
+    end: date
+    days: List[DayMenuResponse]
+
+# 5. 캘린더 (한 달 동안 메뉴가 있는 날짜만, 숫자만)
+class CalendarDayResponse(BaseModel):
+    date: date
+    menu_count: int        # 메뉴(식사) 수
+    cafeteria_count: int   # 메뉴가 있는 식당 수
+    image_count: int       # 이미지까지 만들어진 메뉴 수
+    version: int           # 그 날짜 숫자가 바뀔 때마다 올라감
+
+class CalendarResponse(BaseModel):
+    school_name: str
+    month: str             # "2026-03"
+    days: List[CalendarDayResponse]
@@ -1,5 +1,9 @@
+import asyncio
 from deep_translator import GoogleTranslator
-from typing import List
+from typing import Dict, List, Optional
+
+# 번역 요청 한 번에 보낼 최대 글자 수 (구글 번역은 5000자 제한)
+TRANSLATE_CHUNK_CHARS = 4000
 
 class MenuPrompter:
     def __init__(self):
@@ -27,12 +31,50 @@ class MenuPrompter:
     async def translate_to_english(self, korean_menu_list: List[str]) -> str:
         try:
             joined_text = ", ".join(korean_menu_list)
-            translated_text = self.translator.translate(joined_text)
+            # 번역은 동기 HTTP 호출이라 스레드에서 (이벤트 루프를 막으면 API 응답이 같이 멈춤)
+            translated_text = await asyncio.to_thread(self.translator.translate, joined_text)
             return translated_text
         except Exception as e:
             print(f"⚠️ 번역 실패: {e}")
             return ", ".join(korean_menu_list)
 
+    def _chunks(self, dish_names: List[str]) -> List[List[str]]:
+        """줄바꿈으로 합쳤을 때 TRANSLATE_CHUNK_CHARS를 안 넘게 나눔"""
+        chunks, current, length = [], [], 0
+        for name in dish_names:
+            if current and length + len(name) + 1 > TRANSLATE_CHUNK_CHARS:
+                chunks.append(current)
+                current, length = [], 0
+            current.append(name)
+            length += len(name) + 1
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def translate_dishes(self, dish_names: List[str]) -> Dict[str, str]:
+        """
+        요리 이름 번역 (요리 사전에 캐시할 용도라 메뉴 단위가 아니라 요리 단위).
+        요리마다 요청하지 않고 줄바꿈으로 합쳐서 묶음당 한 번만 보냄 (줄 수가 안 맞으면 그 묶음만 하나씩).
+        동기 HTTP 호출이라 asyncio.to_thread로 불러야 함.
+        실패한 요리는 결과에서 빠짐 -> 캐시에 안 남아서 다음에 다시 시도됨
+        """
+        translated = {}
+        for chunk in self._chunks(dish_names):
+            try:
+                lines = self.translator.translate("\n".join(chunk)).split("\n")
+                if len(lines) == len(chunk):
+                    translated.update((name, line.strip()) for name, line in zip(chunk, lines) if line.strip())
+                    continue
+                print(f"⚠️ 묶음 번역 줄 수가 안 맞음 ({len(chunk)}개 -> {len(lines)}줄), 하나씩 다시 번역")
+            except Exception as e:
+                print(f"⚠️ 묶음 번역 실패 ({len(chunk)}개): {e}")
+            for name in chunk:
+                try:
+                    translated[name] = self.translator.translate(name)
+                except Exception as e:
+                    print(f"⚠️ 번역 실패 ({name}): {e}")
+        return translated
+
     def _detect_meal_keywords(self, meal_type_db: str) -> str:
         """복잡한 코드를 분석해서 적절한 영어 키워드를 반환"""
         upper_type = meal_type_db.upper()
@@ -64,9 +106,12 @@ class MenuPrompter:
 
         return " ".join(keywords)
 
-    async def create_prompt(self, menu_items: List[str], meal_type_db: str) -> str:
-        # 1. 메뉴 번역 (한글 -> 영어)
-        english_menu = await self.translate_to_english(menu_items)
+    async def create_prompt(self, menu_items: List[str], meal_type_db: str, english_items: Optional[List[str]] = None) -> str:
+        # 1. 메뉴 번역 (한글 -> 영어), 요리 사전에 영어 이름이 있으면 번역 없이 그대로 씀
+        if english_items:
+            english_menu = ", ".join(english_items)
+        else:
+            english_menu = await self.translate_to_english(menu_items)
         
         # ---------------------------------------------------------
         # 💡 [솔루션] 메뉴 이름에 따라 '맛있는 묘사' 강제 주입!
@@ -1,24 +1,86 @@
+import asyncio
+from typing import Dict, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
+from app.core.config import settings
 from app.db import models
 from app.services.ai_generator.prompter import MenuPrompter
 from app.services.ai_generator.client import ImageGenerator
+from app.services.db_service import refresh_day_summaries
+from app.services.response_cache import daily_cache
 
 class AIService:
     def __init__(self):
         self.prompter = MenuPrompter()
         self.generator = ImageGenerator()
 
+    async def _english_dish_names(self, session: AsyncSession, menu_ids: List[int]) -> Dict[int, List[str]]:
+        """
+        메뉴 id -> 요리 영어 이름 목록 (메뉴 안 순서 그대로).
+        번역은 요리마다 한 번만: 쌀밥/배추김치처럼 매일 나오는 요리는 처음 한 번 번역하면 끝.
+        한 번에 AI_TRANSLATE_MAX_DISHES개까지만 번역 (요리 사전이 빈 첫 실행에서 수백 개를 한꺼번에 보내지 않게,
+        나머지는 한글 그대로 쓰고 다음 실행 때 번역됨)
+        """
+        result = await session.execute(
+            select(models.MenuDish.menu_id, models.Dish)
+            .join(models.Dish, models.Dish.id == models.MenuDish.dish_id)
+            .where(models.MenuDish.menu_id.in_(menu_ids))
+            .order_by(models.MenuDish.menu_id, models.MenuDish.position)
+        )
+        rows = result.all()
+        # 조회 끝 -> 쓰기 연결을 바로 돌려줌 (번역은 네트워크라 오래 걸릴 수 있음, 그동안 저장/청소가 기다리지 않게)
+        await session.commit()
+
+        missing = list({dish.id: dish for _, dish in rows if not dish.name_en}.values())[:settings.AI_TRANSLATE_MAX_DISHES]
+        if missing:
+            # 번역은 동기 HTTP 호출이라 스레드에서 (이벤트 루프를 막으면 API 응답이 같이 멈춤)
+            translated = await asyncio.to_thread(self.prompter.translate_dishes, [dish.name for dish in missing])
+            # 번역이 끝난 뒤에 짧은 트랜잭션으로 저장만
+            for dish in missing:
+                if dish.name in translated:
+                    dish.name_en = translated[dish.name]
+            await session.commit()
+            print(f"🌐 처음 보는 요리 {len(missing)}개 번역 (요리 사전에 저장, 성공 {len(translated)}개)")
+
+        english = {}
+        for menu_id, dish in rows:
+            # 번역에 실패한 요리는 한글 그대로
+            english.setdefault(menu_id, []).append(dish.name_en or dish.name)
+        return english
+
+    async def _save_images(self, session: AsyncSession, images: List[tuple], target_date):
+        """
+        만든 이미지 URL들을 짧은 트랜잭션 하나로 저장 -> 캘린더 요약 -> 커밋 -> /daily 캐시 지움.
+        이미지를 만드는 동안 메뉴 내용이 바뀌었으면(저장이 이미지를 비움) 예전 내용 이미지라서 안 넣음
+        """
+        schools = set()
+        for menu_id, menu_text, school, image_url in images:
+            result = await session.execute(
+                update(models.Menu)
+                .where(models.Menu.id == menu_id, models.Menu.menu_text == menu_text)
+                .values(image_url_3d=image_url)
+            )
+            if result.rowcount:
+                schools.add(school)
+        for school_id, _ in schools:
+            await refresh_day_summaries(session, school_id, [target_date])
+        await session.commit()
+        for _, name in schools:
+            daily_cache.invalidate(name, [target_date])
+
     async def generate_daily_images(self, session: AsyncSession, target_date, school_name: str = None):
         """
-        [트랜잭션 최적화 버전]
-        메뉴 이미지를 생성하고, 일정 개수(BATCH_SIZE)마다 모아서 커밋합니다.
+        메뉴 이미지를 생성하고, 일정 개수(BATCH_SIZE)마다 모아서 저장합니다.
+        쓰기 연결은 하나뿐이라 AI 호출(번역/이미지, 몇 초씩 걸림) 동안에는 트랜잭션을 열어두지 않음:
+        조회 -> 커밋(연결 반납) -> AI 호출 -> 묶음마다 짧게 저장
         """
         BATCH_SIZE = 5 # 5개씩 묶어서 저장 (DB 부하 감소 + 너무 긴 트랜잭션 방지)
         
         print(f"🚀 {target_date} 메뉴 이미지 생성 시작 (대상: {school_name or '전체'})...")
 
-        stmt = select(models.Menu).join(models.Cafeteria).join(models.School).where(
+        stmt = select(
+            models.Menu.id, models.Menu.menu_text, models.Menu.meal_type, models.School.id, models.School.name,
+        ).select_from(models.Menu).join(models.Cafeteria).join(models.School).where(
             models.Menu.date == target_date,
             models.Menu.image_url_3d == None 
         )
@@ -27,7 +89,8 @@ class AIService:
             stmt = stmt.where(models.School.name == school_name)
 
         result = await session.execute(stmt)
-        menus = result.scalars().all()
+        menus = result.all()
+        await session.commit()
 
         if not menus:
             print(f"💤 생성할 대상이 없습니다.")
@@ -36,33 +99,37 @@ class AIService:
         total_count = len(menus)
         print(f"⚡ 총 {total_count}개의 메뉴 이미지 생성을 시작합니다.")
 
+        # 요리별 영어 이름 (요리 사전에서, 처음 보는 요리만 번역해서 저장)
+        english_by_menu = await self._english_dish_names(session, [menu_id for menu_id, *_ in menus])
+
         # 처리 카운터
         processed_count = 0
+        pending = [] # 아직 저장 안 된 (메뉴 id, 메뉴 내용, (학교 id, 이름), 이미지 URL)
 
-        for menu in menus:
+        for menu_id, menu_text, meal_type, school_id, name in menus:
             try:
-                # 1. 이미지 생성 (AI 호출 - 시간 소요됨)
-                menu_items_list = menu.menu_text.split("\n")
-                prompt = await self.prompter.create_prompt(menu_items_list, menu.meal_type)
+                # 1. 이미지 생성 (AI 호출 - 시간 소요됨, 열린 트랜잭션 없음)
+                menu_items_list = menu_text.split("\n")
+                prompt = await self.prompter.create_prompt(menu_items_list, meal_type, english_by_menu.get(menu_id))
                 image_url = await self.generator.generate_image(prompt)
                 
-                # 2. 메모리에 반영 (아직 DB에는 안 감)
-                menu.image_url_3d = image_url
-                session.add(menu)
-                
+                # 2. 메모리에 모아둠 (아직 DB에는 안 감)
+                pending.append((menu_id, menu_text, (school_id, name), image_url))
                 processed_count += 1
 
-                # 3. [핵심] 배치 사이즈만큼 찼을 때만 커밋!
-                if processed_count % BATCH_SIZE == 0:
-                    await session.commit()
+                # 3. [핵심] 배치 사이즈만큼 찼을 때만 저장!
+                if len(pending) >= BATCH_SIZE:
+                    await self._save_images(session, pending, target_date)
+                    pending = []
                     print(f"   -> {processed_count}/{total_count}개 저장 완료...")
 
             except Exception as e:
-                print(f"❌ 이미지 생성 중 에러 (ID: {menu.id}): {e}")
+                await session.rollback()
+                print(f"❌ 이미지 생성 중 에러 (ID: {menu_id}): {e}")
                 # 에러 나도 다음 메뉴는 계속 진행해야 하니까 멈추지 않음
 
-        # 4. 반복문 끝나고 남은 찌꺼기들 최종 커밋
-        if processed_count % BATCH_SIZE != 0:
-            await session.commit()
+        # 4. 반복문 끝나고 남은 찌꺼기들 최종 저장
+        if pending:
+            await self._save_images(session, pending, target_date)
         
-        print(f"🎉 이미지 생성 작업 최종 완료! (총 {processed_count}개)")
\ No newline at end of file
+        print(f"🎉 이미지 생성 작업 최종 완료! (총 {processed_count}개)")
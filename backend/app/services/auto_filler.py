@@ -1,38 +1,71 @@
+import asyncio
+import itertools
+from collections import Counter
 from datetime import date, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
+from app.core.config import settings
 from app.db import models
-from app.services.crawler.scrapers import get_scrapers 
+from app.db.session import AsyncSessionLocal
+from app.services.crawler.registry import select_specs
 from app.services.db_service import save_school_data
 from app.services.ai_service import AIService
+from app.services.dimension_cache import dimension_cache
+from app.services.response_cache import daily_cache
+from app.services.crawler.http_client import crawler_http
+from app.services.crawler.fetch_cache import fetch_cache
+from app.services.crawler.snapshot_store import snapshot_store
+from app.services.crawler.parse_pool import parse_pool
 
 class AutoFiller:
-    def __init__(self):
-        self.scrapers = get_scrapers() 
-        self.ai_service = AIService()
+    """
+    수집(fetch) -> 파싱(parse) -> DB 저장(save) -> 이미지(image) 4단계 파이프라인.
+    단계 사이는 크기 제한이 있는 대기열로 연결돼 있어서, 뒤 단계가 밀리면 앞 단계가 알아서 기다림(backpressure).
+    학교 x 날짜 작업이 동시에 흘러가니까 전체 소요 시간 ≈ 가장 느린 사이트 하나의 시간.
+    """
 
-    async def execute(self, session: AsyncSession):
-        """
-        등록된 모든 학교에 대해 크롤링 및 데이터 무결성 검사 수행
-        """
-        today = date.today()
-        check_dates = [today + timedelta(days=i) for i in range(-1, 3)] # 어제 ~ 모레
+    def __init__(
+        self,
+        schools=None,
+        fetch_workers: int = settings.SYNC_FETCH_WORKERS,
+        parse_workers: int = settings.SYNC_PARSE_WORKERS,
+        image_workers: int = settings.SYNC_IMAGE_WORKERS,
+        queue_size: int = settings.SYNC_QUEUE_SIZE,
+    ):
+        # 학교 정보만 먼저 가져오고, 스크래퍼 모듈은 실제로 긁을 학교만 불러옴 (schools로 일부만 지정 가능)
+        self.specs = select_specs(schools)
+        self.ai_service = AIService()
+        self.fetch_workers = fetch_workers
+        self.parse_workers = parse_workers
+        self.image_workers = image_workers
+        self.queue_size = queue_size
 
-        print(f"🔄 [AutoFiller] 전체 학교 데이터 동기화 시작")
+    @staticmethod
+    def _priority(target_date: date, today: date) -> int:
+        """오늘 -> 내일 -> 모레 -> 어제 순서로 처리 (작을수록 먼저)"""
+        diff = (target_date - today).days
+        return diff if diff >= 0 else 100 - diff
 
-        for scraper in self.scrapers:
-            school_name = scraper.school_name
+    async def _plan_jobs(self, session: AsyncSession, check_dates, today: date):
+        """DB 상태를 보고 학교마다 실제로 긁어야 할 날짜 목록을 만듦"""
+        jobs = []
+        for spec in self.specs:
+            school_name = spec.school_name
             print(f"  🏫 학교 점검: {school_name}")
+            dates = []
+
+            # 학교의 식당 id들은 메모리 캐시에서 (아직 DB에 없는 학교면 빈 목록 -> 전부 0개)
+            school = await dimension_cache.get_school(session, school_name)
+            caf_ids = list(school.cafeterias.values()) if school else []
 
             for target_date in check_dates:
                 # 1. DB에 데이터가 있는지 개수 확인
                 stmt = select(func.count(models.Menu.id)) \
-                    .join(models.Cafeteria).join(models.School) \
                     .where(
-                        models.School.name == school_name,
+                        models.Menu.cafeteria_id.in_(caf_ids),
                         models.Menu.date == target_date
                     )
-                
+
                 result = await session.execute(stmt)
                 menu_count = result.scalar() or 0
 
@@ -41,31 +74,162 @@ class AutoFiller:
                 if target_date < today and menu_count > 0:
                     print(f"    ✅ {target_date}: 과거 데이터 있음 ({menu_count}개) (Skip)")
                     continue
-                
+
                 # 하지만 "오늘/미래" 데이터는?
                 # 1. '학생식당'은 있는데 '교직원식당'이 늦게 올라왔을 수도 있고 (부분 누락)
                 # 2. 메뉴가 중간에 수정됐을 수도 있어. (반찬 변경 등)
                 # 그러니까 '데이터가 있어도' 게으름 피우지 말고 무조건 다시 긁어오라고 시키는 거야!
-                
+
                 status_msg = f"기존 {menu_count}개 발견" if menu_count > 0 else "데이터 없음"
                 print(f"    ⚡ {target_date}: 동기화 시도 ({status_msg}) -> 크롤링 재수행")
-                
+                dates.append(target_date)
+
+            if dates:
+                priority = min(self._priority(d, today) for d in dates)
+                jobs.append((priority, spec.load(), dates))
+
+        # 오늘/내일 데이터가 필요한 학교부터 수집되도록 정렬
+        jobs.sort(key=lambda job: job[0])
+        return jobs
+
+    @staticmethod
+    def _print_summary(summary):
+        """이번 동기화에서 실제로 바뀐 것만 한눈에 (이미지 생성도 신규 + 변경만큼만 돎)"""
+        if not summary:
+            print("📝 [변경 요약] 저장한 메뉴 없음")
+            return
+        total = Counter()
+        print("📝 [변경 요약]")
+        for school_name, counts in summary.items():
+            total.update(counts)
+            print(f"   - {school_name}: 신규 {counts['inserted']} / 변경 {counts['updated']} / 그대로 {counts['unchanged']}")
+        print(f"   = 합계: 신규 {total['inserted']} / 변경 {total['updated']} / 그대로 {total['unchanged']}")
+
+    async def execute(self, session: AsyncSession):
+        """
+        등록된 모든 학교에 대해 크롤링 및 데이터 무결성 검사 수행
+        """
+        today = date.today()
+        check_dates = [today + timedelta(days=i) for i in range(-1, 3)] # 어제 ~ 모레
+
+        print(f"🔄 [AutoFiller] 전체 학교 데이터 동기화 시작")
+
+        jobs = await self._plan_jobs(session, check_dates, today)
+        # 점검(조회)이 끝났으니 쓰기 연결을 바로 돌려줌 (수집하는 동안 다른 작업이 쓸 수 있게)
+        await session.commit()
+
+        # 학교별 저장 결과 (신규 / 변경 / 그대로) -> 마지막에 변경 요약으로 출력
+        summary = {}
+
+        # 각 단계 대기열: (우선순위, 순번, ...) 형태라 오늘/내일 작업이 항상 먼저 빠져나감
+        seq = itertools.count()
+        fetch_q: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        parse_q: asyncio.PriorityQueue = asyncio.PriorityQueue(maxsize=self.queue_size)
+        save_q: asyncio.PriorityQueue = asyncio.PriorityQueue(maxsize=self.queue_size)
+        image_q: asyncio.PriorityQueue = asyncio.PriorityQueue(maxsize=self.queue_size)
+
+        for priority, scraper, dates in jobs:
+            fetch_q.put_nowait((priority, next(seq), scraper, dates))
+
+        # (1) 수집: 학교마다 점검 기간 전체를 한 번에 (주간 페이지는 한 번만 받음)
+        #     네트워크 대기가 대부분이라 여러 명이 동시에
+        #     조건부 요청 캐시로 '지난번과 같은 페이지'는 빠지고, 바뀐 페이지만 파싱/저장으로 넘어감
+        async def fetch_worker():
+            while True:
+                priority, _, scraper, dates = await fetch_q.get()
                 try:
-                    # (1) 크롤링 (무조건 실행)
-                    school_data = await scraper.parse(target_date)
-                    
-                    if school_data:
-                        # (2) DB 저장
-                        # 걱정 마, db_service.py에 '덮어쓰기(Update)' 로직이 있어서 데이터 중복 안 돼!
-                        await save_school_data(session, school_data)
-                        
-                        # (3) AI 이미지 생성 (필요하면)
-                        await self.ai_service.generate_daily_images(session, target_date)
-                        print(f"       -> 동기화 완료.")
+                    # 한 사이트가 느려져도 전체 동기화를 붙잡지 않게 학교별 마감 시간을 둠 (재시도 포함)
+                    with fetch_cache.track() as tracker, crawler_http.deadline():
+                        pages = await scraper.fetch_range(dates)
+                    if pages:
+                        await parse_q.put((priority, next(seq), scraper, dates, pages, tracker))
+                    elif tracker.all_unchanged:
+                        print(f"       -> 💤 {scraper.school_name}: 지난번과 같은 페이지 (파싱/저장 Skip)")
                     else:
-                        print(f"       -> ⚠️ 데이터 수집 실패 (사이트 응답 없음 or 휴일)")
+                        print(f"       -> ⚠️ {scraper.school_name}: 데이터 수집 실패 (사이트 응답 없음 or 휴일)")
+                except Exception as e:
+                    print(f"       ❌ {scraper.school_name} 수집 중 에러 발생: {e}")
+                finally:
+                    fetch_q.task_done()
+
+        # (2) 파싱: CPU 작업이라 파싱 풀(별도 프로세스)에서 돌리고, 이벤트 루프는 API 응답용으로 비워둠
+        #     결과는 날짜별로 쪼개서 저장 단계로 (오늘/내일이 먼저 저장됨)
+        async def parse_worker():
+            while True:
+                _, _, scraper, dates, pages, tracker = await parse_q.get()
+                try:
+                    results = await parse_pool.run(scraper, pages, dates)
+                    # 이 학교 작업의 저장이 전부 성공하면 그때 캐시에 반영 (job["remaining"]이 0이 될 때)
+                    # 파싱 결과가 하나도 없으면 반영 안 함 (파서를 고친 뒤에도 '변경 없음'으로 영영 건너뛰지 않게)
+                    job = {"tracker": tracker, "remaining": len(results), "failed": False}
+                    for target_date in dates:
+                        school_data = results.get(target_date)
+                        if school_data:
+                            await save_q.put((self._priority(target_date, today), next(seq), school_data, target_date, job))
+                        elif tracker.unchanged:
+                            print(f"       -> 💤 {scraper.school_name} {target_date}: 변경 없음 or 휴일")
+                        else:
+                            print(f"       -> ⚠️ {scraper.school_name} {target_date}: 파싱 결과 없음 (휴일 or 구조 변경)")
+                except Exception as e:
+                    print(f"       ❌ {scraper.school_name} 파싱 중 에러 발생: {e}")
+                finally:
+                    parse_q.task_done()
+
+        # (3) DB 저장: SQLite는 쓰기가 한 줄로 서야 하니까 딱 1명만
+        async def save_worker():
+            while True:
+                priority, _, school_data, target_date, job = await save_q.get()
+                try:
+                    # 걱정 마, db_service.py에 '덮어쓰기(Update)' 로직이 있어서 데이터 중복 안 돼!
+                    changes = await save_school_data(session, school_data)
+                    summary.setdefault(school_data.school_name, Counter()).update(changes)
+                    # 이미지 단계는 이미지가 비어 있는 메뉴(신규 + 내용 변경 + 지난번 실패)만 만듦
+                    await image_q.put((priority, next(seq), school_data.school_name, target_date))
+                except Exception as e:
+                    job["failed"] = True
+                    await session.rollback()
+                    print(f"       ❌ {school_data.school_name} {target_date} 저장 중 에러 발생: {e}")
+                finally:
+                    job["remaining"] -= 1
+                    if job["remaining"] == 0 and not job["failed"]:
+                        fetch_cache.commit(job["tracker"])
+                    save_q.task_done()
 
+        # (4) AI 이미지 생성 (필요하면): 저장 세션과 섞이지 않게 자기 세션을 따로 씀
+        async def image_worker():
+            while True:
+                _, _, school_name, target_date = await image_q.get()
+                try:
+                    async with AsyncSessionLocal() as image_session:
+                        await self.ai_service.generate_daily_images(image_session, target_date, school_name)
+                    print(f"       -> {school_name} {target_date} 동기화 완료.")
                 except Exception as e:
-                    print(f"       ❌ 에러 발생: {e}")
+                    print(f"       ❌ {school_name} {target_date} 이미지 생성 중 에러 발생: {e}")
+                finally:
+                    image_q.task_done()
+
+        workers = [
+            *[asyncio.create_task(fetch_worker()) for _ in range(self.fetch_workers)],
+            *[asyncio.create_task(parse_worker()) for _ in range(self.parse_workers)],
+            asyncio.create_task(save_worker()),
+            *[asyncio.create_task(image_worker()) for _ in range(self.image_workers)],
+        ]
+
+        try:
+            # 앞 단계가 다 비워져야 뒤 단계에 더 들어올 게 없으니까 순서대로 기다림
+            for q in (fetch_q, parse_q, save_q, image_q):
+                await q.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
 
-        print("✨ [AutoFiller] 모든 작업 완료!")
\ No newline at end of file
+        print("✨ [AutoFiller] 모든 작업 완료!")
+        self._print_summary(summary)
+        # 호스트별 커넥션 재사용 현황 + 조건부 요청 캐시 적중률
+        crawler_http.print_stats()
+        fetch_cache.print_stats()
+        dimension_cache.print_stats()
+        daily_cache.print_stats()
+        # 이번에 받은 HTML 원본 인덱스 저장 (+ 용량 정리)
+        await snapshot_store.flush()
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+import httpx
+from app.core.config import settings
+
+# 지금 돌고 있는 크롤링 작업의 추적기 (asyncio.gather로 쪼개진 하위 작업에도 그대로 전달됨)
+_current_tracker: ContextVar[Optional["FetchTracker"]] = ContextVar("fetch_tracker", default=None)
+
+
+def make_cache_key(method: str, url: str, params: Optional[dict] = None, data: Optional[dict] = None) -> str:
+    """같은 URL이라도 파라미터/POST Body가 다르면 다른 페이지 (UOS 식당들이 그럼)"""
+    key = f"{method.upper()} {url}"
+    if params:
+        key += "?" + urlencode(sorted(params.items()))
+    if data:
+        key += " " + urlencode(sorted(data.items()))
+    return key
+
+
+class FetchTracker:
+    """
+    학교 하나의 수집 작업 동안 요청 결과를 모아두는 기록장.
+    새로 받은 검증값(ETag 등)은 바로 캐시에 넣지 않고, DB 저장이 성공한 뒤에 commit으로 반영함.
+    (저장이 실패했는데 캐시만 '변경 없음'으로 남으면 그 데이터를 영영 다시 안 받게 되니까)
+
+    주간 페이지처럼 한 페이지에 여러 날짜가 있으면 covers(이번에 이 페이지에서 필요한 날짜)를 같이 받아서,
+    그 날짜를 전부 저장해둔 적이 있을 때만 '변경 없음'으로 침. (어제 점검 기간에 없던 날짜가 오늘 새로 들어오면
+    페이지가 그대로여도 파싱해야 함)
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.unchanged = 0
+        self.pending: Dict[str, dict] = {}
+
+    @property
+    def all_unchanged(self) -> bool:
+        return self.requests > 0 and self.unchanged == self.requests
+
+    def observe(
+        self, cache: "FetchCache", host: str, key: str, entry: Optional[dict], response: httpx.Response,
+        covers: Optional[List[str]] = None,
+    ) -> httpx.Response:
+        self.requests += 1
+
+        # 304는 저장된 날짜가 covers를 다 덮을 때만 조건부 요청을 보내니까 여기 오면 항상 '변경 없음'
+        if response.status_code == 304:
+            self.unchanged += 1
+            cache.hits_304[host] += 1
+            return response
+
+        body_hash = hashlib.sha256(response.content).hexdigest()
+        same_body = entry is not None and entry.get("body_hash") == body_hash
+        if same_body and FetchCache.covers(entry, covers):
+            # 서버가 304를 안 줘도 내용이 똑같으면 '변경 없음'으로 취급
+            self.unchanged += 1
+            cache.hits_hash[host] += 1
+            return httpx.Response(304, request=response.request)
+
+        cache.misses[host] += 1
+        pending = {
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "body_hash": body_hash,
+            "fetched_at": int(time.time()),
+        }
+        if covers is not None:
+            # 내용이 같으면 예전에 저장한 날짜도 그대로 유효 (내용이 바뀌었으면 이번 날짜만)
+            previous = entry.get("dates", []) if same_body else []
+            pending["dates"] = sorted(set(previous) | set(covers))
+        self.pending[key] = pending
+        return response
+
+
+class FetchCache:
+    """
+    URL별 조건부 요청 캐시 (ETag / Last-Modified + 본문 해시).
+    /data 볼륨에 JSON 파일로 저장돼서 서버가 재시작돼도 유지됨.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Optional[Dict[str, dict]] = None
+        self.hits_304: Counter = Counter()
+        self.hits_hash: Counter = Counter()
+        self.misses: Counter = Counter()
+
+    def _load(self) -> Dict[str, dict]:
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, key: str) -> Optional[dict]:
+        return self._load().get(key)
+
+    @staticmethod
+    def covers(entry: Optional[dict], covers: Optional[List[str]]) -> bool:
+        """이 페이지에서 필요한 날짜(covers)를 전부 저장해둔 적이 있는지 (covers가 없으면 날짜는 안 봄)"""
+        if not entry:
+            return False
+        return covers is None or set(covers) <= set(entry.get("dates", []))
+
+    def conditional_headers(self, entry: Optional[dict]) -> Dict[str, str]:
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def commit(self, tracker: FetchTracker):
+        """DB 저장까지 끝난 작업의 검증값을 캐시에 반영하고 파일로 저장"""
+        if not tracker.pending:
+            return
+        self._load().update(tracker.pending)
+        tracker.pending = {}
+        self.save()
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._load(), f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ [크롤러] 조건부 요청 캐시 저장 실패: {e}")
+
+    def clear(self):
+        """DB를 초기화했다면 캐시도 같이 비워야 함 (안 그러면 '변경 없음'으로 건너뜀)"""
+        self._entries = {}
+        self.save()
+
+    @contextmanager
+    def track(self):
+        tracker = FetchTracker()
+        token = _current_tracker.set(tracker)
+        try:
+            yield tracker
+        finally:
+            _current_tracker.reset(token)
+
+    @staticmethod
+    def current_tracker() -> Optional[FetchTracker]:
+        return _current_tracker.get()
+
+    def stats(self) -> Dict[str, dict]:
+        report = {}
+        for host in set(self.hits_304) | set(self.hits_hash) | set(self.misses):
+            total = self.hits_304[host] + self.hits_hash[host] + self.misses[host]
+            hits = self.hits_304[host] + self.hits_hash[host]
+            report[host] = {
+                "304": self.hits_304[host],
+                "hash_match": self.hits_hash[host],
+                "miss": self.misses[host],
+                "hit_rate": hits / total if total else 0.0,
+            }
+        return report
+
+    def print_stats(self):
+        for host, s in self.stats().items():
+            print(
+                f"  🗂️ {host}: 캐시 적중률 {s['hit_rate']:.0%} "
+                f"(304 {s['304']}회 / 해시 일치 {s['hash_match']}회 / 변경 {s['miss']}회)"
+            )
+
+
+fetch_cache = FetchCache(settings.CRAWLER_CACHE_PATH)
@@ -0,0 +1,109 @@
+import re
+from typing import Optional
+from bs4 import BeautifulSoup, SoupStrainer
+from app.core.config import settings
+
+# 빠른 파서는 설치돼 있을 때만 씀 (없으면 파이썬 기본 html.parser로 동작)
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as FastHTMLParser
+except ImportError:
+    FastHTMLParser = None
+
+BACKENDS = ("auto", "selectolax", "lxml", "html.parser")
+
+# 학교(http 프로필)별 페이지 인코딩. 응답 헤더/본문으로 추측하지 않고 이걸로 바로 디코딩함
+SOURCE_ENCODINGS = {
+    "default": "utf-8",
+    "kaist": "utf-8",
+    "snu": "utf-8",
+    "ewha": "utf-8",
+    "cnu": "utf-8",
+    "uos": "utf-8",
+}
+
+
+def decode_html(profile: str, content: bytes) -> str:
+    return content.decode(SOURCE_ENCODINGS.get(profile, "utf-8"), errors="replace")
+
+
+class HtmlTarget:
+    """
+    파서가 실제로 보는 부분 (예: 식단 표 하나).
+    - css      : selectolax로 그 부분만 먼저 잘라낼 때 쓰는 선택자
+    - strainer : BeautifulSoup이 그 부분만 트리로 만들게 하는 필터 (SoupStrainer)
+    """
+
+    def __init__(self, tag: str, class_name: Optional[str] = None, id: Optional[str] = None):
+        self.tag = tag
+        self.class_name = class_name
+        self.id = id
+
+        attrs = {}
+        css = tag
+        if class_name:
+            # SoupStrainer는 class="table x" 같은 여러 클래스를 통째로 비교해서 정규식으로 매칭
+            attrs["class"] = re.compile(rf"(^|\s){re.escape(class_name)}(\s|$)")
+            css += f".{class_name}"
+        if id:
+            attrs["id"] = id
+            css += f"#{id}"
+        self.css = css
+        self.strainer = SoupStrainer(tag, attrs=attrs)
+
+    def __repr__(self):
+        return f"HtmlTarget({self.css})"
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """설정값(auto 등)을 실제로 쓸 수 있는 백엔드 이름으로 바꿈"""
+    backend = backend or settings.CRAWLER_HTML_BACKEND
+    if backend not in BACKENDS:
+        print(f"⚠️ [크롤러] 알 수 없는 HTML 백엔드 '{backend}' -> auto")
+        backend = "auto"
+    if backend in ("auto", "selectolax") and FastHTMLParser is not None:
+        return "selectolax"
+    if backend in ("auto", "selectolax", "lxml") and HAS_LXML:
+        return "lxml"
+    return "html.parser"
+
+
+def _outermost(nodes):
+    """표 안에 표가 있으면 바깥 것만 남김 (안쪽 것까지 붙이면 내용이 두 번 들어감)"""
+    ids = {node.mem_id for node in nodes}
+    result = []
+    for node in nodes:
+        parent = node.parent
+        while parent is not None and parent.mem_id not in ids:
+            parent = parent.parent
+        if parent is None:
+            result.append(node)
+    return result
+
+
+def make_soup(html: str, target: Optional[HtmlTarget] = None, backend: Optional[str] = None) -> BeautifulSoup:
+    """
+    HTML을 BeautifulSoup 트리로 만듦. target을 주면 그 부분만 트리로 만들어서 훨씬 빠름.
+    - selectolax : C로 된 파서로 target 부분만 잘라낸 뒤, 그 조각만 BeautifulSoup으로
+    - lxml       : 전체를 훑되 target 부분만 트리로 (SoupStrainer)
+    - html.parser: 위와 같지만 순수 파이썬 (가장 느림, 항상 사용 가능)
+    어느 쪽이든 파서 코드는 똑같이 soup.find / select를 쓰면 됨.
+    """
+    backend = resolve_backend(backend)
+    builder = "lxml" if HAS_LXML and backend != "html.parser" else "html.parser"
+
+    if target is None:
+        return BeautifulSoup(html, builder)
+
+    if backend == "selectolax":
+        nodes = FastHTMLParser(html).css(target.css)
+        # 못 찾으면 구조가 살짝 다른 페이지일 수 있으니 아래의 일반 경로로 한 번 더 시도
+        if nodes:
+            return BeautifulSoup("".join(node.html for node in _outermost(nodes)), builder)
+
+    return BeautifulSoup(html, builder, parse_only=target.strainer)
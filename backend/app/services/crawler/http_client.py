@@ -0,0 +1,448 @@
+import asyncio
+import random
+import time
+import httpx
+from collections import Counter
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from datetime import date
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+from app.core.config import settings
+from app.services.crawler.fetch_cache import fetch_cache, make_cache_key
+from app.services.crawler.snapshot_store import snapshot_store
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# 학교(소스)별 기본 헤더 모음
+# 스크래퍼마다 복붙돼 있던 User-Agent / Referer / Origin을 여기 한 곳에서 관리함
+HEADER_PROFILES: Dict[str, Dict[str, str]] = {
+    "default": {"User-Agent": DEFAULT_USER_AGENT},
+    "kaist": {"User-Agent": DEFAULT_USER_AGENT},
+    "snu": {"User-Agent": DEFAULT_USER_AGENT},
+    "ewha": {
+        "User-Agent": DEFAULT_USER_AGENT,
+        "Referer": "https://www.ewha.ac.kr/ewha/life/restaurant.do",
+    },
+    "cnu": {
+        "User-Agent": DEFAULT_USER_AGENT,
+        "Referer": "https://mobileadmin.cnu.ac.kr/food/index.jsp",
+    },
+    "uos": {
+        "User-Agent": DEFAULT_USER_AGENT,
+        "Referer": "https://www.uos.ac.kr/food/placeList.do",
+        "Origin": "https://www.uos.ac.kr",
+    },
+}
+
+# 학교(소스)별 예의 규칙: 한 호스트에 동시에 몇 개까지, 요청 시작 간격은 최소 몇 초
+# settings.CRAWLER_POLITENESS로 학교별 덮어쓰기 가능 (예: {"ewha": {"min_interval": 0.5}})
+POLITENESS_PROFILES: Dict[str, Dict[str, float]] = {
+    "default": {"max_in_flight": 2, "min_interval": 0.2},
+    "kaist": {"max_in_flight": 5, "min_interval": 0.05},
+    "snu": {"max_in_flight": 2, "min_interval": 0.2},
+    "ewha": {"max_in_flight": 3, "min_interval": 0.3},
+    "cnu": {"max_in_flight": 2, "min_interval": 0.2},
+    "uos": {"max_in_flight": 4, "min_interval": 0.1},
+}
+
+# 잠깐 기다렸다 다시 해볼 만한 상태 코드
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# 지금 돌고 있는 수집 작업의 마감 시각 (time.monotonic 기준, 없으면 무제한)
+_deadline: ContextVar[Optional[float]] = ContextVar("crawl_deadline", default=None)
+
+
+class CrawlerHttpError(Exception):
+    """크롤러 HTTP 계층에서 요청을 아예 보내지 않고 포기한 경우"""
+
+
+class CircuitOpenError(CrawlerHttpError):
+    pass
+
+
+class CrawlDeadlineExceeded(CrawlerHttpError):
+    pass
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HostLimiter:
+    """
+    호스트 하나에 대한 예의 지키기 장치.
+    동시에 날아가는 요청 수를 max_in_flight로 묶고, 요청 시작 사이에 min_interval만큼 간격을 둠.
+    (예전 스크래퍼 안의 고정 asyncio.sleep(0.3)을 대신함)
+    """
+
+    def __init__(self, max_in_flight: int, min_interval: float):
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.min_interval = max(0.0, float(min_interval))
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+        self.throttled = 0  # 간격 때문에 기다린 횟수
+
+    @asynccontextmanager
+    async def slot(self):
+        async with self._semaphore:
+            async with self._lock:
+                loop = asyncio.get_running_loop()
+                wait = self._next_start - loop.time()
+                if wait > 0:
+                    self.throttled += 1
+                    await asyncio.sleep(wait)
+                self._next_start = loop.time() + self.min_interval
+            yield
+
+
+class CircuitBreaker:
+    """
+    호스트별 차단기.
+    연속 실패가 threshold번 쌓이면 cooldown 동안 그 호스트로는 요청을 아예 안 보냄(open).
+    cooldown이 지나면 한 번만 시험 삼아 보내보고(half-open), 성공하면 다시 정상(closed).
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trips = 0          # 지금까지 차단된 횟수
+        self.rejected = 0       # 차단 때문에 안 보낸 요청 수
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._probing:
+            self._probing = True
+            return True
+        self.rejected += 1
+        return False
+
+    @contextmanager
+    def probe_guard(self):
+        """
+        allow() 바로 다음에 씀. 이 요청이 half-open 시험 요청인데 성공/실패 기록 없이 끝나면
+        (취소 등 - CancelledError는 except Exception에도 안 걸림) 시험 자리를 돌려줌.
+        안 돌려주면 그 호스트로는 다시는 요청을 못 보냄
+        """
+        probing = self._probing
+        try:
+            yield
+        finally:
+            if probing and self._probing:
+                self._probing = False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._probing or self.failures >= self.threshold:
+            if self.opened_at is None or self._probing:
+                self.trips += 1
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+
+class CrawlerHttpClient:
+    """
+    크롤러 전체가 같이 쓰는 HTTP 클라이언트 관리자.
+    호스트마다 keep-alive 커넥션 풀을 하나씩 만들어두고 재사용해서,
+    식당 페이지를 긁을 때마다 DNS + TCP + TLS 핸드셰이크를 새로 하지 않게 함.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._transports: Dict[str, httpx.AsyncHTTPTransport] = {}
+        self._limiters: Dict[str, HostLimiter] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._requests: Counter = Counter()
+        self._errors: Counter = Counter()
+        self._retries: Counter = Counter()
+        self._http_versions: Dict[str, Counter] = {}
+        self._http2 = False
+        self.started = False
+
+    async def start(self):
+        """앱 수명 주기(lifespan) 시작 시 호출"""
+        self._http2 = settings.CRAWLER_HTTP2 and _http2_available()
+        self.started = True
+        print(f"🌐 [크롤러] HTTP 클라이언트 준비 완료 (HTTP/2: {'ON' if self._http2 else 'OFF'})")
+
+    async def aclose(self):
+        """앱 종료 시 모든 커넥션 풀 정리"""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+        self._transports.clear()
+        self._limiters.clear()
+        self._breakers.clear()
+        self.started = False
+
+    def _get_client(self, host: str) -> httpx.AsyncClient:
+        client = self._clients.get(host)
+        if client is None:
+            # lifespan 밖(스크립트 단독 실행 등)에서 불려도 동작하도록 지연 생성
+            if not self.started:
+                self._http2 = settings.CRAWLER_HTTP2 and _http2_available()
+            limits = httpx.Limits(
+                max_connections=settings.CRAWLER_MAX_CONNECTIONS_PER_HOST,
+                max_keepalive_connections=settings.CRAWLER_MAX_KEEPALIVE_PER_HOST,
+                keepalive_expiry=settings.CRAWLER_KEEPALIVE_EXPIRY,
+            )
+            transport = httpx.AsyncHTTPTransport(verify=False, http2=self._http2, limits=limits)
+            client = httpx.AsyncClient(transport=transport)
+            self._transports[host] = transport
+            self._clients[host] = client
+        return client
+
+    def _get_limiter(self, host: str, profile: str) -> HostLimiter:
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            # 같은 호스트를 여러 프로필이 쓰면 처음 등록한 프로필 규칙을 따름
+            policy = dict(POLITENESS_PROFILES.get(profile, POLITENESS_PROFILES["default"]))
+            policy.update(settings.CRAWLER_POLITENESS.get(profile, {}))
+            limiter = HostLimiter(policy["max_in_flight"], policy["min_interval"])
+            self._limiters[host] = limiter
+        return limiter
+
+    def _get_breaker(self, host: str) -> CircuitBreaker:
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(settings.CRAWLER_BREAKER_THRESHOLD, settings.CRAWLER_BREAKER_COOLDOWN)
+            self._breakers[host] = breaker
+        return breaker
+
+    @contextmanager
+    def deadline(self, seconds: float = None):
+        """이 블록 안의 모든 요청(재시도 포함)은 seconds 안에 끝나야 함"""
+        seconds = settings.CRAWLER_JOB_DEADLINE if seconds is None else seconds
+        token = _deadline.set(time.monotonic() + seconds)
+        try:
+            yield
+        finally:
+            _deadline.reset(token)
+
+    @staticmethod
+    def _remaining() -> Optional[float]:
+        deadline = _deadline.get()
+        return None if deadline is None else deadline - time.monotonic()
+
+    @staticmethod
+    def _backoff(attempt: int, response: Optional[httpx.Response]) -> float:
+        # 서버가 Retry-After(초)를 알려주면 그걸 따르고, 아니면 지수 증가 + full jitter
+        if response is not None:
+            retry_after = response.headers.get("retry-after", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), settings.CRAWLER_BACKOFF_MAX)
+        return random.uniform(0, min(settings.CRAWLER_BACKOFF_MAX, settings.CRAWLER_BACKOFF_BASE * (2 ** attempt)))
+
+    async def _send(
+        self,
+        profile: str,
+        host: str,
+        method: str,
+        url: str,
+        read_timeout: float,
+        headers: Dict[str, str],
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        재시도 / 마감 시간 / 서킷 브레이커를 적용해서 실제로 요청을 보냄.
+        재시도 대기 중에는 예의 규칙 슬롯을 놓아서 다른 요청이 막히지 않게 함.
+        """
+        client = self._get_client(host)
+        limiter = self._get_limiter(host, profile)
+        breaker = self._get_breaker(host)
+
+        attempt = 0
+        while True:
+            remaining = self._remaining()
+            if remaining is not None and remaining <= 0:
+                raise CrawlDeadlineExceeded(f"{host}: 수집 마감 시간 초과")
+            if not breaker.allow():
+                raise CircuitOpenError(f"{host}: 연속 실패로 잠시 차단됨 ({breaker.state})")
+
+            with breaker.probe_guard():
+                # 연결/읽기 타임아웃을 따로 주되, 남은 마감 시간보다 길게는 안 기다림
+                timeout = httpx.Timeout(
+                    read_timeout,
+                    connect=settings.CRAWLER_CONNECT_TIMEOUT,
+                )
+                if remaining is not None:
+                    timeout = httpx.Timeout(
+                        min(read_timeout, remaining),
+                        connect=min(settings.CRAWLER_CONNECT_TIMEOUT, remaining),
+                    )
+
+                response = None
+                error = None
+                async with limiter.slot():
+                    self._requests[host] += 1
+                    try:
+                        response = await client.request(method, url, headers=headers, timeout=timeout, **kwargs)
+                    except httpx.TransportError as e:
+                        error = e
+                    except Exception:
+                        self._errors[host] += 1
+                        breaker.record_failure()
+                        raise
+
+                failed = error is not None or response.status_code in RETRYABLE_STATUS
+                if not failed:
+                    breaker.record_success()
+                    return response
+
+                self._errors[host] += 1
+                breaker.record_failure()
+
+            remaining = self._remaining()
+            if attempt >= settings.CRAWLER_MAX_RETRIES or breaker.state == "open":
+                if error is not None:
+                    raise error
+                return response
+
+            wait = self._backoff(attempt, response)
+            if remaining is not None and wait >= remaining:
+                if error is not None:
+                    raise error
+                return response
+
+            attempt += 1
+            self._retries[host] += 1
+            reason = type(error).__name__ if error is not None else f"HTTP {response.status_code}"
+            print(f"     🔁 {host}: {reason} -> {wait:.1f}초 후 재시도 ({attempt}/{settings.CRAWLER_MAX_RETRIES})")
+            await asyncio.sleep(wait)
+
+    async def request(
+        self,
+        profile: str,
+        method: str,
+        url: str,
+        *,
+        timeout: float = 10.0,
+        headers: Optional[Dict[str, str]] = None,
+        target_date: Optional[date] = None,
+        covers: Optional[Iterable[date]] = None,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        프로필 헤더를 붙여서 요청을 보냄. (timeout은 읽기 타임아웃, 연결 타임아웃은 설정값)
+        일시적 오류는 알아서 재시도하고, 그래도 안 되면 예외를 그대로 올려보내니까
+        호출하는 쪽(fetch_html)에서 처리해야 함.
+
+        AutoFiller 수집 작업 안(fetch_cache.track())에서 불리면 조건부 요청을 함:
+        지난번과 같은 페이지면 304 응답이 돌아가니까 호출하는 쪽은 그냥 건너뛰면 됨.
+        한 페이지에 여러 날짜가 있으면 covers로 이번에 필요한 날짜를 넘김
+        (그중 하나라도 아직 저장한 적 없으면 조건부 요청 없이 새로 받아서 파싱하게 함)
+
+        받은 본문은 target_date와 함께 스냅샷 저장소에 남고,
+        settings.CRAWLER_REPLAY가 켜져 있으면 네트워크 대신 저장소에서 돌려줌.
+        """
+        host = urlsplit(url).netloc
+        request_key = make_cache_key(method, url, kwargs.get("params"), kwargs.get("data"))
+
+        if settings.CRAWLER_REPLAY:
+            return self._replay(profile, method, url, request_key, target_date)
+
+        merged_headers = dict(HEADER_PROFILES.get(profile, HEADER_PROFILES["default"]))
+        if headers:
+            merged_headers.update(headers)
+
+        tracker = fetch_cache.current_tracker()
+        cache_key = cache_entry = None
+        if tracker is not None:
+            cache_key = request_key
+            cache_entry = fetch_cache.get(cache_key)
+            if covers is not None:
+                covers = sorted(d.isoformat() for d in covers)
+            if method.upper() == "GET" and fetch_cache.covers(cache_entry, covers):
+                merged_headers.update(fetch_cache.conditional_headers(cache_entry))
+
+        response = await self._send(profile, host, method, url, timeout, merged_headers, **kwargs)
+
+        self._http_versions.setdefault(host, Counter())[response.http_version] += 1
+        if response.status_code == 200:
+            await snapshot_store.record(
+                profile, request_key, target_date, response.content,
+                response.headers.get("content-type", "")
+            )
+        if tracker is not None and response.status_code in (200, 304):
+            response = tracker.observe(fetch_cache, host, cache_key, cache_entry, response, covers)
+        return response
+
+    def _replay(self, profile: str, method: str, url: str, request_key: str, target_date: Optional[date]) -> httpx.Response:
+        """스냅샷 저장소에서 예전 응답을 꺼내서 진짜 응답처럼 돌려줌 (없으면 404)"""
+        request = httpx.Request(method, url)
+        entry = snapshot_store.lookup(profile, request_key, target_date)
+        content = snapshot_store.read(entry["hash"]) if entry else None
+        if content is None:
+            return httpx.Response(404, request=request)
+        headers = {"content-type": entry["content_type"]} if entry.get("content_type") else {}
+        return httpx.Response(200, content=content, headers=headers, request=request)
+
+    async def get(self, profile: str, url: str, **kwargs) -> httpx.Response:
+        return await self.request(profile, "GET", url, **kwargs)
+
+    async def post(self, profile: str, url: str, **kwargs) -> httpx.Response:
+        return await self.request(profile, "POST", url, **kwargs)
+
+    def stats(self) -> Dict[str, dict]:
+        """호스트별 요청 수 / 에러·재시도 수 / 현재 풀 상태 / 예의 규칙 대기 횟수 / 차단기 상태"""
+        report = {}
+        for host, transport in self._transports.items():
+            # httpx가 풀을 공개 API로 노출하지 않아서 내부 httpcore 풀을 살짝 들여다봄
+            pool = getattr(transport, "_pool", None)
+            connections = list(getattr(pool, "connections", []))
+            report[host] = {
+                "requests": self._requests[host],
+                "errors": self._errors[host],
+                "open_connections": len(connections),
+                "idle_connections": sum(1 for c in connections if c.is_idle()),
+                "http_versions": dict(self._http_versions.get(host, {})),
+                "throttled": self._limiters[host].throttled if host in self._limiters else 0,
+                "retries": self._retries[host],
+                "breaker": self._get_breaker(host).state,
+                "breaker_trips": self._get_breaker(host).trips,
+                "breaker_rejected": self._get_breaker(host).rejected,
+            }
+        return report
+
+    def print_stats(self):
+        for host, s in self.stats().items():
+            print(
+                f"  🌐 {host}: 요청 {s['requests']}회 / 에러 {s['errors']}회 / "
+                f"연결 {s['open_connections']}개 (유휴 {s['idle_connections']}개) / "
+                f"간격 대기 {s['throttled']}회 / 재시도 {s['retries']}회 / {s['http_versions']}"
+            )
+            if s["breaker_trips"] or s["breaker"] != "closed":
+                print(
+                    f"     🚧 차단기: {s['breaker']} (차단 {s['breaker_trips']}회, "
+                    f"차단 중 거절 {s['breaker_rejected']}회)"
+                )
+
+
+# 크롤러 전체가 공유하는 인스턴스 (app/main.py lifespan에서 열고 닫음)
+crawler_http = CrawlerHttpClient()
@@ -0,0 +1,83 @@
+import asyncio
+import importlib
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from typing import Dict, List, Optional
+from app.core.config import settings
+from app.schemas.crawler import RawPage, SchoolData
+from app.services.normalizer import normalize_results
+
+# 작업 프로세스 안에서 만든 스크래퍼 (프로세스마다 학교당 한 번만 만듦)
+_worker_scrapers: Dict[str, object] = {}
+
+
+def parse_and_normalize(scraper, pages: List[RawPage], dates: List[date]) -> Dict[date, SchoolData]:
+    """파싱 + 정리(normalizer)까지 한 번에. DB에는 항상 정리된 결과만 들어감"""
+    return normalize_results(scraper.parse_range_pages(pages, dates))
+
+
+def _parse_in_worker(scraper_path: str, pages: List[RawPage], dates: List[date]) -> Dict[date, SchoolData]:
+    """
+    작업 프로세스/스레드에서 실행되는 부분.
+    스크래퍼 객체 대신 '모듈:클래스' 경로만 받아서 거기서 만들어 씀 (HTML 원본 -> SchoolData만 주고받음)
+    """
+    scraper = _worker_scrapers.get(scraper_path)
+    if scraper is None:
+        module_name, class_name = scraper_path.split(":")
+        scraper = getattr(importlib.import_module(module_name), class_name)()
+        _worker_scrapers[scraper_path] = scraper
+    return parse_and_normalize(scraper, pages, dates)
+
+
+class ParsePool:
+    """
+    HTML 파싱(BeautifulSoup + 정규식)을 이벤트 루프 밖으로 빼는 작업자 풀.
+    크롤링 중에도 같은 루프에서 도는 /api/v1/daily 응답이 밀리지 않게 함.
+    - thread : 스레드 (GIL 때문에 병렬은 아니지만 루프는 안 막힘, 기본값)
+    - process: 별도 프로세스 (코어 여러 개 사용, 대신 작업자마다 메모리를 따로 씀)
+    - off    : 예전처럼 루프에서 바로 (디버깅용)
+    """
+
+    def __init__(self, mode: str, workers: int):
+        self.mode = mode
+        self.workers = max(1, workers)
+        self._executor: Optional[Executor] = None
+
+    def start(self):
+        if self._executor is not None or self.mode == "off":
+            return
+        if self.mode == "process":
+            # fork 말고 forkserver: aiosqlite/APScheduler 스레드가 도는 프로세스를 그대로 복사하면
+            # 그 스레드들이 잡고 있던 잠금까지 복사돼서 작업자가 멈출 수 있음
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("forkserver")
+            )
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="parse")
+        print(f"🧵 [크롤러] 파싱 작업자 준비 완료 ({self.mode} x {self.workers})")
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, scraper, pages: List[RawPage], dates: List[date]) -> Dict[date, SchoolData]:
+        """parse_and_normalize(scraper, pages, dates)를 풀에서 실행"""
+        if self.mode == "off":
+            return parse_and_normalize(scraper, pages, dates)
+
+        self.start()
+        scraper_path = f"{type(scraper).__module__}:{type(scraper).__qualname__}"
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, _parse_in_worker, scraper_path, pages, dates)
+        except BrokenProcessPool:
+            # 작업 프로세스가 죽었으면(메모리 부족 등) 풀을 새로 만들고, 이번 건은 스레드로 처리
+            print("⚠️ [크롤러] 파싱 프로세스가 비정상 종료됨 -> 풀 재생성")
+            self.shutdown()
+            return await asyncio.to_thread(parse_and_normalize, scraper, pages, dates)
+
+
+parse_pool = ParsePool(settings.SYNC_PARSE_POOL, settings.SYNC_PARSE_POOL_SIZE)
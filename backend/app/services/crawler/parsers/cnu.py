@@ -1,12 +1,19 @@
-from bs4 import BeautifulSoup
 from datetime import date
 from typing import List, Optional
-import httpx
 import re
 from app.services.crawler.scrapers import BaseScraper
-from app.schemas.crawler import SchoolData, CafeteriaData, MenuData
+from app.services.crawler.http_client import crawler_http
+from app.services.crawler.html import HtmlTarget, decode_html, make_soup
+from app.services.crawler.rules import KeywordMatcher
+from app.schemas.crawler import SchoolData, CafeteriaData, MenuData, RawPage
+
+PAREN_NOTE = re.compile(r'\([^)]*\)')  # 괄호 하나씩 ("국(소고기) 밥(국산)"에서 괄호 사이 메뉴까지 지우지 않게)
+CLOSED_KEYWORDS = KeywordMatcher(["운영안함", "운영중단"])
 
 class CnuScraper(BaseScraper):
+    http_profile = "cnu"
+    html_target = HtmlTarget("table", "menu-tbl")
+
     # 실제 식당 이름 리스트 (인덱스 0은 제1학생회관이지만, 데이터는 1번부터 존재)
     CAFETERIA_NAMES = ["제1학생회관", "제2학생회관", "제3학생회관", "제4학생회관", "생활과학대학"]
 
@@ -20,19 +27,13 @@ class CnuScraper(BaseScraper):
     async def fetch_html(self, target_date: date):
         formatted_date = target_date.strftime("%Y.%m.%d")
         target_url = f"{self.url}?searchYmd={formatted_date}"
-        
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Referer": "https://mobileadmin.cnu.ac.kr/food/index.jsp"
-        }
 
-        async with httpx.AsyncClient(verify=False, headers=headers, timeout=20.0) as client:
-            try:
-                response = await client.get(target_url)
-                return response.text if response.status_code == 200 else None
-            except Exception as e:
-                print(f"❌ [충남대학교] 접속 에러: {e}")
-                return None
+        try:
+            response = await crawler_http.get(self.http_profile, target_url, timeout=20.0, target_date=target_date)
+            return decode_html(self.http_profile, response.content) if response.status_code == 200 else None
+        except Exception as e:
+            print(f"❌ [충남대학교] 접속 에러: {e}")
+            return None
 
     def _extract_menu_items(self, td) -> List[str]:
         if not td: return []
@@ -40,14 +41,13 @@ class CnuScraper(BaseScraper):
         if not p_tag: return []
         
         text = p_tag.get_text(separator="\n", strip=True)
-        items = [re.sub(r'\(.*\)', '', line).strip() for line in text.split("\n") if line.strip()]
-        return [i for i in items if i and "운영안함" not in i and "운영중단" not in i]
+        items = [PAREN_NOTE.sub('', line).strip() for line in text.split("\n") if line.strip()]
+        return [i for i in items if i and not CLOSED_KEYWORDS.search(i)]
 
-    async def parse(self, target_date: date) -> Optional[SchoolData]:
-        html = await self.fetch_html(target_date)
-        if not html: return None
+    def parse_pages(self, pages: List[RawPage], target_date: date) -> Optional[SchoolData]:
+        if not pages: return None
 
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(pages[0].html, self.html_target)
         table = soup.select_one("table.menu-tbl")
         if not table: return None
 
@@ -1,12 +1,16 @@
-from bs4 import BeautifulSoup
-from datetime import date
-from typing import List, Optional
-import httpx
+from datetime import date, timedelta
+from typing import Dict, List, Optional
 import asyncio
 from app.services.crawler.scrapers import BaseScraper
-from app.schemas.crawler import SchoolData, CafeteriaData, MenuData
+from app.services.crawler.http_client import crawler_http
+from app.services.crawler.html import HtmlTarget, decode_html, make_soup
+from app.schemas.crawler import SchoolData, CafeteriaData, MenuData, RawPage
 
 class EwhaScraper(BaseScraper):
+    http_profile = "ewha"
+    range_mode = "weekly"
+    html_target = HtmlTarget("ul", "b-menu-box")
+
     CAFETERIAS = [
         {"name": "I-House 학생식당", "no": "339841"},
         {"name": "진·선·미관 식당", "no": "903"},
@@ -22,90 +26,122 @@ class EwhaScraper(BaseScraper):
             url="https://www.ewha.ac.kr/ewha/life/restaurant.do"
         )
 
-    async def fetch_html(self, article_no: str, target_date: date):
+    async def fetch_html(self, article_no: str, target_date: date, covers: Optional[List[date]] = None):
         # 💡 날짜 파라미터를 srDt로 넘기더라도 서버 응답은 전체 주간 데이터를 포함할 수 있음
         formatted_date = target_date.strftime("%Y-%m-%d")
         target_url = (
             f"{self.url}?mode=view&articleNo={article_no}"
             f"&article.offset=0&articleLimit=10&srDt={formatted_date}"
         )
-        
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Referer": "https://www.ewha.ac.kr/ewha/life/restaurant.do"
-        }
 
-        async with httpx.AsyncClient(verify=False, headers=headers, timeout=15.0) as client:
-            try:
-                response = await client.get(target_url)
-                return response.text if response.status_code == 200 else None
-            except Exception as e:
-                print(f"❌ [이화여자대학교] 접속 에러: {e}")
-                return None
-
-    async def parse(self, target_date: date) -> Optional[SchoolData]:
-        print(f"⚡ [이화여자대학교] {target_date} 파싱 시도 중...")
-        all_cafeterias = []
-        
+        try:
+            response = await crawler_http.get(
+                self.http_profile, target_url, timeout=15.0, target_date=target_date, covers=covers
+            )
+            return decode_html(self.http_profile, response.content) if response.status_code == 200 else None
+        except Exception as e:
+            print(f"❌ [이화여자대학교] 접속 에러: {e}")
+            return None
+
+    @staticmethod
+    def _week_start(target_date: date) -> date:
+        return target_date - timedelta(days=target_date.weekday())
+
+    async def fetch(self, target_date: date) -> List[RawPage]:
+        return await self.fetch_range([target_date])
+
+    async def fetch_range(self, dates: List[date]) -> List[RawPage]:
+        """
+        주간 페이지라서 (주, 식당)마다 딱 한 번만 받음.
+        4일치를 긁어도 같은 주면 식당당 요청 1번.
+        """
+        # srDt는 항상 그 주의 월요일로 보냄 -> 같은 주면 URL이 매일 같아서 조건부 요청 캐시가 먹힘
+        # 대신 URL이 같아도 필요한 날짜는 날마다 달라지니까 그 주에서 필요한 날짜를 covers로 같이 넘김
+        # (새로 점검 기간에 들어온 날짜가 있으면 페이지가 그대로여도 다시 파싱)
+        weeks = {}
+        for d in sorted(dates):
+            weeks.setdefault(self._week_start(d), []).append(d)
+
+        # 서버 부하 방지는 crawler_http의 호스트별 예의 규칙(동시 요청 수 + 최소 간격)이 맡음
+        jobs = [(week, caf) for week in weeks for caf in self.CAFETERIAS]
+        htmls = await asyncio.gather(*(self.fetch_html(caf["no"], week, weeks[week]) for week, caf in jobs))
+        return [
+            RawPage(key=caf["no"], html=html, target_date=week)
+            for (week, caf), html in zip(jobs, htmls) if html
+        ]
+
+    def parse_pages(self, pages: List[RawPage], target_date: date) -> Optional[SchoolData]:
+        return self.parse_range_pages(pages, [target_date]).get(target_date)
+
+    def _parse_day(self, menu_box, target_date: date) -> List[MenuData]:
         # 요일 인덱스 계산 (0: 월, 1: 화, ..., 6: 일)
         target_weekday = target_date.weekday()
 
-        for caf in self.CAFETERIAS:
-            html = await self.fetch_html(caf["no"], target_date)
-            if not html: continue
+        # 💡 [핵심 수정] 모든 요일 리스트(li) 중 target_date에 맞는 요일을 선택
+        # 사진의 클래스명 b-menu-day mon, tue 등을 활용하거나 리스트 순서로 접근
+        day_lis = menu_box.select("li.b-menu-day")
+        if not day_lis or target_weekday >= len(day_lis):
+            return []
 
-            soup = BeautifulSoup(html, 'html.parser')
-            menu_box = soup.select_one("ul.b-menu-box")
-            if not menu_box: continue
+        target_li = day_lis[target_weekday]
+        daily_menus = []
 
-            # 💡 [핵심 수정] 모든 요일 리스트(li) 중 target_date에 맞는 요일을 선택
-            # 사진의 클래스명 b-menu-day mon, tue 등을 활용하거나 리스트 순서로 접근
-            day_lis = menu_box.select("li.b-menu-day")
-            if not day_lis or target_weekday >= len(day_lis):
-                continue
+        # 조식, 중식, 석식 div 탐색
+        meal_divs = target_li.select("div[class*='b-menu-']")
 
-            target_li = day_lis[target_weekday]
-            daily_menus = []
-
-            # 조식, 중식, 석식 div 탐색
-            meal_divs = target_li.select("div[class*='b-menu-']")
-
-            for div in meal_divs:
-                title_p = div.select_one("p.m-title")
-                menu_pre = div.select_one("pre")
-                
-                if not title_p or not menu_pre: continue
-
-                meal_type_raw = title_p.get_text(strip=True)
-                if "조식" in meal_type_raw: meal_type = "BREAKFAST"
-                elif "중식" in meal_type_raw: meal_type = "LUNCH"
-                elif "석식" in meal_type_raw: meal_type = "DINNER"
-                else: continue
-
-                menu_text = menu_pre.get_text(strip=True)
-                if not menu_text or "등록된 식단이 없습니다" in menu_text:
-                    continue
-
-                # 메뉴 아이템 리스트화
-                menu_items = [item.strip() for item in menu_text.split() if item.strip()]
-                
-                if menu_items:
-                    daily_menus.append(MenuData(
-                        meal_type=meal_type,
-                        menu_items=menu_items,
-                        date=target_date
-                    ))
-
-            if daily_menus:
-                print(f"  ✅ {caf['name']}: {len(daily_menus)}개의 식단 수집 완료")
-                all_cafeterias.append(CafeteriaData(name=caf["name"], menus=daily_menus))
+        for div in meal_divs:
+            title_p = div.select_one("p.m-title")
+            menu_pre = div.select_one("pre")
             
-            await asyncio.sleep(0.3) # 서버 부하 방지
+            if not title_p or not menu_pre: continue
+
+            meal_type_raw = title_p.get_text(strip=True)
+            if "조식" in meal_type_raw: meal_type = "BREAKFAST"
+            elif "중식" in meal_type_raw: meal_type = "LUNCH"
+            elif "석식" in meal_type_raw: meal_type = "DINNER"
+            else: continue
 
-        if not all_cafeterias: return None
+            menu_text = menu_pre.get_text(strip=True)
+            if not menu_text or "등록된 식단이 없습니다" in menu_text:
+                continue
+
+            # 메뉴 아이템 리스트화
+            menu_items = [item.strip() for item in menu_text.split() if item.strip()]
+            
+            if menu_items:
+                daily_menus.append(MenuData(
+                    meal_type=meal_type,
+                    menu_items=menu_items,
+                    date=target_date
+                ))
+
+        return daily_menus
+
+    def parse_range_pages(self, pages: List[RawPage], dates: List[date]) -> Dict[date, SchoolData]:
+        print(f"⚡ [이화여자대학교] {min(dates)} ~ {max(dates)} 파싱 시도 중...")
+        caf_names = {caf["no"]: caf["name"] for caf in self.CAFETERIAS}
+        cafeterias_by_date = {d: [] for d in dates}
+
+        # 주간 페이지는 한 번만 파싱하고, 그 주에 속한 날짜들에 나눠줌
+        for page in pages:
+            soup = make_soup(page.html, self.html_target)
+            menu_box = soup.select_one("ul.b-menu-box")
+            if not menu_box: continue
 
-        return SchoolData(
-            school_name=self.school_name,
-            school_region=self.school_region,
-            cafeterias=all_cafeterias
-        )
\ No newline at end of file
+            caf_name = caf_names.get(page.key, page.key)
+            for d in dates:
+                if self._week_start(d) != page.target_date: continue
+
+                daily_menus = self._parse_day(menu_box, d)
+                if daily_menus:
+                    print(f"  ✅ {caf_name} ({d}): {len(daily_menus)}개의 식단 수집 완료")
+                    cafeterias_by_date[d].append(CafeteriaData(name=caf_name, menus=daily_menus))
+
+        return {
+            d: SchoolData(
+                school_name=self.school_name,
+                school_region=self.school_region,
+                cafeterias=cafeterias
+            )
+            for d, cafeterias in cafeterias_by_date.items() if cafeterias
+        }
@@ -1,71 +1,55 @@
-import sys
-# Python 3.13 호환성 패치
-if "cgi" not in sys.modules:
-    import html
-    from unittest.mock import MagicMock
-    mock_cgi = MagicMock()
-    def parse_header(line):
-        parts = line.split(';')
-        key = parts[0].strip()
-        pdict = {}
-        for part in parts[1:]:
-            if '=' in part:
-                name, value = part.split('=', 1)
-                name = name.strip()
-                value = value.strip().strip('"')
-                pdict[name] = value
-        return key, pdict
-    mock_cgi.parse_header = parse_header
-    mock_cgi.escape = html.escape
-    sys.modules["cgi"] = mock_cgi
-
-from bs4 import BeautifulSoup
 from datetime import date
+import asyncio
 from typing import List, Optional
 import re
-import httpx
 from app.services.crawler.scrapers import BaseScraper
-from app.schemas.crawler import SchoolData, CafeteriaData, MenuData
+from app.services.crawler.http_client import crawler_http
+from app.services.crawler.html import HtmlTarget, decode_html, make_soup
+from app.services.crawler.rules import KeywordMatcher, header_matcher
+from app.schemas.crawler import SchoolData, CafeteriaData, MenuData, RawPage
+
+# =============================================================================
+# 0. 카이스트 메뉴 정리 규칙 (한 번만 컴파일)
+# =============================================================================
+IGNORE_KEYWORDS = KeywordMatcher([
+    "천원", "제공", "캠페인", "운영시간", "안녕하세요",
+    "학생증", "간식", "참고", "감사합니다", "부탁", "소지", "kcal",
+    "원산지", "게시", "주간", "변경", "문의", "종료", "함께", "리더십", "미운영"
+])
+TAIL_NUMBERS = re.compile(r'\d+(?:,\d+)*$')           # 꼬리 숫자 (알레르기 정보, 예: "찌개5,6,10")
 
 # =============================================================================
 # 1. 카이스트 식당 공통 부모 클래스
 # =============================================================================
 class KaistCafeteriaBase:
+    http_profile = "kaist"
+    # 페이지에서 실제로 보는 건 식단 표 하나뿐
+    html_target = HtmlTarget("table", "table")
+
     def __init__(self, code: str, name: str):
         self.code = code
         self.name = name
         self.base_url = "https://www.kaist.ac.kr/kr/html/campus/053001.html"
 
     async def fetch_html(self, target_date: date) -> Optional[str]:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        }
         formatted_date = target_date.strftime("%Y-%m-%d")
         target_url = f"{self.base_url}?dvs_cd={self.code}&stt_dt={formatted_date}"
         
         try:
-            async with httpx.AsyncClient(verify=False, headers=headers, timeout=10.0) as client:
-                response = await client.get(target_url)
-                if response.status_code == 200:
-                    response.encoding = "utf-8"
-                    return response.text
-                return None
+            response = await crawler_http.get(self.http_profile, target_url, timeout=10.0, target_date=target_date)
+            if response.status_code == 200:
+                return decode_html(self.http_profile, response.content)
+            return None
         except Exception as e:
             print(f"     ❌ 에러 발생: {self.name} ({str(e)}) -> Skip")
             return None
 
     def _clean_menu_item(self, text: str) -> str:
         """메뉴 이름 정리 및 잡다한 공지사항 제거"""
-        text = re.sub(r'[\[\(][0-9.,원\s]+[\]\)]', '', text) # 괄호 안의 정보 제거
+        # 괄호 속 가격/알레르기 번호는 normalizer가 한 곳에서 지움 (여기서는 이 사이트 모양에 딸린 것만)
         text = text.replace('"', '').replace('★', '').strip()
         
-        ignore_keywords = [
-            "천원", "제공", "캠페인", "운영시간", "안녕하세요", 
-            "학생증", "간식", "참고", "감사합니다", "부탁", "소지", "kcal",
-            "원산지", "게시", "주간", "변경", "문의", "종료", "함께", "리더십", "미운영"
-        ]
-        
-        if any(keyword in text for keyword in ignore_keywords):
+        if IGNORE_KEYWORDS.search(text):
             return "" 
         
         if len(text) <= 1:
@@ -81,8 +65,10 @@ class KaistCafeteriaBase:
     async def parse(self, target_date: date) -> Optional[CafeteriaData]:
         html = await self.fetch_html(target_date)
         if not html: return None
-        
-        soup = BeautifulSoup(html, 'html.parser')
+        return self.parse_html(html, target_date)
+
+    def parse_html(self, html: str, target_date: date) -> Optional[CafeteriaData]:
+        soup = make_soup(html, self.html_target)
         
         table = soup.find("table", class_="table")
         if not table: return None
@@ -106,19 +92,15 @@ class KaistCafeteriaBase:
         extracted_menus = []
         current_category = default_category
         current_items = []
+        headers = header_matcher(keywords_map)
 
         for line in lines:
-            is_header = False
-            for key, category_code in keywords_map.items():
-                if key in line:
-                    if current_category and current_items:
-                        extracted_menus.append(MenuData(meal_type=current_category, menu_items=current_items, date=target_date))
-                    current_category = category_code
-                    current_items = []
-                    is_header = True
-                    break
-            
-            if is_header:
+            category_code = headers.match(line)
+            if category_code:
+                if current_category and current_items:
+                    extracted_menus.append(MenuData(meal_type=current_category, menu_items=current_items, date=target_date))
+                current_category = category_code
+                current_items = []
                 continue
 
             if current_category:
@@ -178,7 +160,7 @@ class MunjiParser(KaistCafeteriaBase):
     def _clean_menu_item(self, text: str) -> str:
         text = super()._clean_menu_item(text)
         # 문지 특유의 꼬리 숫자 제거 (예: "찌개5,6,10")
-        text = re.sub(r'\d+(?:,\d+)*$', '', text).strip()
+        text = TAIL_NUMBERS.sub('', text).strip()
         return text
 
     def _extract_menus(self, tds, target_date: date) -> List[MenuData]:
@@ -196,7 +178,7 @@ class HwaamParser(KaistCafeteriaBase):
     def _clean_menu_item(self, text: str) -> str:
         text = super()._clean_menu_item(text)
         # 화암도 문지처럼 꼬리 숫자(알레르기 정보)가 붙어 나옴
-        text = re.sub(r'\d+(?:,\d+)*$', '', text).strip()
+        text = TAIL_NUMBERS.sub('', text).strip()
         return text
 
     def _extract_menus(self, tds, target_date: date) -> List[MenuData]:
@@ -212,6 +194,8 @@ class HwaamParser(KaistCafeteriaBase):
 # 3. 메인 스크래퍼
 # =============================================================================
 class KaistScraper(BaseScraper):
+    http_profile = "kaist"
+
     def __init__(self):
         super().__init__(
             school_name="KAIST",
@@ -226,13 +210,25 @@ class KaistScraper(BaseScraper):
             HwaamParser(), # 화암 추가 완료
         ]
 
-    async def parse(self, target_date: date) -> Optional[SchoolData]:
+    async def fetch(self, target_date: date) -> List[RawPage]:
+        # 식당 페이지들을 한꺼번에 요청 (호스트별 동시 요청 수/간격은 crawler_http가 조절)
+        htmls = await asyncio.gather(*(parser.fetch_html(target_date) for parser in self.parsers))
+        return [
+            RawPage(key=parser.code, html=html)
+            for parser, html in zip(self.parsers, htmls) if html
+        ]
+
+    def parse_pages(self, pages: List[RawPage], target_date: date) -> Optional[SchoolData]:
         print(f"⚡ KAIST 전체 식당 파싱 시작 ({target_date})")
         
         all_cafeterias = []
+        parsers = {parser.code: parser for parser in self.parsers}
+
+        for page in pages:
+            parser = parsers.get(page.key)
+            if not parser: continue
 
-        for parser in self.parsers:
-            caf_data = await parser.parse(target_date)
+            caf_data = parser.parse_html(page.html, target_date)
             if caf_data:
                 print(f"  ✅ {caf_data.name} 데이터 수집 완료")
                 all_cafeterias.append(caf_data)
@@ -1,12 +1,49 @@
-from bs4 import BeautifulSoup
 from datetime import date
 from typing import List, Optional
 import re
-import httpx
 from app.services.crawler.scrapers import BaseScraper
-from app.schemas.crawler import SchoolData, CafeteriaData, MenuData
+from app.services.crawler.http_client import crawler_http
+from app.services.crawler.html import HtmlTarget, decode_html, make_soup
+from app.services.crawler.rules import KeywordMatcher, LineClassifier, LineRule, SKIP_LINE
+from app.schemas.crawler import SchoolData, CafeteriaData, MenuData, RawPage
+
+# =============================================================================
+# 서울대 식단 줄 분류 규칙 (위에 있는 규칙이 먼저 적용됨)
+# =============================================================================
+LINE_RULES = LineClassifier([
+    # 1. 뷔페 감지 (302동 등)
+    LineRule(r"뷔페", "_BUFFET"),
+    # 2. 천원의 아침밥 (301동)
+    LineRule(r"천원의", "_1000", requires=["아침"]),
+    # 3. 교직원 식당 (301동)
+    LineRule(r"교직원", "_FACULTY"),
+    # 4. [식사] -> 기본 메뉴로 복귀 (301동)
+    LineRule(r"\[식사\]|<식사>", "_RESET"),
+    # 5. Take-out / 카페 감지 (Take-out, Takeout, Take out, Cafe, 카페 모두 잡음)
+    LineRule(r"Take\s*-?\s*out|테이크\s*아웃|카페|Cafe", "_TAKEOUT", flags=re.IGNORECASE),
+    # 6. A/B/C 코너 감지 (헤더 부분만 지우고 같은 줄의 메뉴는 살림)
+    LineRule(r"A코너", "_A", strip=r"[\[\<]?\s*A코너\s*[\]\>]?[\s:]*"),
+    LineRule(r"B코너", "_B", strip=r"[\[\<]?\s*B코너\s*[\]\>]?[\s:]*"),
+    LineRule(r"C코너", "_C", strip=r"[\[\<]?\s*C코너\s*[\]\>]?[\s:]*"),
+    # 7. 셀프/주문식 감지 (주문 마감 안내 같은 공지 줄은 통째로 버림)
+    LineRule(r"셀프", "_SELF", strip=r"[\[\<]?\s*(셀프코너|셀프)\s*[\]\>]?[\s:]*"),
+    LineRule(r"주문", "_ORDER", strip=r"[\[\<]?\s*(주문식\s*메뉴|주문식|주문)\s*[\]\>]?[\s:]*", skip_if=["마감", "시간", "종료"]),
+])
+
+# 불필요한 공지 키워드
+IGNORE_KEYWORDS = KeywordMatcher([
+    "제공", "운영", "식단", "참고", "안내", "문의", "품절",
+    "배식", "kcal", "원산지", "마감", "종료", "시간", "부탁"
+])
+PRICE_ONLY = re.compile(r'^\s*[\d,]+\s*원?\s*$')
+ANGLE_BRACKETS = re.compile(r'<([^>]+)>')
+HASH_MARK = re.compile(r'\([#]\)')
 
 class SnuScraper(BaseScraper):
+    http_profile = "snu"
+    # 식단 표는 헤더(조식/중식/석식)로 찾아야 해서 표는 전부 남겨둠
+    html_target = HtmlTarget("table")
+
     def __init__(self):
         super().__init__(
             school_name="서울대학교",
@@ -15,22 +52,20 @@ class SnuScraper(BaseScraper):
         )
 
     async def fetch_html(self, target_date: date):
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        }
         formatted_date = target_date.strftime("%Y-%m-%d")
         target_url = f"{self.url}?date={formatted_date}"
         
         print(f"  ➳ 접속 시도: {self.school_name} ({target_url})")
 
         try:
-            async with httpx.AsyncClient(verify=False, headers=headers, timeout=10.0) as client:
-                response = await client.get(target_url)
-                if response.status_code == 200:
-                    return response.text
-                else:
-                    print(f"     ⚠️ 접속 실패 (Status: {response.status_code}) -> Skip")
-                    return None
+            response = await crawler_http.get(self.http_profile, target_url, timeout=10.0, target_date=target_date)
+            if response.status_code == 200:
+                return decode_html(self.http_profile, response.content)
+            elif response.status_code == 304:
+                return None # 지난번과 같은 페이지 (조건부 요청 캐시) -> 파싱할 필요 없음
+            else:
+                print(f"     ⚠️ 접속 실패 (Status: {response.status_code}) -> Skip")
+                return None
         except Exception as e:
             print(f"     ❌ 에러 발생: {str(e)} -> Skip")
             return None
@@ -49,20 +84,15 @@ class SnuScraper(BaseScraper):
             return ""
 
         # 가격만 덩그러니 있는 줄 제거
-        if re.match(r'^\s*[\d,]+\s*원?\s*$', text):
+        if PRICE_ONLY.match(text):
             return ""
 
         # 특수문자 정리
-        text = re.sub(r'<([^>]+)>', r'[\1]', text)
-        text = re.sub(r'\([#]\)', '', text)
+        text = ANGLE_BRACKETS.sub(r'[\1]', text)
+        text = HASH_MARK.sub('', text)
         
         # 불필요한 공지 키워드 삭제
-        ignore_keywords = [
-            "제공", "운영", "식단", "참고", "안내", "문의", "품절", 
-            "배식", "kcal", "원산지", "마감", "종료", "시간", "부탁"
-        ]
-        
-        if any(keyword in text for keyword in ignore_keywords):
+        if IGNORE_KEYWORDS.search(text):
             return ""
             
         return text.strip()
@@ -86,57 +116,20 @@ class SnuScraper(BaseScraper):
         for line in lines:
             if "※" in line: continue
 
-            # === 코너 및 메뉴 감지 로직 ===
+            # === 코너 및 메뉴 감지 로직 (LINE_RULES 표를 한 번에 검사) ===
             new_suffix = None
             content_to_add = line
             add_this_line = True # 기본적으로 내용은 메뉴에 추가함
-            
-            # 1. 뷔페 감지 (302동 등)
-            if "뷔페" in line:
-                new_suffix = "_BUFFET"
-                add_this_line = False 
 
-            # 2. 천원의 아침밥 (301동)
-            elif "천원의" in line and "아침" in line:
-                new_suffix = "_1000" 
-                add_this_line = False
-
-            # 3. 교직원 식당 (301동)
-            elif "교직원" in line:
-                new_suffix = "_FACULTY"
-                add_this_line = False
-
-            # 4. [식사] -> 기본 메뉴로 복귀 (301동)
-            elif "[식사]" in line or "<식사>" in line:
-                new_suffix = "_RESET" # 그냥 LUNCH/DINNER로 돌아감
-                add_this_line = False
-
-            # 5. [강화됨] Take-out / 카페 감지 (대소문자 무시, 하이픈 유연하게)
-            # Take-out, Takeout, Take out, Cafe, 카페 모두 잡음
-            elif re.search(r'Take\s*-?\s*out|테이크\s*아웃|카페|Cafe', line, re.IGNORECASE):
-                new_suffix = "_TAKEOUT" 
-                add_this_line = False   # 헤더 텍스트는 메뉴 목록에서 뺌
-
-            # 6. A/B/C 코너 감지
-            elif re.search(r'[\[\<]?\s*A코너\s*[\]\>]?', line):
-                new_suffix = "_A"
-                content_to_add = re.sub(r'[\[\<]?\s*A코너\s*[\]\>]?[\s:]*', '', line)
-            elif re.search(r'[\[\<]?\s*B코너\s*[\]\>]?', line):
-                new_suffix = "_B"
-                content_to_add = re.sub(r'[\[\<]?\s*B코너\s*[\]\>]?[\s:]*', '', line)
-            elif re.search(r'[\[\<]?\s*C코너\s*[\]\>]?', line):
-                new_suffix = "_C"
-                content_to_add = re.sub(r'[\[\<]?\s*C코너\s*[\]\>]?[\s:]*', '', line)
-            
-            # 7. 셀프/주문식 감지
-            elif "셀프" in line: 
-                new_suffix = "_SELF"
-                content_to_add = re.sub(r'[\[\<]?\s*(셀프코너|셀프)\s*[\]\>]?[\s:]*', '', line)
-            elif "주문" in line: 
-                if any(bad in line for bad in ["마감", "시간", "종료"]): 
+            matched = LINE_RULES.classify(line)
+            if matched:
+                new_suffix, stripped = matched
+                if new_suffix == SKIP_LINE:
                     continue
-                new_suffix = "_ORDER"
-                content_to_add = re.sub(r'[\[\<]?\s*(주문식\s*메뉴|주문식|주문)\s*[\]\>]?[\s:]*', '', line)
+                if stripped is None:
+                    add_this_line = False # 헤더 텍스트는 메뉴 목록에서 뺌
+                else:
+                    content_to_add = stripped
 
             # === 상태 변경 처리 ===
             if new_suffix:
@@ -176,12 +169,11 @@ class SnuScraper(BaseScraper):
             
         return generated_menus
 
-    async def parse(self, target_date: date) -> Optional[SchoolData]:
+    def parse_pages(self, pages: List[RawPage], target_date: date) -> Optional[SchoolData]:
         print(f"⚡ 서울대학교 식단 파싱 시작 ({target_date})")
-        html = await self.fetch_html(target_date)
-        if not html: return None
+        if not pages: return None
         
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(pages[0].html, self.html_target)
         
         tables = soup.find_all("table")
         target_table = None
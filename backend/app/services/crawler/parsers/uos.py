@@ -1,36 +1,38 @@
-import sys
-# Python 3.13 호환성 패치
-if "cgi" not in sys.modules:
-    import html
-    from unittest.mock import MagicMock
-    mock_cgi = MagicMock()
-    def parse_header(line):
-        parts = line.split(';')
-        key = parts[0].strip()
-        pdict = {}
-        for part in parts[1:]:
-            if '=' in part:
-                name, value = part.split('=', 1)
-                name = name.strip()
-                value = value.strip().strip('"')
-                pdict[name] = value
-        return key, pdict
-    mock_cgi.parse_header = parse_header
-    mock_cgi.escape = html.escape
-    sys.modules["cgi"] = mock_cgi
-
-from bs4 import BeautifulSoup
 from datetime import date
+import asyncio
 from typing import List, Optional
 import re
-import httpx
 from app.services.crawler.scrapers import BaseScraper
-from app.schemas.crawler import SchoolData, CafeteriaData, MenuData
+from app.services.crawler.http_client import crawler_http
+from app.services.crawler.html import HtmlTarget, decode_html, make_soup
+from app.services.crawler.rules import KeywordMatcher, header_matcher
+from app.schemas.crawler import SchoolData, CafeteriaData, MenuData, RawPage
+
+# =============================================================================
+# 0. 서울시립대 메뉴 정리 규칙 (한 번만 컴파일)
+# =============================================================================
+IGNORE_KEYWORDS = KeywordMatcher([
+    "kcal", "g/", "원산지", "돈육", "계육", "우육", "국내산", "호주산", "브라질산",
+    "중국산", "식재료", "조달", "내부", "사정", "변동", "토핑", "코너", "운영시간",
+    "식단", "제공", "마감", "입장", "예약", "신청", "이메일", "접수", "회신", "인원",
+    "주간별", "미운영"
+])
+PAREN = re.compile(r'\([^)]*\)')  # 가격 줄 판별할 때 괄호 부분은 빼고 봄
+TIME_RANGE = re.compile(r'\d{1,2}:\d{2}~\d{1,2}:\d{2}')
+TIME = re.compile(r'\d{1,2}:\d{2}')
+DIGITS = re.compile(r'[0-9,]')
+HANGUL = re.compile(r'[가-힣]')
+PRICE_LINE = re.compile(r'^\d{1,3}(,\d{3})*원')
+PLUS_MENU_HEADER = re.compile(r'^\s*[\*]*\s*플러스\s*메뉴\s*[:]*\s*')
 
 # =============================================================================
 # 1. 서울시립대 공통 부모 클래스
 # =============================================================================
 class UosCafeteriaBase:
+    http_profile = "uos"
+    # 식단은 <div id="day"> 안의 표에만 있음
+    html_target = HtmlTarget("div", id="day")
+
     def __init__(self, name: str, menuid: str, rstcde: str = None):
         self.name = name
         self.menuid = menuid
@@ -38,11 +40,6 @@ class UosCafeteriaBase:
         self.base_url = "https://www.uos.ac.kr/food/placeList.do"
 
     async def fetch_html(self, target_date: date) -> Optional[str]:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Referer": "https://www.uos.ac.kr/food/placeList.do",
-            "Origin": "https://www.uos.ac.kr"
-        }
         formatted_date = target_date.strftime("%Y%m%d")
         
         # URL 파라미터 (식당 구분용 rstcde는 URL에 붙임)
@@ -57,38 +54,39 @@ class UosCafeteriaBase:
         }
         
         try:
-            async with httpx.AsyncClient(verify=False, headers=headers, timeout=10.0, follow_redirects=True) as client:
-                response = await client.post(self.base_url, params=params, data=data)
-                
-                if response.status_code == 200:
-                    response.encoding = "utf-8"
-                    if len(response.text) < 1000:
-                        print(f"     ⚠️ {self.name}: 응답이 너무 짧음 ({len(response.text)} bytes)")
-                    return response.text
-                else:
-                    print(f"     ⚠️ {self.name}: 상태 코드 이상 ({response.status_code})")
-                    return None
+            response = await crawler_http.post(
+                self.http_profile, self.base_url,
+                params=params, data=data, timeout=10.0, follow_redirects=True,
+                target_date=target_date
+            )
+
+            if response.status_code == 200:
+                html = decode_html(self.http_profile, response.content)
+                if len(html) < 1000:
+                    print(f"     ⚠️ {self.name}: 응답이 너무 짧음 ({len(html)} bytes)")
+                return html
+            elif response.status_code == 304:
+                return None # 지난번과 같은 페이지 (조건부 요청 캐시) -> 파싱할 필요 없음
+            else:
+                print(f"     ⚠️ {self.name}: 상태 코드 이상 ({response.status_code})")
+                return None
         except Exception as e:
             print(f"     ❌ 에러 발생: {self.name} ({str(e)}) -> Skip")
             return None
 
     def _clean_menu_item(self, text: str) -> str:
-        """기본 정리 로직 (가격 삭제 포함)"""
-        text = re.sub(r'\([0-9,]+원\)', '', text)
+        """
+        기본 정리 로직 (이 사이트의 가격 줄/운영시간 줄 제거).
+        메뉴 이름에 붙은 괄호 속 가격 "(5,000원)"은 normalizer가 한 곳에서 지움
+        """
         text = text.replace('"', '').strip()
         
-        ignore_keywords = [
-            "kcal", "g/", "원산지", "돈육", "계육", "우육", "국내산", "호주산", "브라질산", 
-            "중국산", "식재료", "조달", "내부", "사정", "변동", "토핑", "코너", "운영시간",
-            "식단", "제공", "마감", "입장", "예약", "신청", "이메일", "접수", "회신", "인원",
-            "주간별", "미운영"
-        ]
-        
-        if re.search(r'\d{1,2}:\d{2}~\d{1,2}:\d{2}', text): return ""
-        if "원" in text and re.search(r'[0-9,]', text): return "" 
-        if not re.search(r'[가-힣]', text): return "" 
+        if TIME_RANGE.search(text): return ""
+        outside = PAREN.sub('', text).strip() or text  # 괄호만 있는 줄 "(5,000원)"은 그대로 가격 줄
+        if "원" in outside and DIGITS.search(outside): return "" 
+        if not HANGUL.search(text): return "" 
 
-        if any(keyword in text for keyword in ignore_keywords): return "" 
+        if IGNORE_KEYWORDS.search(text): return "" 
         if len(text) <= 1: return ""
         return text.strip()
 
@@ -100,7 +98,10 @@ class UosCafeteriaBase:
     async def parse(self, target_date: date) -> Optional[CafeteriaData]:
         html = await self.fetch_html(target_date)
         if not html: return None
-        soup = BeautifulSoup(html, 'html.parser')
+        return self.parse_html(html, target_date)
+
+    def parse_html(self, html: str, target_date: date) -> Optional[CafeteriaData]:
+        soup = make_soup(html, self.html_target)
         
         day_div = soup.find("div", id="day")
         if not day_div:
@@ -128,20 +129,17 @@ class UosCafeteriaBase:
         extracted_menus = []
         current_category = default_category
         current_items = []
+        headers = header_matcher(keywords_map)
 
         for line in lines:
-            is_header = False
-            for key, category_code in keywords_map.items():
-                if key in line:
-                    if current_category and current_items and current_category != "IGNORE":
-                        extracted_menus.append(MenuData(meal_type=current_category, menu_items=current_items, date=target_date))
-                    
-                    current_category = category_code
-                    current_items = []
-                    is_header = True
-                    break
-            
-            if is_header: continue
+            category_code = headers.match(line)
+            if category_code:
+                if current_category and current_items and current_category != "IGNORE":
+                    extracted_menus.append(MenuData(meal_type=current_category, menu_items=current_items, date=target_date))
+                
+                current_category = category_code
+                current_items = []
+                continue
 
             if current_category and current_category != "IGNORE":
                 cleaned = self._clean_menu_item(line)
@@ -180,7 +178,7 @@ class IrumLoungeParser(UosCafeteriaBase):
         processed = []
         for line in lines:
             if "플러스 메뉴" in line:
-                content = re.sub(r'^\s*[\*]*\s*플러스\s*메뉴\s*[:]*\s*', '', line)
+                content = PLUS_MENU_HEADER.sub('', line)
                 processed.append("플러스 메뉴")
                 items = [item.strip() for item in content.split(',') if item.strip()]
                 processed.extend(items)
@@ -232,13 +230,13 @@ class WesternRestaurantParser(UosCafeteriaBase):
             if not line: continue
             
             # 1. 시간 패턴이나 불필요한 라인 무시
-            if re.search(r'\d{1,2}:\d{2}', line): continue
+            if TIME.search(line): continue
             
             # 2. 카테고리 패턴 무시 (예: (양식류), (덮밥류))
             if line.startswith('(') and line.endswith(')'): continue
             
             # 3. 가격 패턴 확인 (숫자와 '원'이 포함된 경우)
-            if re.search(r'^\d{1,3}(,\d{3})*원', line):
+            if PRICE_LINE.search(line):
                 if current_menu_name:
                     # 가격을 찾으면 직전에 찾은 메뉴명과 합침
                     menu_items.append(f"{current_menu_name}: {line}")
@@ -247,7 +245,7 @@ class WesternRestaurantParser(UosCafeteriaBase):
                 # 4. 메뉴명 후보 찾기
                 # 한글이 포함되어 있어야 유효한 메뉴명으로 간주 (영어 설명 제외)
                 # '탄산음료(Soda)' 같이 한글+영어가 섞인 경우도 있으니 한글 유무로 판단
-                if re.search(r'[가-힣]', line):
+                if HANGUL.search(line):
                     current_menu_name = line
                     
         if not menu_items:
@@ -270,6 +268,8 @@ class NaturalScienceHallParser(UosCafeteriaBase):
 # 3. 메인 스크래퍼
 # =============================================================================
 class UosScraper(BaseScraper):
+    http_profile = "uos"
+
     def __init__(self):
         super().__init__(
             school_name="서울시립대학교",
@@ -283,13 +283,25 @@ class UosScraper(BaseScraper):
             NaturalScienceHallParser(),
         ]
 
-    async def parse(self, target_date: date) -> Optional[SchoolData]:
+    async def fetch(self, target_date: date) -> List[RawPage]:
+        # 식당 페이지들을 한꺼번에 요청 (호스트별 동시 요청 수/간격은 crawler_http가 조절)
+        htmls = await asyncio.gather(*(parser.fetch_html(target_date) for parser in self.parsers))
+        return [
+            RawPage(key=parser.name, html=html)
+            for parser, html in zip(self.parsers, htmls) if html
+        ]
+
+    def parse_pages(self, pages: List[RawPage], target_date: date) -> Optional[SchoolData]:
         print(f"⚡ 서울시립대 파싱 시작 ({target_date})")
         
         all_cafeterias = []
+        parsers = {parser.name: parser for parser in self.parsers}
+
+        for page in pages:
+            parser = parsers.get(page.key)
+            if not parser: continue
 
-        for parser in self.parsers:
-            caf_data = await parser.parse(target_date)
+            caf_data = parser.parse_html(page.html, target_date)
             if caf_data:
                 print(f"  ✅ {caf_data.name} 데이터 수집 완료")
                 all_cafeterias.append(caf_data)
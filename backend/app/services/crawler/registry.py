@@ -0,0 +1,121 @@
+import importlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class ScraperSpec:
+    """
+    학교 하나에 대한 등록 정보 (스크래퍼 모듈은 실제로 긁을 때 처음 import 함).
+    init_data가 이 정보로 학교/식당 기초 데이터를 만들고, AutoFiller는 필요한 학교만 불러옴.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        school_name: str,
+        region: str,
+        host: str,
+        cafeterias: List[str],
+        scraper: str,
+        range_modes: Tuple[str, ...] = ("daily",),
+    ):
+        self.key = key                  # 짧은 이름 (http 프로필 이름과 같음)
+        self.school_name = school_name  # DB에 저장되는 학교 이름
+        self.region = region
+        self.host = host
+        self.cafeterias = cafeterias    # 파서가 만들어내는 식당 이름들
+        self.scraper = scraper          # "모듈:클래스"
+        self.range_modes = range_modes  # "daily" (날짜마다 페이지) / "weekly" (주간 페이지)
+        self._instance = None
+
+    def load(self):
+        """스크래퍼를 처음 쓸 때 모듈을 import해서 만들고, 이후에는 재사용"""
+        if self._instance is None:
+            module_name, class_name = self.scraper.split(":")
+            scraper_cls = getattr(importlib.import_module(module_name), class_name)
+            self._instance = scraper_cls()
+            if self._instance.school_name != self.school_name:
+                print(f"⚠️ [레지스트리] {self.key}: 등록 이름({self.school_name})과 스크래퍼 이름({self._instance.school_name})이 다름")
+        return self._instance
+
+    @property
+    def loaded(self) -> bool:
+        return self._instance is not None
+
+    def __repr__(self):
+        return f"ScraperSpec({self.key}, {self.school_name})"
+
+
+SCRAPER_REGISTRY: Dict[str, ScraperSpec] = {
+    spec.key: spec for spec in [
+        ScraperSpec(
+            key="kaist",
+            school_name="KAIST",
+            region="대전",
+            host="www.kaist.ac.kr",
+            cafeterias=["카이마루", "서맛골", "교수회관", "문지캠퍼스", "화암 기숙사 식당"],
+            scraper="app.services.crawler.parsers.kaist:KaistScraper",
+        ),
+        ScraperSpec(
+            key="snu",
+            school_name="서울대학교",
+            region="서울",
+            host="snuco.snu.ac.kr",
+            cafeterias=[
+                "학생회관식당", "자하연식당 3층", "자하연식당 2층", "예술계식당", "두레미담",
+                "동원관식당", "기숙사식당", "3식당", "302동식당", "301동식당",
+            ],
+            scraper="app.services.crawler.parsers.snu:SnuScraper",
+        ),
+        ScraperSpec(
+            key="ewha",
+            school_name="이화여자대학교",
+            region="서울",
+            host="www.ewha.ac.kr",
+            cafeterias=["I-House 학생식당", "진·선·미관 식당", "공대식당", "한우리집 식당", "E-House 식당(201동)"],
+            scraper="app.services.crawler.parsers.ewha:EwhaScraper",
+            range_modes=("weekly",),
+        ),
+        ScraperSpec(
+            key="cnu",
+            school_name="충남대학교",
+            region="대전",
+            host="mobileadmin.cnu.ac.kr",
+            # 제1학생회관은 표에서 병합돼 있어서 수집 안 함
+            cafeterias=["제2학생회관", "제3학생회관", "제4학생회관", "생활과학대학"],
+            scraper="app.services.crawler.parsers.cnu:CnuScraper",
+        ),
+        ScraperSpec(
+            key="uos",
+            school_name="서울시립대학교",
+            region="서울",
+            host="www.uos.ac.kr",
+            cafeterias=["학생회관 1층", "이룸라운지", "양식당", "자연과학관"],
+            scraper="app.services.crawler.parsers.uos:UosScraper",
+        ),
+    ]
+}
+
+
+def get_spec(school: str) -> Optional[ScraperSpec]:
+    """짧은 이름(kaist) 또는 학교 이름(KAIST, 서울대학교)으로 찾기"""
+    if school in SCRAPER_REGISTRY:
+        return SCRAPER_REGISTRY[school]
+    for spec in SCRAPER_REGISTRY.values():
+        if spec.school_name == school:
+            return spec
+    return None
+
+
+def select_specs(schools: Optional[Iterable[str]] = None) -> List[ScraperSpec]:
+    """schools가 없으면 전체, 있으면 그 학교들만 (등록 순서 유지)"""
+    if not schools:
+        return list(SCRAPER_REGISTRY.values())
+
+    selected = set()
+    for school in schools:
+        spec = get_spec(school)
+        if spec is None:
+            print(f"⚠️ [레지스트리] 등록되지 않은 학교: {school} (Skip)")
+            continue
+        selected.add(spec.key)
+    return [spec for key, spec in SCRAPER_REGISTRY.items() if key in selected]
@@ -0,0 +1,115 @@
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# classify()가 "이 줄은 통째로 버려라"라고 알려줄 때 쓰는 값
+SKIP_LINE = "_SKIP"
+
+
+class KeywordMatcher:
+    """
+    키워드 목록 중 하나라도 들어 있는지 한 번에 검사 (정규식 하나로 합쳐서 컴파일).
+    any(k in text for k in keywords) 대신 씀.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(keywords)
+        # 긴 키워드를 앞에 둬야 "고급식A"가 "고급식"보다 먼저 잡힘
+        ordered = sorted(self.keywords, key=len, reverse=True)
+        self.pattern = re.compile("|".join(re.escape(k) for k in ordered)) if ordered else None
+
+    def search(self, text: str) -> bool:
+        return self.pattern is not None and self.pattern.search(text) is not None
+
+
+class HeaderMatcher:
+    """
+    {"A코너": "LUNCH_A", ...} 같은 헤더 표를 정규식 하나로 컴파일.
+    대부분의 줄(메뉴)은 정규식 한 번으로 '헤더 아님'이 결정되고,
+    헤더 줄일 때만 예전과 똑같이 표에 적힌 순서대로 우선순위를 정함.
+    """
+
+    def __init__(self, mapping: Dict[str, str]):
+        self.mapping = dict(mapping)
+        self.keywords = KeywordMatcher(self.mapping)
+
+    def match(self, line: str) -> Optional[str]:
+        if not self.keywords.search(line):
+            return None
+        for key, category in self.mapping.items():
+            if key in line:
+                return category
+        return None
+
+
+@lru_cache(maxsize=None)
+def _header_matcher(items: Tuple[Tuple[str, str], ...]) -> HeaderMatcher:
+    return HeaderMatcher(dict(items))
+
+
+def header_matcher(mapping: Dict[str, str]) -> HeaderMatcher:
+    """같은 헤더 표는 한 번만 컴파일 (파서가 매번 dict를 새로 만들어 넘겨도 괜찮음)"""
+    return _header_matcher(tuple(mapping.items()))
+
+
+class LineRule:
+    """
+    줄 분류 규칙 하나.
+    - pattern : 이 줄이 해당하는지 (정규식)
+    - suffix  : 해당하면 붙일 식사 종류 접미사 (예: "_A" -> LUNCH_A)
+    - strip   : 줄에서 헤더 부분만 지우고 나머지는 메뉴로 씀 (None이면 줄 자체가 헤더라서 버림)
+    - requires: 같이 들어 있어야 하는 단어들
+    - skip_if : 이 단어가 있으면 공지 줄이라 통째로 버림
+    """
+
+    def __init__(
+        self,
+        pattern: str,
+        suffix: str,
+        strip: Optional[str] = None,
+        requires: Iterable[str] = (),
+        skip_if: Iterable[str] = (),
+        flags: int = 0,
+    ):
+        self.source = pattern
+        self.flags = flags
+        self.pattern = re.compile(pattern, flags)
+        self.suffix = suffix
+        self.strip = re.compile(strip, flags) if strip else None
+        self.requires = tuple(requires)
+        self.skip_if = KeywordMatcher(skip_if) if skip_if else None
+
+
+class LineClassifier:
+    """
+    순서가 있는 규칙 표(if/elif 체인)를 컴파일한 것.
+    모든 규칙을 하나로 합친 정규식으로 먼저 걸러서, 평범한 메뉴 줄은 검사 한 번으로 끝남.
+    """
+
+    def __init__(self, rules: List[LineRule]):
+        self.rules = rules
+        parts = []
+        for rule in rules:
+            source = rule.source
+            if rule.flags & re.IGNORECASE:
+                source = f"(?i:{source})"
+            parts.append(f"(?:{source})")
+        self.prefilter = re.compile("|".join(parts))
+
+    def classify(self, line: str) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        (접미사, 메뉴로 쓸 내용) 또는 None(규칙에 안 걸리는 평범한 줄).
+        메뉴로 쓸 내용이 None이면 헤더 줄이라 메뉴에는 안 넣음.
+        """
+        if not self.prefilter.search(line):
+            return None
+        for rule in self.rules:
+            if not rule.pattern.search(line):
+                continue
+            if rule.requires and not all(word in line for word in rule.requires):
+                continue
+            if rule.skip_if and rule.skip_if.search(line):
+                return SKIP_LINE, None
+            content = rule.strip.sub("", line) if rule.strip else None
+            return rule.suffix, content
+        return None
@@ -1,10 +1,16 @@
-import httpx
-from bs4 import BeautifulSoup
-from datetime import date
-from typing import List, Optional  # 타입 힌트 추가
-from app.schemas.crawler import SchoolData, CafeteriaData, MenuData
+import asyncio
+from datetime import date, timedelta
+from typing import Dict, List, Optional  # 타입 힌트 추가
+from app.schemas.crawler import SchoolData, CafeteriaData, MenuData, RawPage
+from app.services.crawler.http_client import crawler_http
+from app.services.crawler.html import decode_html
 
 class BaseScraper:
+    # http_client.HEADER_PROFILES 중 어떤 헤더 묶음을 쓸지 (학교별로 오버라이딩)
+    http_profile = "default"
+    # 여러 날짜를 한 번에 긁는 방식: "daily" (날짜마다 페이지) / "weekly" (주간 페이지 하나에 일주일치)
+    range_mode = "daily"
+
     def __init__(self, school_name, school_region, url):
         self.school_name = school_name
         self.school_region = school_region
@@ -13,35 +19,75 @@ class BaseScraper:
     async def fetch_html(self, *args, **kwargs):
         """사이트에 접속해서 HTML 원본을 가져오는 함수"""
         # 자식 클래스에서 인자를 다르게 받을 수 있으므로 유연하게 처리
-        async with httpx.AsyncClient(verify=False) as client:
-            try:
-                response = await client.get(self.url)
-                if response.status_code == 200:
-                    return response.text
-                else:
-                    print(f"❌ 접속 실패! 상태 코드: {response.status_code}")
-                    return None
-            except Exception as e:
-                print(f"❌ 요청 중 에러 발생: {e}")
+        try:
+            response = await crawler_http.get(self.http_profile, self.url)
+            if response.status_code == 200:
+                return decode_html(self.http_profile, response.content)
+            elif response.status_code == 304:
+                return None # 지난번과 같은 페이지 (조건부 요청 캐시)
+            else:
+                print(f"❌ 접속 실패! 상태 코드: {response.status_code}")
                 return None
+        except Exception as e:
+            print(f"❌ 요청 중 에러 발생: {e}")
+            return None
 
-    async def parse(self, target_date: date) -> Optional[SchoolData]:
-        """HTML을 분석해서 데이터를 뽑아내는 함수 (학교마다 오버라이딩 필수)"""
+    async def fetch(self, target_date: date) -> List[RawPage]:
+        """
+        [수집 단계] 해당 날짜 파싱에 필요한 HTML 원본을 전부 받아오는 함수.
+        페이지가 여러 장인 학교(식당별 페이지 등)는 오버라이딩해서 key로 구분함.
+        """
+        html = await self.fetch_html(target_date)
+        return [RawPage(key="main", html=html)] if html else []
+
+    def parse_pages(self, pages: List[RawPage], target_date: date) -> Optional[SchoolData]:
+        """[파싱 단계] 받아온 HTML 원본을 분석해서 데이터를 뽑아내는 함수 (학교마다 오버라이딩 필수)"""
         # 기본 동작은 없으므로 None 반환 혹은 NotImplementedError 발생
         return None
 
+    async def parse(self, target_date: date) -> Optional[SchoolData]:
+        """수집 + 파싱을 한 번에 (단독 실행/디버깅용)"""
+        pages = await self.fetch(target_date)
+        if not pages: return None
+        return self.parse_pages(pages, target_date)
+
+    async def fetch_range(self, dates: List[date]) -> List[RawPage]:
+        """
+        [수집 단계 - 여러 날짜] 기본 구현은 날짜별 fetch를 한꺼번에 날림 (daily 방식).
+        주간 페이지가 있는 학교는 오버라이딩해서 페이지를 한 번만 받아야 함.
+        """
+        results = await asyncio.gather(*(self.fetch(d) for d in dates))
+        pages = []
+        for d, day_pages in zip(dates, results):
+            for page in day_pages:
+                page.target_date = d
+                pages.append(page)
+        return pages
+
+    def parse_range_pages(self, pages: List[RawPage], dates: List[date]) -> Dict[date, SchoolData]:
+        """[파싱 단계 - 여러 날짜] 기본 구현은 날짜별로 페이지를 나눠서 parse_pages에 넘김"""
+        results = {}
+        for d in dates:
+            day_pages = [page for page in pages if page.target_date == d]
+            if not day_pages: continue
+            school_data = self.parse_pages(day_pages, d)
+            if school_data:
+                results[d] = school_data
+        return results
+
+    async def parse_range(self, start: date, end: date) -> Dict[date, SchoolData]:
+        """start ~ end (양끝 포함) 기간의 데이터를 날짜별로 돌려줌"""
+        dates = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        pages = await self.fetch_range(dates)
+        if not pages: return {}
+        return self.parse_range_pages(pages, dates)
+
+
+def get_scrapers(schools: Optional[List[str]] = None) -> List[BaseScraper]:
+    """
+    등록된 스크래퍼 목록 (schools를 주면 그 학교들만, 짧은 이름/학교 이름 둘 다 됨).
+    스크래퍼 모듈은 여기서 처음 import 되니까, 학교 정보만 필요하면 registry.select_specs를 쓸 것.
+    """
+    from app.services.crawler.registry import select_specs
 
-def get_scrapers() -> List[BaseScraper]:
-    from app.services.crawler.parsers.kaist import KaistScraper
-    from app.services.crawler.parsers.snu import SnuScraper
-    from app.services.crawler.parsers.ewha import EwhaScraper
-    from app.services.crawler.parsers.cnu import CnuScraper
-    from app.services.crawler.parsers.uos import UosScraper
-
-    return [
-        KaistScraper(),
-        SnuScraper(),
-        EwhaScraper(),      
-        CnuScraper(),
-        UosScraper()
-    ]
\ No newline at end of file
+    return [spec.load() for spec in select_specs(schools)]
\ No newline at end of file
@@ -0,0 +1,200 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import time
+from datetime import date
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Set
+from app.core.config import settings
+
+
+class SnapshotStore:
+    """
+    크롤러가 받은 HTML 원본을 전부 남겨두는 저장소 (/data 볼륨).
+
+    - objects/ab/abcdef....gz : 본문을 gzip으로 압축해서 내용 해시(sha256) 이름으로 저장
+      (내용이 같으면 파일 하나만 남음 = content-addressed)
+    - index.json              : (학교, 날짜, 요청) -> 해시 목록
+    파서를 고쳤을 때 학교 사이트를 다시 안 두드리고 과거 페이지로 재파싱(replay)할 수 있음.
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._index: Optional[Dict[str, dict]] = None
+        self._refs: Counter = Counter()  # 해시 -> 그 파일을 가리키는 인덱스 항목 수 (0이 되면 파일 삭제)
+        self._writing: Set[str] = set()  # 파일은 썼는데 아직 인덱스에 안 들어간 해시 (정리하다 지우면 안 됨)
+        self._dirty = False
+
+    @staticmethod
+    def make_key(source: str, request_key: str, target_date: Optional[date]) -> str:
+        return f"{source}|{target_date.isoformat() if target_date else '-'}|{request_key}"
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}.gz")
+
+    def _index_path(self) -> str:
+        return os.path.join(self.root, "index.json")
+
+    def _load(self) -> Dict[str, dict]:
+        if self._index is None:
+            try:
+                with open(self._index_path(), "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._index = {}
+            self._refs = Counter(entry["hash"] for entry in self._index.values())
+        return self._index
+
+    def _write_object(self, digest: str, content: bytes):
+        path = self._object_path(digest)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    async def record(self, source: str, request_key: str, target_date: Optional[date], content: bytes, content_type: str = ""):
+        """응답 본문 저장 (파일 쓰기는 스레드로 넘겨서 이벤트 루프를 막지 않음)"""
+        digest = hashlib.sha256(content).hexdigest()
+        index = self._load()
+        self._writing.add(digest)
+        try:
+            await asyncio.to_thread(self._write_object, digest, content)
+        except OSError as e:
+            print(f"⚠️ [스냅샷] 저장 실패: {e}")
+            return
+        finally:
+            self._writing.discard(digest)
+
+        key = self.make_key(source, request_key, target_date)
+        previous = index.get(key)
+        self._refs[digest] += 1
+        index[key] = {
+            "hash": digest,
+            "source": source,
+            "date": target_date.isoformat() if target_date else None,
+            "request": request_key,
+            "content_type": content_type,
+            "size": len(content),
+            "fetched_at": int(time.time()),
+        }
+        self._dirty = True
+        # 같은 (학교, 날짜, 요청)을 다시 받으면 예전 본문은 아무도 안 가리킬 수 있음 -> 바로 지움
+        if previous is not None:
+            await self._release([previous["hash"]])
+
+    async def _release(self, digests: List[str]):
+        """인덱스 항목이 빠진 해시들의 참조 수를 줄이고, 0이 된 파일은 지움"""
+        unused = []
+        for digest in digests:
+            self._refs[digest] -= 1
+            if self._refs[digest] <= 0:
+                del self._refs[digest]
+                unused.append(digest)
+        if unused:
+            try:
+                await asyncio.to_thread(self._remove_objects, unused)
+            except OSError as e:
+                print(f"⚠️ [스냅샷] 파일 삭제 실패: {e}")
+
+    def lookup(self, source: str, request_key: str, target_date: Optional[date]) -> Optional[dict]:
+        return self._load().get(self.make_key(source, request_key, target_date))
+
+    def read(self, digest: str) -> Optional[bytes]:
+        try:
+            with gzip.open(self._object_path(digest), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def iter_entries(self, source: Optional[str] = None) -> Iterator[dict]:
+        """(벤치마크/디버깅용) 저장된 스냅샷 목록"""
+        for entry in self._load().values():
+            if source is None or entry["source"] == source:
+                yield entry
+
+    def _object_sizes(self) -> Dict[str, int]:
+        """objects/ 아래 실제 파일들 (해시 -> 압축된 크기)"""
+        sizes = {}
+        for dirpath, _, filenames in os.walk(os.path.join(self.root, "objects")):
+            for name in filenames:
+                if name.endswith(".gz"):
+                    sizes[name[:-3]] = os.path.getsize(os.path.join(dirpath, name))
+        return sizes
+
+    def _remove_objects(self, digests: List[str]):
+        for digest in digests:
+            # 지우기로 한 뒤에 같은 내용이 다시 저장됐으면 남겨둠
+            if digest in self._refs or digest in self._writing:
+                continue
+            try:
+                os.remove(self._object_path(digest))
+            except FileNotFoundError:
+                pass
+
+    def _prune(self, sizes: Dict[str, int]) -> List[str]:
+        """
+        전체 용량이 max_bytes 안에 들어오게 지울 파일 목록을 정함 (인덱스는 여기서 바로 고침, 이벤트 루프에서 부름).
+        1. 어느 항목도 안 가리키는 파일(고아)부터 -> 이것만으로 들어오면 살아있는 스냅샷은 안 건드림
+        2. 그래도 넘으면 오래된 항목부터 빼고, 그 항목만 쓰던 파일을 지움
+        """
+        index = self._load()
+        doomed = [digest for digest in sizes if digest not in self._refs and digest not in self._writing]
+        total = sum(sizes.values()) - sum(sizes[digest] for digest in doomed)
+        if doomed:
+            print(f"🧹 [스냅샷] 아무도 안 쓰는 파일 {len(doomed)}개 정리")
+        if total <= self.max_bytes:
+            return doomed
+
+        removed = 0
+        for key, entry in sorted(index.items(), key=lambda item: item[1]["fetched_at"]):
+            if total <= self.max_bytes:
+                break
+            del index[key]
+            digest = entry["hash"]
+            self._refs[digest] -= 1
+            # 같은 내용을 다른 항목이 아직 쓰고 있으면 파일은 남겨둠
+            if self._refs[digest] <= 0:
+                del self._refs[digest]
+                if digest in sizes:
+                    doomed.append(digest)
+                    total -= sizes[digest]
+            removed += 1
+
+        self._dirty = True
+        print(f"🧹 [스냅샷] 용량 제한으로 {removed}개 정리 (현재 {total / 1024 / 1024:.1f}MB)")
+        return doomed
+
+    def _write_index(self, index: Dict[str, dict]):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self._index_path()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp_path, self._index_path())
+
+    async def flush(self):
+        """
+        크롤링이 끝날 때 인덱스 저장 + 용량 정리.
+        파일 훑기/삭제/쓰기만 스레드에서 하고, 인덱스를 고치는 건 이벤트 루프에서
+        (record()가 같은 dict를 고치는 중에 스레드가 읽지 않게 저장할 내용은 복사본으로 넘김)
+        """
+        try:
+            self._load()
+            sizes = await asyncio.to_thread(self._object_sizes)
+            doomed = self._prune(sizes)
+            if doomed:
+                await asyncio.to_thread(self._remove_objects, doomed)
+            if not self._dirty:
+                return
+            self._dirty = False
+            await asyncio.to_thread(self._write_index, dict(self._index))
+        except OSError as e:
+            self._dirty = True
+            print(f"⚠️ [스냅샷] 인덱스 저장 실패: {e}")
+
+snapshot_store = SnapshotStore(settings.CRAWLER_SNAPSHOT_DIR, settings.CRAWLER_SNAPSHOT_MAX_BYTES)
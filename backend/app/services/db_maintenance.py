@@ -0,0 +1,171 @@
+import asyncio
+import os
+import time
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from app.core.config import settings
+from app.services.db_service import delete_old_menus
+from app.services.menu_archive import menu_archive
+
+AUTO_VACUUM_MODES = {0: "NONE", 1: "FULL", 2: "INCREMENTAL"}
+# incremental_vacuum 한 번에 반납하는 페이지 수 범위 (느려지면 줄이고 빠르면 늘림)
+MIN_VACUUM_PAGES = 32
+MAX_VACUUM_PAGES = 8192
+
+
+async def _pragma(engine: AsyncEngine, sql: str) -> list:
+    """
+    PRAGMA 하나를 트랜잭션 없이 실행하고 결과를 다 읽음.
+    incremental_vacuum은 결과를 끝까지 읽어야 페이지를 다 반납함 (한 줄 읽을 때마다 한 페이지).
+    매번 연결을 돌려줘서 크롤링 저장이 기다리고 있으면 그 사이에 끼어들 수 있음 (쓰기 연결은 1개)
+    """
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        result = await conn.exec_driver_sql(sql)
+        return result.all() if result.returns_rows else []
+
+
+async def db_file_stats(engine: AsyncEngine) -> dict:
+    """DB 파일 크기 / 페이지 수 / 빈 페이지(freelist) 수 / auto_vacuum 모드"""
+    page_size = (await _pragma(engine, "PRAGMA page_size"))[0][0]
+    page_count = (await _pragma(engine, "PRAGMA page_count"))[0][0]
+    freelist = (await _pragma(engine, "PRAGMA freelist_count"))[0][0]
+    auto_vacuum = (await _pragma(engine, "PRAGMA auto_vacuum"))[0][0]
+
+    path = engine.url.database
+    wal_path = f"{path}-wal"
+    return {
+        "file_bytes": os.path.getsize(path) if os.path.exists(path) else 0,
+        "wal_bytes": os.path.getsize(wal_path) if os.path.exists(wal_path) else 0,
+        "page_size": page_size,
+        "page_count": page_count,
+        "freelist_count": freelist,
+        "auto_vacuum": AUTO_VACUUM_MODES.get(auto_vacuum, str(auto_vacuum)),
+    }
+
+
+async def convert_auto_vacuum(engine: AsyncEngine) -> bool:
+    """
+    auto_vacuum 모드를 설정값(DB_AUTO_VACUUM)으로 바꿈 (이미 그 모드면 아무것도 안 함).
+    이미 테이블이 있는 DB는 VACUUM을 한 번 해야 바뀌는데, DB 전체를 다시 써서 그동안 쓰기가 전부 막힘.
+    그래서 매일 정리 작업에서는 안 하고 점검 시간에 vacuum_db.py로 한 번만 실행 (WAL이라 읽기는 안 막힘)
+    """
+    wanted = settings.DB_AUTO_VACUUM.upper()
+    stats = await db_file_stats(engine)
+    if stats["auto_vacuum"] == wanted:
+        return False
+
+    started = time.monotonic()
+    await _pragma(engine, f"PRAGMA auto_vacuum={wanted}")
+    await _pragma(engine, "VACUUM")
+    # VACUUM 결과가 WAL에 통째로 쌓여 있으니 DB 파일로 옮기고 WAL을 비움 (점검 시간이라 기다려도 됨)
+    await _pragma(engine, "PRAGMA wal_checkpoint(TRUNCATE)")
+    print(f"🔧 [DB 정리] auto_vacuum {stats['auto_vacuum']} -> {wanted} 전환 (VACUUM {time.monotonic() - started:.2f}초)")
+    return True
+
+
+async def incremental_vacuum(engine: AsyncEngine, deadline: float) -> int:
+    """
+    빈 페이지를 조금씩 파일 밖으로 반납 (파일 크기가 실제로 줄어듦).
+    한 번에 잠금을 잡는 시간이 DB_MAINT_CHUNK_SECONDS 근처가 되게 페이지 수를 조절하고, 시간이 다 되면 멈춤
+    """
+    pages = settings.DB_MAINT_VACUUM_PAGES
+    freed = 0
+    while time.monotonic() < deadline:
+        before = (await _pragma(engine, "PRAGMA freelist_count"))[0][0]
+        if before == 0:
+            break
+        started = time.monotonic()
+        await _pragma(engine, f"PRAGMA incremental_vacuum({pages})")
+        elapsed = time.monotonic() - started
+        freed += before - (await _pragma(engine, "PRAGMA freelist_count"))[0][0]
+
+        if elapsed > settings.DB_MAINT_CHUNK_SECONDS:
+            pages = max(MIN_VACUUM_PAGES, pages // 2)
+        elif elapsed < settings.DB_MAINT_CHUNK_SECONDS / 4:
+            pages = min(MAX_VACUUM_PAGES, pages * 2)
+        await asyncio.sleep(0) # 사이사이 크롤링 저장/API에 차례를 넘김
+    return freed
+
+
+async def refresh_statistics(engine: AsyncEngine) -> str:
+    """
+    쿼리 계획용 통계 갱신.
+    통계가 아예 없으면 ANALYZE, 있으면 PRAGMA optimize (바뀐 테이블만 다시 봄).
+    analysis_limit으로 인덱스마다 일부만 훑어서 테이블이 커져도 금방 끝남
+    """
+    await _pragma(engine, f"PRAGMA analysis_limit={settings.DB_ANALYSIS_LIMIT}")
+    has_stats = await _pragma(engine, "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+    if has_stats:
+        await _pragma(engine, "PRAGMA optimize")
+        return "PRAGMA optimize"
+    await _pragma(engine, "ANALYZE")
+    return "ANALYZE"
+
+
+def _mb(size: int) -> str:
+    return f"{size / 1024 / 1024:.1f}MB"
+
+
+def print_report(before: dict, after: dict, deleted: int, freed: int, elapsed: float):
+    archive = menu_archive.stats()
+    print(f"📊 [DB 정리 결과] {elapsed:.1f}초 / 메뉴 {deleted}개 보관 후 삭제 / 빈 페이지 {freed}개 반납")
+    print(
+        f"   DB 파일 {_mb(before['file_bytes'])} -> {_mb(after['file_bytes'])}  "
+        f"(WAL {_mb(after['wal_bytes'])}, 페이지 {after['page_count']}개 x {after['page_size']}B)"
+    )
+    print(
+        f"   빈 페이지 {before['freelist_count']} -> {after['freelist_count']}개  "
+        f"/ auto_vacuum {after['auto_vacuum']}  / 보관 파일 {archive['days']}일치 {_mb(archive['bytes'])}"
+    )
+
+
+async def run_maintenance(session: AsyncSession, days: int = 3, budget: Optional[float] = None) -> dict:
+    """
+    매일 도는 DB 정리 작업 (시간 예산 안에서만, 남은 건 다음 날).
+    1. 지난 메뉴 보관 후 조금씩 삭제 (delete_old_menus)
+    2. 빈 페이지를 조금씩 반납 (incremental_vacuum, auto_vacuum=INCREMENTAL인 DB만. 모드 전환은 vacuum_db.py로 따로)
+    3. 통계 갱신 (ANALYZE / PRAGMA optimize)
+    4. WAL 체크포인트 (PASSIVE: 읽는 중인 연결은 안 기다림)
+    모든 단계가 짧게 끊어서 쓰기 연결을 돌려주고, 읽기는 WAL이라 처음부터 안 막힘
+    """
+    budget = settings.DB_MAINT_BUDGET if budget is None else budget
+    started = time.monotonic()
+    deadline = started + budget
+    engine = session.bind
+
+    if engine.dialect.name != "sqlite":
+        # PostgreSQL은 autovacuum이 알아서 함
+        deleted = await delete_old_menus(session, days=days, deadline=deadline)
+        return {"deleted": deleted}
+
+    before = await db_file_stats(engine)
+    deleted = await delete_old_menus(session, days=days, deadline=deadline)
+    # 쓰기 연결이 1개라 세션이 트랜잭션을 열어둔 채면 아래 PRAGMA들이 연결을 못 받음
+    await session.commit()
+
+    freed = 0
+    stats_step = None
+    if before["auto_vacuum"] == "INCREMENTAL":
+        freed = await incremental_vacuum(engine, deadline)
+    elif before["auto_vacuum"] != settings.DB_AUTO_VACUUM.upper():
+        # 전환은 VACUUM(DB 전체 다시 쓰기)이라 시간 예산 안에 못 넣음 -> 알려만 줌
+        print(
+            f"⚠️ [DB 정리] auto_vacuum이 {before['auto_vacuum']}라서 빈 페이지를 반납 못 함. "
+            f"점검 시간에 'python vacuum_db.py'로 {settings.DB_AUTO_VACUUM.upper()} 전환 필요"
+        )
+    if time.monotonic() < deadline:
+        stats_step = await refresh_statistics(engine)
+    await _pragma(engine, "PRAGMA wal_checkpoint(PASSIVE)")
+
+    after = await db_file_stats(engine)
+    elapsed = time.monotonic() - started
+    print_report(before, after, deleted, freed, elapsed)
+    return {
+        "deleted": deleted,
+        "freed_pages": freed,
+        "statistics": stats_step,
+        "before": before,
+        "after": after,
+        "seconds": round(elapsed, 3),
+    }
@@ -1,87 +1,339 @@
-import re
-from datetime import datetime, timedelta  # [수정] 누락된 datetime 모듈 추가
+import asyncio
+import os
+import time
+from datetime import date, datetime, timedelta  # [수정] 누락된 datetime 모듈 추가
+from typing import Dict, Iterable, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import delete  # [수정] 누락된 delete 함수 추가
+from sqlalchemy import delete, distinct, func, or_  # [수정] 누락된 delete 함수 추가
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.core.config import settings
 from app.db import models
 from app.schemas.crawler import SchoolData
+from app.services.dimension_cache import dimension_cache
+from app.services.response_cache import daily_cache
+from app.services.normalizer import content_hash
+from app.services.menu_archive import menu_archive
+
+# IN (...) 목록 하나에 넣을 개수 (SQLite 변수 개수 제한 안쪽으로)
+UPSERT_CHUNK_SIZE = 500
+# 오래된 메뉴 삭제 조각의 최소 크기 (느려져도 이보다는 안 줄임)
+MIN_DELETE_CHUNK = 50
+
+
+def _insert(session: AsyncSession):
+    """DB 종류에 맞는 INSERT ... ON CONFLICT 문 (SQLite / PostgreSQL 둘 다 지원)"""
+    if session.bind.dialect.name == "postgresql":
+        return postgresql_insert
+    return sqlite_insert
+
+
+async def _dish_ids(session: AsyncSession, names: List[str]) -> Dict[str, int]:
+    """요리 이름 -> id (사전에 없는 이름은 추가)"""
+    dish_ids = {}
+    insert = _insert(session)
+    for i in range(0, len(names), UPSERT_CHUNK_SIZE):
+        chunk = names[i:i + UPSERT_CHUNK_SIZE]
+        result = await session.execute(select(models.Dish.name, models.Dish.id).where(models.Dish.name.in_(chunk)))
+        dish_ids.update(result.all())
+
+        missing = [name for name in chunk if name not in dish_ids]
+        if missing:
+            # 다른 곳에서 먼저 넣었으면 그대로 두고 id만 다시 읽음
+            stmt = insert(models.Dish).on_conflict_do_nothing(index_elements=["name"])
+            await session.execute(stmt, [{"name": name} for name in missing])
+            result = await session.execute(select(models.Dish.name, models.Dish.id).where(models.Dish.name.in_(missing)))
+            dish_ids.update(result.all())
+    return dish_ids
+
+
+async def _link_dishes(session: AsyncSession, menus: List[Tuple[int, str]]):
+    """
+    메뉴(id, menu_text)의 항목들을 요리 사전에 연결.
+    같은 요리는 학교/식당/날짜가 달라도 id 하나라서 번역/이미지/통계를 요리마다 한 번만 하면 됨.
+    """
+    if not menus:
+        return
+    items = {menu_id: [name for name in menu_text.split("\n") if name] for menu_id, menu_text in menus}
+    dish_ids = await _dish_ids(session, list(dict.fromkeys(name for names in items.values() for name in names)))
+
+    # 내용이 바뀐 메뉴는 예전 연결을 지우고 새로 (새 메뉴는 지울 게 없음)
+    menu_ids = list(items)
+    for i in range(0, len(menu_ids), UPSERT_CHUNK_SIZE):
+        await session.execute(delete(models.MenuDish).where(models.MenuDish.menu_id.in_(menu_ids[i:i + UPSERT_CHUNK_SIZE])))
+
+    links = [
+        {"menu_id": menu_id, "position": position, "dish_id": dish_ids[name]}
+        for menu_id, names in items.items() for position, name in enumerate(names)
+    ]
+    # 행이 많아서 executemany로 (SQLAlchemy가 알아서 여러 행씩 묶어 보냄)
+    await session.execute(_insert(session)(models.MenuDish), links)
+
+
+async def refresh_day_summaries(session: AsyncSession, school_id: int, dates: Iterable[date]):
+    """
+    그 학교의 그 날짜들만 캘린더 요약(menu_day_summaries)을 menus에서 다시 계산.
+    메뉴를 바꾼 것과 같은 트랜잭션에서 부름 (커밋은 부르는 쪽에서 -> 요약과 메뉴가 어긋날 틈이 없음)
+    - 메뉴가 하나도 없게 된 날짜는 요약도 지움
+    - 숫자가 실제로 바뀐 날짜만 덮어쓰고 version +1 (그대로면 안 건드림)
+    """
+    dates = sorted(set(dates))
+    insert = _insert(session)
+    summary = models.MenuDaySummary
+    for i in range(0, len(dates), UPSERT_CHUNK_SIZE):
+        chunk = dates[i:i + UPSERT_CHUNK_SIZE]
+        # 학교 -> 식당(school_id 인덱스) -> 메뉴((식당, 날짜) 유니크 인덱스)로 바로 찾아감
+        result = await session.execute(
+            select(
+                models.Menu.date,
+                func.count(models.Menu.id),
+                func.count(distinct(models.Menu.cafeteria_id)),
+                func.count(models.Menu.image_url_3d),
+            )
+            .join(models.Cafeteria, models.Cafeteria.id == models.Menu.cafeteria_id)
+            .where(models.Cafeteria.school_id == school_id, models.Menu.date.in_(chunk))
+            .group_by(models.Menu.date)
+        )
+        rows = [
+            {"school_id": school_id, "date": day, "menu_count": menus, "cafeteria_count": cafeterias, "image_count": images}
+            for day, menus, cafeterias, images in result.all()
+        ]
+
+        empty = set(chunk) - {row["date"] for row in rows}
+        if empty:
+            await session.execute(delete(summary).where(summary.school_id == school_id, summary.date.in_(empty)))
+        if rows:
+            stmt = insert(summary)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["school_id", "date"],
+                set_={
+                    "menu_count": stmt.excluded.menu_count,
+                    "cafeteria_count": stmt.excluded.cafeteria_count,
+                    "image_count": stmt.excluded.image_count,
+                    "version": summary.version + 1,
+                    "updated_at": func.now(),
+                },
+                where=or_(
+                    summary.menu_count != stmt.excluded.menu_count,
+                    summary.cafeteria_count != stmt.excluded.cafeteria_count,
+                    summary.image_count != stmt.excluded.image_count,
+                ),
+            )
+            await session.execute(stmt, rows)
+
 
 async def save_school_data(session: AsyncSession, data: SchoolData):
-    # 1. 학교가 이미 있는지 확인
-    result = await session.execute(select(models.School).where(models.School.name == data.school_name))
-    school = result.scalars().first()
-
-    # 없으면 새로 생성
-    if not school:
-        school = models.School(name=data.school_name, region=data.school_region)
-        session.add(school)
+    """
+    정리(normalizer.normalize_school_data)까지 끝난 데이터를 저장.
+    메뉴 항목은 이미 정해진 모양이라 여기서는 줄바꿈으로 합치기만 함.
+
+    예전에는 메뉴 한 줄마다 SELECT + INSERT/UPDATE를 날렸는데(N+1),
+    이제 학교/식당은 메모리 캐시(dimension_cache)에서 찾고 메뉴는 여러 행씩 묶은 INSERT 몇 번이면 끝남.
+    (식당, 날짜, 식사) 유니크 인덱스에 걸리면 INSERT 대신 덮어씀.
+
+    내용 해시(content_hash)가 같은 메뉴는 건너뛰고, 바뀐 메뉴는 이미지를 비워서 다시 만들게 함.
+    새로 쓴 메뉴는 항목별로 요리 사전(dishes / menu_dishes)에도 연결함.
+    반환값: {"inserted": 새로 생긴 메뉴 수, "updated": 내용이 바뀐 메뉴 수, "unchanged": 그대로인 메뉴 수}
+    """
+    # 1. 학교: 캐시에서 찾고, 없으면 새로 생성 (캐시에 없으면 DB를 다시 읽어보고 판단함)
+    school = await dimension_cache.get_school(session, data.school_name, reload_on_miss=True)
+    new_school = None
+    if school:
+        school_id, caf_ids = school.id, dict(school.cafeterias)
+    else:
+        new_school = models.School(name=data.school_name, region=data.school_region)
+        session.add(new_school)
         await session.flush() # ID를 발급받기 위해 임시 저장
+        school_id, caf_ids = new_school.id, {}
 
-    # 2. 식당 처리
-    for caf_data in data.cafeterias:
+    # 2. 식당: 캐시에 없는 식당만 DB에서 한 번 더 확인하고(다른 프로세스가 넣었을 수도 있으니), 그래도 없으면 한꺼번에 추가
+    new_cafeterias = []
+    missing_names = [name for name in dict.fromkeys(caf_data.name for caf_data in data.cafeterias) if name not in caf_ids]
+    if missing_names:
         result = await session.execute(
             select(models.Cafeteria)
-            .where(models.Cafeteria.school_id == school.id)
-            .where(models.Cafeteria.name == caf_data.name)
+            .where(models.Cafeteria.school_id == school_id)
+            .where(models.Cafeteria.name.in_(missing_names))
         )
-        cafeteria = result.scalars().first()
-
-        if not cafeteria:
-            cafeteria = models.Cafeteria(school_id=school.id, name=caf_data.name)
-            session.add(cafeteria)
+        new_cafeterias = list(result.scalars().all())
+        found = {caf.name for caf in new_cafeterias}
+        created = [models.Cafeteria(school_id=school_id, name=name) for name in missing_names if name not in found]
+        if created:
+            session.add_all(created)
             await session.flush()
+        new_cafeterias += created
+        caf_ids.update({caf.name: caf.id for caf in new_cafeterias})
 
-        # 3. 메뉴 저장 (덮어쓰기 로직)
+    # 3. 메뉴: (식당, 날짜, 식사)마다 한 줄. 같은 키가 또 나오면 뒤에 것으로 (한 문장 안에서 같은 행을 두 번 못 건드림)
+    rows = {}
+    for caf_data in data.cafeterias:
+        cafeteria_id = caf_ids[caf_data.name]
         for menu_data in caf_data.menus:
-            
-            # [전처리] 
-            # 1. 알레르기 정보 제거
-            cleaned_items = [re.sub(r'\([0-9.,]+\)', '', item).strip() for item in menu_data.menu_items]
-            
-            # 2. 리스트를 줄바꿈 문자로 합치기
-            final_menu_text = "\n".join(cleaned_items)
-
-            # 해당 날짜, 해당 식사(점심/저녁)에 이미 메뉴가 있는지 확인
-            result = await session.execute(
-                select(models.Menu)
-                .where(models.Menu.cafeteria_id == cafeteria.id)
-                .where(models.Menu.date == menu_data.date)
-                .where(models.Menu.meal_type == menu_data.meal_type)
-            )
-            existing_menu = result.scalars().first()
-
-            if existing_menu:
-                existing_menu.menu_text = final_menu_text # 업데이트
-            else:
-                new_menu = models.Menu(
-                    cafeteria_id=cafeteria.id,
-                    date=menu_data.date,
-                    meal_type=menu_data.meal_type,
-                    menu_text=final_menu_text # 신규 생성
-                )
-                session.add(new_menu)
+            # 리스트를 줄바꿈 문자로 합치기 (항목 안에는 줄바꿈이 없음 -> AI 쪽에서 그대로 split 가능)
+            menu_text = "\n".join(menu_data.menu_items)
+            rows[(cafeteria_id, menu_data.date, menu_data.meal_type)] = {
+                "cafeteria_id": cafeteria_id,
+                "date": menu_data.date,
+                "meal_type": menu_data.meal_type,
+                "menu_text": menu_text,
+                "content_hash": content_hash(menu_text),
+            }
+
+    # 4. 지금 DB에 있는 해시와 비교해서 새로 생긴 것 / 바뀐 것만 씀 (그대로인 건 아예 안 건드림)
+    changes = {"inserted": 0, "updated": 0, "unchanged": 0}
+    existing = {}
+    if rows:
+        dates = [key[1] for key in rows]
+        result = await session.execute(
+            select(models.Menu.cafeteria_id, models.Menu.date, models.Menu.meal_type, models.Menu.content_hash)
+            .where(models.Menu.cafeteria_id.in_({key[0] for key in rows}))
+            .where(models.Menu.date.between(min(dates), max(dates)))
+        )
+        existing = {(caf_id, day, meal): hash_ for caf_id, day, meal, hash_ in result.all()}
+
+    values = []
+    for key, row in rows.items():
+        if key not in existing:
+            changes["inserted"] += 1
+        elif existing[key] != row["content_hash"]:
+            changes["updated"] += 1
+        else:
+            changes["unchanged"] += 1
+            continue
+        values.append(row)
+
+    insert = _insert(session)
+    written = []  # (메뉴 id, menu_text) - 요리 연결용
+    if values:
+        stmt = insert(models.Menu)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["cafeteria_id", "date", "meal_type"],
+            # 내용이 바뀌었으면 예전 메뉴로 만든 이미지는 버림 -> AIService가 다시 생성 (image_url_3d IS NULL)
+            set_={
+                "menu_text": stmt.excluded.menu_text,
+                "content_hash": stmt.excluded.content_hash,
+                "image_url_2d": None,
+                "image_url_3d": None,
+            },
+            # 위에서 비교한 뒤에 다른 곳에서 같은 내용으로 저장했으면 그냥 둠
+            where=models.Menu.content_hash.is_distinct_from(stmt.excluded.content_hash),
+        ).returning(models.Menu.id, models.Menu.menu_text)
+        # executemany: SQLAlchemy가 여러 행씩 묶은 INSERT로 보내고 RETURNING 결과도 모아줌
+        written = (await session.execute(stmt, values)).all()
+
+    # 5. 요리 사전: 새로 쓰인 메뉴만 항목별로 dishes/menu_dishes에 연결
+    await _link_dishes(session, written)
+
+    # 6. 캘린더 요약: 새로 생기거나 바뀐 메뉴가 있는 날짜만 다시 계산
+    if values:
+        await refresh_day_summaries(session, school_id, {row["date"] for row in values})
     
     # 최종 저장
     await session.commit()
-    print(f"✅ {data.school_name} 데이터 저장 완료!")
 
-async def delete_old_menus(db: AsyncSession, days: int = 3):
+    # 커밋이 끝난 뒤에만 캐시에 반영 (롤백되면 없는 id가 캐시에 남으니까)
+    if new_school:
+        dimension_cache.add_school(new_school.id, new_school.name, new_school.region)
+    if new_cafeterias:
+        dimension_cache.add_cafeterias(data.school_name, new_cafeterias)
+    # 새로 생기거나 바뀐 메뉴가 있는 날짜의 /daily 응답만 다시 만들게
+    if values:
+        daily_cache.invalidate(data.school_name, {row["date"] for row in values})
+    print(
+        f"✅ {data.school_name} 데이터 저장 완료! "
+        f"(신규 {changes['inserted']} / 변경 {changes['updated']} / 그대로 {changes['unchanged']})"
+    )
+    return changes
+
+async def delete_old_menus(db: AsyncSession, days: int = 3, deadline: Optional[float] = None):
     """
-    기준 일수(days)보다 오래된 메뉴 데이터를 삭제합니다.
+    기준 일수(days)보다 오래된 메뉴 데이터를 보관 파일(menu_archive)로 옮기고 DB에서 삭제합니다.
     기본값: 3일
+
+    날짜 하나씩: 보관 파일 쓰기가 성공한 날짜만 지우고, 지울 때도 조금씩 나눠서 커밋함
+    (큰 DELETE 한 방으로 쓰기 잠금을 오래 잡고 있으면 그동안 크롤링 저장/문의 저장이 다 기다려야 하니까)
+    - 한 조각이 DB_MAINT_CHUNK_SECONDS보다 오래 걸리면 조각을 반으로, 한참 빠르면 두 배로 (최대 MENU_DELETE_CHUNK)
+    - deadline(time.monotonic 기준)이 지나면 멈춤. 남은 건 다음 청소 때 (보관 파일은 합쳐 쓰니까 다시 해도 안전)
     """
     # 1. 기준 날짜 계산 (오늘 - 3일)
     cutoff_date = (datetime.now() - timedelta(days=days)).date()
     
-    print(f"🧹 [청소] {cutoff_date} 이전의 오래된 메뉴를 삭제합니다...")
+    print(f"🧹 [청소] {cutoff_date} 이전의 오래된 메뉴를 보관 후 삭제합니다...")
 
-    # 2. 삭제 쿼리 실행
-    # [수정] models.Menu로 명시적 접근
-    result = await db.execute(delete(models.Menu).where(models.Menu.date < cutoff_date))
-    
-    # 3. 변경사항 저장
-    await db.commit()
+    result = await db.execute(
+        select(models.Menu.date).where(models.Menu.date < cutoff_date).distinct().order_by(models.Menu.date)
+    )
+    expired_dates = result.scalars().all()
+
+    deleted_count = 0
+    chunk_size = settings.MENU_DELETE_CHUNK
+    for day in expired_dates:
+        if deadline is not None and time.monotonic() > deadline:
+            print(f"⏳ [청소] 시간 초과 -> {day}부터는 다음 청소 때")
+            break
+        # 2. 그날 메뉴를 학교/식당 이름과 같이 읽어서 보관 파일로 (식당이 없어진 메뉴도 빠짐없이 지워지게 outer join)
+        result = await db.execute(
+            select(
+                models.Menu.id, models.School.name, models.Cafeteria.name, models.Menu.meal_type,
+                models.Menu.menu_text, models.Menu.image_url_3d, models.Menu.content_hash, models.Cafeteria.school_id,
+            )
+            .outerjoin(models.Cafeteria, models.Cafeteria.id == models.Menu.cafeteria_id)
+            .outerjoin(models.School, models.School.id == models.Cafeteria.school_id)
+            .where(models.Menu.date == day)
+        )
+        rows = result.all()
+        await db.commit() # 파일 쓰는 동안 쓰기 연결을 잡고 있지 않게
+
+        records = [
+            {
+                "school": school_name,
+                "cafeteria": caf_name,
+                "meal_type": meal_type,
+                "menu_text": menu_text,
+                "image_url_3d": image_url_3d,
+                "content_hash": hash_,
+            }
+            for _, school_name, caf_name, meal_type, menu_text, image_url_3d, hash_, _ in rows
+        ]
+        try:
+            path = await asyncio.to_thread(menu_archive.write_day, day, records)
+        except OSError as e:
+            # 보관을 못 했으면 지우지 않음 (다음 청소 때 다시 시도)
+            print(f"⚠️ [청소] {day} 보관 실패 -> 삭제 안 함: {e}")
+            continue
+
+        # 3. 조금씩 나눠서 삭제 (요리 연결 먼저, 요리 사전 자체는 남겨둠 -> 번역 캐시 유지)
+        # [수정] models.Menu로 명시적 접근
+        menu_ids = [row[0] for row in rows]
+        day_deleted = 0
+        while menu_ids:
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            chunk, menu_ids = menu_ids[:chunk_size], menu_ids[chunk_size:]
+            started = time.monotonic()
+            await db.execute(delete(models.MenuDish).where(models.MenuDish.menu_id.in_(chunk)))
+            result = await db.execute(delete(models.Menu).where(models.Menu.id.in_(chunk)))
+            # 변경사항 저장 (청크마다 커밋해서 잠금을 바로 풂)
+            await db.commit()
+            day_deleted += result.rowcount
+
+            # 다음 조각 크기 조절 (잠금을 잡는 시간이 목표 근처가 되게)
+            elapsed = time.monotonic() - started
+            if elapsed > settings.DB_MAINT_CHUNK_SECONDS:
+                chunk_size = max(MIN_DELETE_CHUNK, chunk_size // 2)
+            elif elapsed < settings.DB_MAINT_CHUNK_SECONDS / 4:
+                chunk_size = min(settings.MENU_DELETE_CHUNK, chunk_size * 2)
+            await asyncio.sleep(0) # 사이사이 다른 작업(API 등)에 차례를 넘김
+
+        deleted_count += day_deleted
+        # 캘린더 요약도 그날 것만 다시 계산 (다 지웠으면 요약도 지워짐)
+        for school_id in {row[7] for row in rows if row[7] is not None}:
+            await refresh_day_summaries(db, school_id, [day])
+        await db.commit()
+        for school_name in {row[1] for row in rows if row[1]}:
+            daily_cache.invalidate(school_name, [day])
+        print(f"   📦 {day}: {len(rows)}개 보관 ({os.path.relpath(path, menu_archive.root)}) 후 {day_deleted}개 삭제")
     
-    deleted_count = result.rowcount
-    print(f"✨ [청소 완료] 총 {deleted_count}개의 유통기한 지난 메뉴가 삭제되었습니다.")
-    return deleted_count
\ No newline at end of file
+    print(f"✨ [청소 완료] 총 {deleted_count}개의 유통기한 지난 메뉴가 보관 후 삭제되었습니다.")
+    return deleted_count
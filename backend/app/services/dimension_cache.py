@@ -0,0 +1,115 @@
+import time
+from typing import Dict, Iterable, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db import models
+
+
+class SchoolEntry:
+    """학교 한 곳 + 그 학교 식당들 (이름 -> id)"""
+
+    __slots__ = ("id", "name", "region", "cafeterias")
+
+    def __init__(self, id: int, name: str, region: Optional[str]):
+        self.id = id
+        self.name = name
+        self.region = region
+        self.cafeterias: Dict[str, int] = {}  # 식당 이름 -> id (id 순서 = 등록 순서)
+
+
+class DimensionCache:
+    """
+    학교/식당 이름 -> id 메모리 캐시.
+    학교/식당은 거의 안 바뀌는데 /daily와 저장할 때마다 이름으로 다시 찾고 있어서,
+    서버 시작할 때 한 번 읽어두고 새로 추가될 때만 갱신함.
+    - 이 프로세스에서 추가한 건 커밋 후 add_*로 바로 반영
+    - 다른 프로세스(스크립트)가 추가한 건 TTL이 지나면 다시 읽어서 반영
+    - 없는 학교를 찾으면 한 번 다시 읽어봄 (너무 자주는 안 하게 간격 제한)
+    """
+
+    def __init__(self, ttl: float, miss_reload_interval: float = 30.0):
+        self.ttl = ttl
+        self.miss_reload_interval = miss_reload_interval
+        self._schools: Optional[Dict[str, SchoolEntry]] = None
+        self._loaded_at = 0.0
+        self._last_miss_reload = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._schools is not None
+
+    async def load(self, session: AsyncSession):
+        """학교 전체 + 식당 전체를 쿼리 2번으로 읽어서 통째로 교체"""
+        school_rows = await session.execute(
+            select(models.School.id, models.School.name, models.School.region).order_by(models.School.id)
+        )
+        schools = {name: SchoolEntry(id, name, region) for id, name, region in school_rows.all()}
+        by_id = {entry.id: entry for entry in schools.values()}
+
+        caf_rows = await session.execute(
+            select(models.Cafeteria.school_id, models.Cafeteria.name, models.Cafeteria.id).order_by(models.Cafeteria.id)
+        )
+        for school_id, name, caf_id in caf_rows.all():
+            if school_id in by_id:
+                by_id[school_id].cafeterias.setdefault(name, caf_id)
+
+        self._schools = schools
+        self._loaded_at = time.monotonic()
+        self.reloads += 1
+
+    def invalidate(self):
+        """다음 조회 때 DB에서 다시 읽게 함"""
+        self._schools = None
+
+    async def _ensure_fresh(self, session: AsyncSession):
+        if self._schools is None or time.monotonic() - self._loaded_at > self.ttl:
+            await self.load(session)
+
+    async def get_school(self, session: AsyncSession, name: str, reload_on_miss: bool = False) -> Optional[SchoolEntry]:
+        """
+        이름으로 학교 찾기 (없으면 None).
+        reload_on_miss=True면 간격 제한 없이 다시 읽어봄 (저장 쪽: 있는 학교를 또 만들면 안 되니까)
+        """
+        await self._ensure_fresh(session)
+        entry = self._schools.get(name)
+        if entry is None and (reload_on_miss or time.monotonic() - self._last_miss_reload > self.miss_reload_interval):
+            # 다른 프로세스가 방금 추가했을 수도 있으니 한 번 다시 읽어봄
+            self._last_miss_reload = time.monotonic()
+            await self.load(session)
+            entry = self._schools.get(name)
+
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def get(self, name: str) -> Optional[SchoolEntry]:
+        """DB를 안 보고 지금 캐시에 있는 것만 (load 직후에 씀)"""
+        return (self._schools or {}).get(name)
+
+    def add_school(self, id: int, name: str, region: Optional[str]):
+        """커밋된 학교를 반영 (롤백될 수 있는 id는 넣으면 안 됨). 아직 안 읽었으면 다음 조회 때 같이 읽힘"""
+        if self._schools is not None and name not in self._schools:
+            self._schools[name] = SchoolEntry(id, name, region)
+
+    def add_cafeterias(self, school_name: str, cafeterias: Iterable[models.Cafeteria]):
+        """커밋된 식당들을 반영"""
+        entry = self._schools.get(school_name) if self._schools is not None else None
+        if entry is None:
+            # 학교가 캐시에 없으면 부분만 넣지 말고 다음에 통째로 다시 읽음
+            self.invalidate()
+            return
+        for caf in cafeterias:
+            entry.cafeterias.setdefault(caf.name, caf.id)
+
+    def print_stats(self):
+        count = len(self._schools or {})
+        print(f"📇 [학교/식당 캐시] 학교 {count}곳 / 적중 {self.hits} / 없음 {self.misses} / 다시 읽음 {self.reloads}번")
+
+
+dimension_cache = DimensionCache(ttl=settings.DIMENSION_CACHE_TTL)
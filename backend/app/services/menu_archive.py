@@ -0,0 +1,80 @@
+import gzip
+import json
+import os
+import time
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional
+from app.core.config import settings
+
+
+class MenuArchive:
+    """
+    지난 메뉴를 날짜별 압축 파일로 보관하는 저장소 (/data 볼륨, DB 밖).
+
+    - 2026/03/2026-03-02.jsonl.gz : 그날 메뉴 전체 (한 줄 = 메뉴 하나, JSON)
+    청소 작업이 DB에서 지우기 전에 여기로 옮겨둬서 DB는 며칠치만 남고 기록은 몇 년이고 싸게 남음.
+    같은 날짜를 다시 보관하면 (학교, 식당, 식사) 기준으로 합쳐서 다시 씀 (중간에 끊겨서 재시도해도 중복 없음).
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _day_path(self, day: date) -> str:
+        return os.path.join(self.root, f"{day.year:04d}", f"{day.month:02d}", f"{day.isoformat()}.jsonl.gz")
+
+    @staticmethod
+    def _record_key(record: dict) -> tuple:
+        return (record.get("school"), record.get("cafeteria"), record.get("meal_type"))
+
+    def _read_day(self, day: date) -> Iterator[dict]:
+        path = self._day_path(day)
+        if not os.path.exists(path):
+            return
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def write_day(self, day: date, records: List[dict]) -> str:
+        """
+        그날 메뉴를 보관 파일에 합쳐서 씀 (임시 파일에 쓴 다음 교체 -> 중간에 죽어도 예전 파일은 멀쩡함).
+        파일 입출력이라 호출하는 쪽에서 스레드로 넘겨서 부름.
+        """
+        merged: Dict[tuple, dict] = {self._record_key(record): record for record in self._read_day(day)}
+        archived_at = int(time.time())
+        for record in records:
+            merged[self._record_key(record)] = {**record, "date": day.isoformat(), "archived_at": archived_at}
+
+        path = self._day_path(day)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=9) as f:
+            for key in sorted(merged, key=lambda k: tuple(part or "" for part in k)):
+                f.write(json.dumps(merged[key], ensure_ascii=False) + "\n")
+        os.replace(tmp_path, path)
+        return path
+
+    def iter_lines(self, start: date, end: date, school: Optional[str] = None) -> Iterator[bytes]:
+        """
+        start ~ end 기간의 보관 메뉴를 한 줄(JSON)씩 (날짜 순서).
+        파일을 하루치씩 열어서 흘려보내기만 해서 기간이 길어도 메모리를 거의 안 씀.
+        """
+        day = start
+        while day <= end:
+            for record in self._read_day(day):
+                if school is None or record.get("school") == school:
+                    yield (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+            day += timedelta(days=1)
+
+    def stats(self) -> dict:
+        files = 0
+        size = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith(".jsonl.gz"):
+                    files += 1
+                    size += os.path.getsize(os.path.join(dirpath, filename))
+        return {"days": files, "bytes": size}
+
+
+menu_archive = MenuArchive(settings.MENU_ARCHIVE_DIR)
@@ -0,0 +1,95 @@
+import hashlib
+import re
+from datetime import date
+from typing import Dict, List
+from app.schemas.crawler import CafeteriaData, MenuData, SchoolData
+from app.services.crawler.rules import KeywordMatcher
+
+# 전각 문자(！～ 범위, 전각 공백)를 보통 문자로: "（５００원）" -> "(500원)"
+FULLWIDTH_TABLE = {code: code - 0xFEE0 for code in range(0xFF01, 0xFF5F)}
+FULLWIDTH_TABLE[0x3000] = ord(" ")
+
+# 메뉴 이름에 붙어 나오는 잡음: 알레르기 번호 "(1.2.5)", 괄호 속 가격 "[5,000원]" "(4,500원)"
+NOISE = re.compile(r"\(\s*[0-9.,\s]+\)|[\[(]\s*[0-9.,]+\s*원\s*[\])]")
+WHITESPACE = re.compile(r"\s+")
+PRICE_ONLY = re.compile(r"^[0-9.,]+\s*원?$")
+HAS_TEXT = re.compile(r"[가-힣A-Za-z\u4e00-\u9fff]")
+
+# 메뉴가 아니라 안내문인 줄
+NOTICE_KEYWORDS = KeywordMatcher(["※", "운영시간", "원산지", "등록된 식단이 없습니다"])
+
+
+def normalize_item(text: str) -> str:
+    """
+    메뉴 항목 하나를 정해진 모양으로 정리. 메뉴가 아니면 "" 반환.
+    (전각 -> 반각, 알레르기 번호/괄호 가격 제거, 공백 한 칸으로, 안내문/가격만 있는 줄 제거)
+    """
+    text = NOISE.sub("", text.translate(FULLWIDTH_TABLE))
+    text = WHITESPACE.sub(" ", text).strip().strip('"').strip()
+    if not text or PRICE_ONLY.match(text) or not HAS_TEXT.search(text):
+        return ""
+    if NOTICE_KEYWORDS.search(text):
+        return ""
+    return text
+
+
+def normalize_items(items: List[str]) -> List[str]:
+    """순서는 유지하고 빈 항목/중복 항목은 뺌"""
+    seen = set()
+    result = []
+    for item in items:
+        item = normalize_item(item)
+        if item and item not in seen:
+            seen.add(item)
+            result.append(item)
+    return result
+
+
+def normalize_school_data(data: SchoolData) -> SchoolData:
+    """
+    파싱과 DB 저장 사이의 정리 단계. 학교 하나(식당 여러 개 x 메뉴 여러 개)를 한 번에 처리함.
+    - 같은 식당의 같은 (날짜, 식사) 메뉴가 여러 번 나오면 하나로 합침
+    - 항목이 다 빠진 메뉴, 메뉴가 없는 식당은 뺌
+    결과가 항상 같은 모양이라 저장/비교/해시를 이 결과 기준으로 하면 됨.
+    """
+    cafeterias: Dict[str, Dict[tuple, MenuData]] = {}
+
+    for caf in data.cafeterias:
+        name = WHITESPACE.sub(" ", caf.name.translate(FULLWIDTH_TABLE)).strip()
+        menus = cafeterias.setdefault(name, {})
+
+        for menu in caf.menus:
+            key = (menu.date, menu.meal_type)
+            items = normalize_items(menu.menu_items)
+            if key in menus:
+                items = normalize_items(menus[key].menu_items + items)
+            if items:
+                menus[key] = MenuData(meal_type=menu.meal_type, menu_items=items, date=menu.date)
+
+    return SchoolData(
+        school_name=data.school_name,
+        school_region=data.school_region,
+        cafeterias=[
+            CafeteriaData(name=name, menus=list(menus.values()))
+            for name, menus in cafeterias.items() if menus
+        ],
+    )
+
+
+def normalize_results(results: Dict[date, SchoolData]) -> Dict[date, SchoolData]:
+    """parse_range_pages 결과(날짜 -> SchoolData) 전체를 정리. 정리 후 비어버린 날짜는 뺌"""
+    normalized = {}
+    for target_date, school_data in results.items():
+        school_data = normalize_school_data(school_data)
+        if school_data.cafeterias:
+            normalized[target_date] = school_data
+    return normalized
+
+
+def content_hash(menu_text: str) -> str:
+    """
+    저장되는 메뉴 내용(menu_text)의 해시. 정리된 결과라 모양이 항상 같아서
+    해시가 같으면 '내용이 안 바뀜'으로 보고 DB 쓰기/이미지 재생성을 건너뜀.
+    (마이그레이션 a4c9e27b8f15 backfill은 예전 menu_text를 이 파일 규칙으로 다시 정리해서 같은 값을 만듦)
+    """
+    return hashlib.sha256(menu_text.encode("utf-8")).hexdigest()
@@ -0,0 +1,141 @@
+import gzip
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, Iterable, Optional, Set, Tuple
+from app.core.config import settings
+
+# brotli는 설치돼 있을 때만 씀 (없으면 gzip만)
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+CacheKey = Tuple[str, str, date, date]  # (종류, 학교 이름, 시작 날짜, 끝 날짜)
+# 이보다 작은 응답은 압축해봐야 헤더 값도 안 나옴
+COMPRESS_MIN_BYTES = 512
+
+
+class CachedBody:
+    """
+    응답 하나 = JSON 바이트 + ETag(내용 해시) + 미리 압축해둔 것들.
+    만들 때 한 번만 압축하고 캐시 적중 때는 고르기만 함 (같은 응답을 수천 번 내보내도 압축은 1번)
+    """
+
+    __slots__ = ("body", "etag", "encoded", "size")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self.encoded: Dict[str, bytes] = {}
+        if len(body) >= COMPRESS_MIN_BYTES:
+            if brotli is not None:
+                self.encoded["br"] = brotli.compress(body, quality=settings.DAILY_BROTLI_QUALITY)
+            self.encoded["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+        self.size = len(body) + sum(len(value) for value in self.encoded.values())
+
+
+class ResponseCache:
+    """
+    메뉴 응답(CachedBody) 메모리 캐시. 키 = (종류, 학교 이름, 시작 날짜, 끝 날짜)
+    종류는 엔드포인트 이름 ("daily", "range", "calendar") - 같은 기간이라도 응답 모양이 다르니까 따로 둠.
+    /daily는 하루짜리(시작 = 끝), /range는 기간 하나가 키 하나.
+    메뉴는 하루에 몇 번밖에 안 바뀌는데 위젯들이 같은 (학교, 날짜)를 계속 물어봐서,
+    한 번 만든 응답을 그대로 돌려주고 DB/Pydantic은 안 거침.
+    - 용량(max_bytes, 압축본 포함)을 넘으면 제일 오래 안 쓴 것부터 버림 (LRU)
+    - 저장/이미지 생성/청소가 커밋한 뒤에 바뀐 (학교, 날짜)가 들어간 것만 지움
+    - 다른 프로세스(스크립트)가 바꾼 건 여기서 모르니까 TTL이 지나면 다시 만듦
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[CacheKey, Tuple[CachedBody, float]]" = OrderedDict()
+        self._by_school: Dict[str, Set[CacheKey]] = {}  # 지울 때 그 학교 것만 훑으려고
+        self._bytes = 0
+        # 지울 때마다 1씩 올림. 응답을 만드는 도중에 지워졌으면 그 응답은 넣지 않음 (예전 내용이 남지 않게)
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, kind: str, school_name: str, start: date, end: date) -> Optional[CachedBody]:
+        key = (kind, school_name, start, end)
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() > entry[1]:
+            if entry is not None:
+                self._pop(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, kind: str, school_name: str, start: date, end: date, entry: CachedBody, generation: int):
+        """generation = 응답을 만들기 전에 읽어둔 값 (그 사이에 지워진 게 있으면 안 넣음)"""
+        if not self.enabled or generation != self._generation or entry.size > self.max_bytes:
+            return
+        key = (kind, school_name, start, end)
+        self._pop(key)
+        self._entries[key] = (entry, time.monotonic() + self.ttl)
+        self._by_school.setdefault(school_name, set()).add(key)
+        self._bytes += entry.size
+        while self._bytes > self.max_bytes:
+            self._pop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _pop(self, key: CacheKey):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[0].size
+            keys = self._by_school.get(key[1])
+            keys.discard(key)
+            if not keys:
+                del self._by_school[key[1]]
+
+    def invalidate(self, school_name: str, days: Iterable[date]):
+        """그 학교에서 그 날짜들이 들어간 응답만 지움 (커밋이 끝난 뒤에 불러야 함)"""
+        self._generation += 1
+        days = set(days)
+        if not days:
+            return
+        first, last = min(days), max(days)
+        for key in list(self._by_school.get(school_name, ())):
+            _, _, start, end = key
+            if start <= last and first <= end and any(start <= day <= end for day in days):
+                self._pop(key)
+
+    def clear(self):
+        self._generation += 1
+        self._entries.clear()
+        self._by_school.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def print_stats(self):
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0.0
+        print(
+            f"🗃️ [메뉴 응답 캐시] {len(self._entries)}개 {self._bytes / 1024:.0f}KB / "
+            f"적중 {self.hits} ({rate:.0f}%) / 없음 {self.misses} / 밀려남 {self.evictions}"
+        )
+
+
+daily_cache = ResponseCache(max_bytes=settings.DAILY_CACHE_MAX_BYTES, ttl=settings.DAILY_CACHE_TTL)
@@ -0,0 +1,282 @@
+"""
+/daily, /range 응답 캐시 확인 + 측정 (임시 SQLite, 실제 DB는 건드리지 않음).
+
+  python benchmarks/daily_cache.py
+  python benchmarks/daily_cache.py --requests 5000 --cafeterias 20
+
+1. 캐시를 끈 상태 / 켠 상태로 같은 (학교, 날짜)를 계속 요청해서 응답 시간 비교 (+ 일주일: /daily 7번 vs /range 1번)
+2. 캐시에서 나간 응답은 SQL을 하나도 안 쓰는지
+3. ETag/304, Cache-Control(날짜별), 압축(gzip/br) 협상이 맞는지 + 주고받는 바이트 수
+4. 저장(save_school_data) / 청소(delete_old_menus)가 바뀐 (학교, 날짜)와 그 날짜가 들어간 기간만 지우는지
+   (예전 ETag면 새 내용으로 200)
+   (이미지 생성은 외부 API를 불러야 해서 여기서는 안 봄)
+하나라도 틀리면 실패(종료 코드 1).
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# backend 폴더를 파이썬 패스에 추가해서 app 모듈을 찾을 수 있게 함
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+# app을 import하기 전에 DB/보관 폴더를 임시로 바꿔둠
+TMP_DIR = tempfile.mkdtemp(prefix="haksik-cache-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(TMP_DIR, 'cache.db')}"
+os.environ["MENU_ARCHIVE_DIR"] = os.path.join(TMP_DIR, "archive")
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import event
+from app.core.config import settings
+from app.db.base import Base
+from app.db import models  # 테이블 정보를 Base에 등록
+from app.db.session import AsyncSessionLocal, engine, read_engine
+from app.api.v1.endpoints import menus
+from app.schemas.crawler import CafeteriaData, MenuData, SchoolData
+from app.services.db_service import save_school_data, delete_old_menus
+from app.services.response_cache import brotli, daily_cache
+
+SCHOOL = "벤치마크대학교"
+OTHER_SCHOOL = "옆동네대학교"
+MEAL_TYPES = ["BREAKFAST", "LUNCH", "DINNER"]
+
+
+def make_school(name, cafeterias, dates, label="v1"):
+    return SchoolData(
+        school_name=name,
+        school_region="서울",
+        cafeterias=[
+            CafeteriaData(
+                name=f"식당 {c}",
+                menus=[
+                    MenuData(meal_type=meal_type, date=d, menu_items=[f"{label} 메뉴{c}-{i}" for i in range(6)])
+                    for d in dates for meal_type in MEAL_TYPES
+                ],
+            )
+            for c in range(cafeterias)
+        ],
+    )
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def timed_requests(client, school, day, count):
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = await client.get("/api/v1/daily", params={"school_name": school, "target_date": day.isoformat()})
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return latencies
+
+
+async def main(requests, cafeterias):
+    today = date.today()
+    dates = [today + timedelta(days=i) for i in range(-5, 3)]
+    failures = []
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    with contextlib.redirect_stdout(io.StringIO()):
+        async with AsyncSessionLocal() as session:
+            await save_school_data(session, make_school(SCHOOL, cafeterias, dates))
+            await save_school_data(session, make_school(OTHER_SCHOOL, cafeterias, dates))
+
+    # /daily 라우터만 올린 앱 (스케줄러/크롤러는 안 띄움)
+    app = FastAPI()
+    app.include_router(menus.router, prefix="/api/v1")
+
+    statements = []
+    def count_sql(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(read_engine.sync_engine, "before_cursor_execute", count_sql)
+
+    async def daily(school, day):
+        response = await client.get("/api/v1/daily", params={"school_name": school, "target_date": day.isoformat()})
+        response.raise_for_status()
+        return response.json()
+
+    async def menu_range(school, start, end):
+        response = await client.get(
+            "/api/v1/range", params={"school_name": school, "start": start.isoformat(), "end": end.isoformat()}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        # 1. 속도 비교 (끈 상태 -> 켠 상태)
+        max_bytes = daily_cache.max_bytes
+        print(f"⏱️ /daily {requests}번 (식당 {cafeterias}곳 x {len(MEAL_TYPES)}끼)")
+        for label, cache_bytes in (("캐시 끔", 0), ("캐시 켬", max_bytes)):
+            daily_cache.max_bytes = cache_bytes
+            daily_cache.clear()
+            await timed_requests(client, SCHOOL, today, 20)  # 워밍업
+            statements.clear()
+            ms = [value * 1000 for value in await timed_requests(client, SCHOOL, today, requests)]
+            print(
+                f"  {label}: p50 {statistics.median(ms):6.2f}ms  p99 {percentile(ms, 99):6.2f}ms  "
+                f"초당 {len(ms) / (sum(ms) / 1000):7.0f}번  SQL {len(statements)}개"
+            )
+        if statements:
+            failures.append(f"캐시가 켜져 있는데 SQL이 {len(statements)}개 나감")
+
+        # 일주일 보기: /daily 7번 vs /range 1번 (둘 다 캐시 끔 = 매번 DB)
+        daily_cache.max_bytes = 0
+        week = [today + timedelta(days=i) for i in range(-3, 4)]
+        rounds = max(1, requests // 20)
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for d in week:
+                await daily(SCHOOL, d)
+        per_daily = (time.perf_counter() - started) / rounds * 1000
+        statements.clear()
+        started = time.perf_counter()
+        for _ in range(rounds):
+            body = await menu_range(SCHOOL, week[0], week[-1])
+        per_range = (time.perf_counter() - started) / rounds * 1000
+        print(f"  일주일 보기 (캐시 끔): /daily 7번 {per_daily:.2f}ms vs /range 1번 {per_range:.2f}ms (SQL {len(statements) // rounds}개)")
+        if [day["date"] for day in body["days"]] != [d.isoformat() for d in week]:
+            failures.append("/range가 날짜별로 빠짐없이 묶여 나오지 않음")
+        if body["days"][3]["cafeterias"] != (await daily(SCHOOL, today))["cafeterias"]:
+            failures.append("/range의 하루치가 /daily 응답과 다름")
+        daily_cache.max_bytes = max_bytes
+        daily_cache.clear()
+
+        # 2. HTTP 캐시: ETag/304, Cache-Control, 압축 협상
+        params = {"school_name": SCHOOL, "target_date": today.isoformat()}
+        print("\n📡 HTTP (오늘 응답 하나, 실제로 오간 바이트)")
+        sizes = {}
+        for encoding in ("identity", "gzip", "br"):
+            response = await client.get("/api/v1/daily", params=params, headers={"Accept-Encoding": encoding})
+            sizes[encoding] = response.num_bytes_downloaded
+            used = response.headers.get("content-encoding", "identity")
+            print(f"  Accept-Encoding {encoding:<8} -> {used:<8} {sizes[encoding]:6d}B  ETag {response.headers['etag']}")
+            if encoding == "br" and brotli is None:
+                continue
+            if used != encoding:
+                failures.append(f"Accept-Encoding {encoding}인데 {used}로 옴")
+        if response.headers.get("vary") != "Accept-Encoding":
+            failures.append("Vary: Accept-Encoding 헤더가 없음")
+
+        etag = response.headers["etag"]
+        statements.clear()
+        not_modified = await client.get("/api/v1/daily", params=params, headers={"If-None-Match": etag})
+        print(f"  If-None-Match      -> {not_modified.status_code} {not_modified.num_bytes_downloaded}B (SQL {len(statements)}개)")
+        if not_modified.status_code != 304 or not_modified.content:
+            failures.append(f"같은 ETag인데 {not_modified.status_code}로 본문을 다시 보냄")
+        # 압축 방식이 달라도 내용이 같으면 304 (표시만 다른 ETag)
+        other = await client.get("/api/v1/daily", params=params, headers={"If-None-Match": etag, "Accept-Encoding": "gzip"})
+        if other.status_code != 304:
+            failures.append("br로 받은 ETag를 gzip 요청에 보냈더니 304가 아님")
+
+        ms = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            await client.get("/api/v1/daily", params=params, headers={"If-None-Match": etag})
+            ms.append((time.perf_counter() - start) * 1000)
+        print(f"  304 재검증 {requests}번: p50 {statistics.median(ms):6.2f}ms  p99 {percentile(ms, 99):6.2f}ms")
+
+        for day, expected in ((today - timedelta(days=1), settings.DAILY_MAX_AGE_PAST), (today, settings.DAILY_MAX_AGE_CURRENT)):
+            response = await client.get("/api/v1/daily", params={"school_name": SCHOOL, "target_date": day.isoformat()})
+            cache_control = response.headers.get("cache-control")
+            print(f"  {day} Cache-Control: {cache_control}")
+            if cache_control != f"public, max-age={expected}":
+                failures.append(f"{day} Cache-Control가 {cache_control} (max-age={expected}이어야 함)")
+
+        # 3. 저장: 바뀐 (학교, 날짜)만 지워져야 함 (그 날짜가 들어간 기간도)
+        for d in dates:
+            await daily(SCHOOL, d)
+            await daily(OTHER_SCHOOL, d)
+        await menu_range(SCHOOL, dates[0], today)
+        await menu_range(SCHOOL, today, dates[-1])
+        changed_day = today + timedelta(days=1)
+        changed_etag = (await client.get(
+            "/api/v1/daily", params={"school_name": SCHOOL, "target_date": changed_day.isoformat()}
+        )).headers["etag"]
+        with contextlib.redirect_stdout(io.StringIO()):
+            async with AsyncSessionLocal() as session:
+                # 하루치만 내용을 바꾸고 나머지 날짜는 그대로 다시 저장 (크롤링이 기간 전체를 다시 보내는 상황)
+                data = make_school(SCHOOL, cafeterias, [d for d in dates if d != changed_day])
+                data.cafeterias += make_school(SCHOOL, cafeterias, [changed_day], label="v2").cafeterias
+                await save_school_data(session, data)
+
+        statements.clear()
+        response = await client.get(
+            "/api/v1/daily",
+            params={"school_name": SCHOOL, "target_date": changed_day.isoformat()},
+            headers={"If-None-Match": changed_etag},
+        )
+        if response.status_code != 200 or not statements or "v2" not in response.json()["cafeterias"][0]["menus"][0]["menu_text"]:
+            failures.append(f"저장 후에 바뀐 날짜가 예전 응답 그대로 나옴 ({response.status_code})")
+        statements.clear()
+        for d in dates:
+            await daily(OTHER_SCHOOL, d)
+            if d != changed_day:
+                await daily(SCHOOL, d)
+        await menu_range(SCHOOL, dates[0], today)
+        if statements:
+            failures.append(f"안 바뀐 (학교, 날짜)까지 캐시에서 지워짐 (SQL {len(statements)}개)")
+        body = await menu_range(SCHOOL, today, dates[-1])
+        if not statements or "v2" not in body["days"][1]["cafeterias"][0]["menus"][0]["menu_text"]:
+            failures.append("바뀐 날짜가 들어간 /range가 예전 응답 그대로 나옴")
+
+        # 4. 청소: 지운 날짜는 빈 응답으로 바뀌어야 함
+        with contextlib.redirect_stdout(io.StringIO()):
+            async with AsyncSessionLocal() as session:
+                await delete_old_menus(session, days=3)
+        old_day = today - timedelta(days=5)
+        if (await daily(SCHOOL, old_day))["cafeterias"]:
+            failures.append("청소 후에도 지운 날짜 메뉴가 캐시에서 나옴")
+        statements.clear()
+        await daily(SCHOOL, today)
+        if statements:
+            failures.append("청소가 안 지운 날짜까지 캐시에서 지움")
+
+        # 하루짜리 /range와 /daily는 같은 기간이어도 응답 모양이 다름 (캐시에서 섞이면 안 됨)
+        single = await menu_range(SCHOOL, today, today)
+        if "days" not in single or "days" in await daily(SCHOOL, today):
+            failures.append("하루짜리 /range와 /daily 응답이 캐시에서 섞임")
+
+        # 기간 제한
+        too_long = await client.get("/api/v1/range", params={
+            "school_name": SCHOOL, "start": today.isoformat(),
+            "end": (today + timedelta(days=settings.MENU_RANGE_MAX_DAYS)).isoformat(),
+        })
+        if too_long.status_code != 400:
+            failures.append(f"최대 기간을 넘었는데 {too_long.status_code}")
+
+        print(f"\n📊 캐시 상태: {daily_cache.stats()}")
+
+    event.remove(read_engine.sync_engine, "before_cursor_execute", count_sql)
+    await read_engine.dispose()
+    await engine.dispose()
+    shutil.rmtree(TMP_DIR, ignore_errors=True)
+
+    if failures:
+        print("\n❌ 실패:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("\n✅ 캐시 적중 시 SQL 0개 + ETag/304/압축 정상 + 바뀐 (학교, 날짜)만 지워짐")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="/daily 응답 캐시 속도 + HTTP 캐시(ETag/304/압축) + 무효화 확인 (임시 DB)")
+    parser.add_argument("--requests", type=int, default=2000, help="속도 측정 요청 수")
+    parser.add_argument("--cafeterias", type=int, default=10, help="학교 하나의 식당 수")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(main(args.requests, args.cafeterias)))
@@ -0,0 +1,249 @@
+"""
+캘린더 요약(menu_day_summaries) + /calendar 확인 (임시 SQLite, 실제 DB는 건드리지 않음).
+
+  python benchmarks/day_summaries.py
+  python benchmarks/day_summaries.py --days 90 --cafeterias 20
+
+1. 저장(save_school_data) 후 요약이 menus를 처음부터 다시 센 것과 같은지
+2. 같은 내용을 다시 저장하면 version이 그대로인지, 식당이 늘어난 날짜만 version이 오르는지
+3. 이미지가 생긴 날짜는 image_count가 오르는지 (이미지 생성은 외부 API라서 AIService와 같은 순서로 직접 바꿈)
+4. 청소(delete_old_menus) 후 지운 날짜 요약이 없어지는지
+5. /calendar 한 달 조회: 요약 테이블 vs menus를 그때그때 세는 것 (둘 다 응답 캐시 끔)
+하나라도 틀리면 실패(종료 코드 1).
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# backend 폴더를 파이썬 패스에 추가해서 app 모듈을 찾을 수 있게 함
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+# app을 import하기 전에 DB/보관 폴더를 임시로 바꿔둠
+TMP_DIR = tempfile.mkdtemp(prefix="haksik-summary-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(TMP_DIR, 'summary.db')}"
+os.environ["MENU_ARCHIVE_DIR"] = os.path.join(TMP_DIR, "archive")
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import distinct, func, select, update
+from app.db.base import Base
+from app.db import models
+from app.db.session import AsyncSessionLocal, engine, read_engine
+from app.api.v1.endpoints import calendar
+from app.schemas.crawler import CafeteriaData, MenuData, SchoolData
+from app.services.db_service import save_school_data, delete_old_menus, refresh_day_summaries
+from app.services.response_cache import daily_cache
+
+SCHOOL = "벤치마크대학교"
+OTHER_SCHOOL = "옆동네대학교"
+MEAL_TYPES = ["BREAKFAST", "LUNCH", "DINNER"]
+
+
+def make_school(name, cafeterias, dates):
+    # 식당마다 쉬는 날이 달라서 날짜마다 식당 수/메뉴 수가 다름
+    return SchoolData(
+        school_name=name,
+        school_region="서울",
+        cafeterias=[
+            CafeteriaData(
+                name=f"식당 {c}",
+                menus=[
+                    MenuData(meal_type=meal_type, date=d, menu_items=[f"메뉴{c}-{i}" for i in range(6)])
+                    for i, d in enumerate(dates) if (i + c) % (c + 2) for meal_type in MEAL_TYPES[:1 + c % 3]
+                ],
+            )
+            for c in range(cafeterias)
+        ],
+    )
+
+
+async def recount(session):
+    """{(학교 id, 날짜): (메뉴, 식당, 이미지)} - menus를 처음부터 다시 센 것 (마이그레이션 백필과 같은 집계)"""
+    result = await session.execute(
+        select(
+            models.Cafeteria.school_id, models.Menu.date, func.count(models.Menu.id),
+            func.count(distinct(models.Menu.cafeteria_id)), func.count(models.Menu.image_url_3d),
+        )
+        .join(models.Cafeteria, models.Cafeteria.id == models.Menu.cafeteria_id)
+        .group_by(models.Cafeteria.school_id, models.Menu.date)
+    )
+    return {(school_id, day): counts for school_id, day, *counts in result.all()}
+
+
+async def summaries(session):
+    """{(학교 id, 날짜): (메뉴, 식당, 이미지, version)}"""
+    summary = models.MenuDaySummary
+    result = await session.execute(select(
+        summary.school_id, summary.date, summary.menu_count, summary.cafeteria_count, summary.image_count, summary.version,
+    ))
+    return {(school_id, day): tuple(values) for school_id, day, *values in result.all()}
+
+
+async def check_consistent(label, failures):
+    async with AsyncSessionLocal() as session:
+        expected = await recount(session)
+        actual = {key: value[:3] for key, value in (await summaries(session)).items()}
+    wrong = {key for key in expected.keys() | actual.keys() if tuple(expected.get(key, ())) != tuple(actual.get(key, ()))}
+    print(f"  {'✅' if not wrong else '❌'} {label}: 요약 {len(actual)}개, 다시 센 것과 다른 날짜 {len(wrong)}개")
+    if wrong:
+        failures.append(f"{label}: 요약이 menus와 다름 {sorted(wrong)[:3]}")
+
+
+async def main(days, cafeterias, rounds):
+    today = date.today()
+    dates = [today + timedelta(days=i) for i in range(-days + 3, 3)]
+    failures = []
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    print(f"📅 캘린더 요약 (학교 2곳, 식당 {cafeterias}곳, {len(dates)}일)")
+    with contextlib.redirect_stdout(io.StringIO()):
+        async with AsyncSessionLocal() as session:
+            await save_school_data(session, make_school(SCHOOL, cafeterias, dates))
+            await save_school_data(session, make_school(OTHER_SCHOOL, cafeterias, dates))
+    await check_consistent("첫 저장", failures)
+
+    async with AsyncSessionLocal() as session:
+        school_id = (await session.execute(select(models.School.id).where(models.School.name == SCHOOL))).scalar_one()
+        before = await summaries(session)
+
+    # 같은 내용 다시 저장 -> 아무것도 안 바뀜 / 하루에 식당 하나가 더 생김 -> 그날만 version +1
+    changed_day = today + timedelta(days=1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        async with AsyncSessionLocal() as session:
+            await save_school_data(session, make_school(SCHOOL, cafeterias, dates))
+            data = make_school(SCHOOL, cafeterias, dates)
+            data.cafeterias.append(CafeteriaData(
+                name="새 식당", menus=[MenuData(meal_type="LUNCH", date=changed_day, menu_items=["새 메뉴"])],
+            ))
+            await save_school_data(session, data)
+    await check_consistent("다시 저장 + 식당 추가", failures)
+    async with AsyncSessionLocal() as session:
+        after = await summaries(session)
+    bumped = {key for key in after if after[key][3] != before.get(key, (0, 0, 0, 1))[3]}
+    print(f"  version이 오른 날짜: {sorted(day.isoformat() for _, day in bumped)}")
+    if bumped != {(school_id, changed_day)}:
+        failures.append(f"식당이 늘어난 날짜만 version이 올라야 하는데 {len(bumped)}개가 오름")
+
+    # 이미지 생성 (AIService와 같은 순서: 메뉴 이미지 -> 요약 -> 커밋 -> 응답 캐시 지움)
+    async with AsyncSessionLocal() as session:
+        menu_ids = (await session.execute(
+            select(models.Menu.id)
+            .join(models.Cafeteria, models.Cafeteria.id == models.Menu.cafeteria_id)
+            .where(models.Cafeteria.school_id == school_id, models.Menu.date == today)
+        )).scalars().all()
+        await session.execute(update(models.Menu).where(models.Menu.id.in_(menu_ids[:2])).values(image_url_3d="https://example.com/x.png"))
+        await refresh_day_summaries(session, school_id, [today])
+        await session.commit()
+    daily_cache.invalidate(SCHOOL, [today])
+    await check_consistent("이미지 생성", failures)
+    async with AsyncSessionLocal() as session:
+        if (await summaries(session))[(school_id, today)][2] != min(2, len(menu_ids)):
+            failures.append("이미지를 만든 날짜의 image_count가 안 오름")
+
+    # 청소
+    with contextlib.redirect_stdout(io.StringIO()):
+        async with AsyncSessionLocal() as session:
+            await delete_old_menus(session, days=3)
+    await check_consistent("청소", failures)
+    async with AsyncSessionLocal() as session:
+        if min(day for _, day in await summaries(session)) < today - timedelta(days=3):
+            failures.append("청소한 날짜 요약이 남아 있음")
+
+    # /calendar
+    app = FastAPI()
+    app.include_router(calendar.router, prefix="/api/v1")
+    month = today.strftime("%Y-%m")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/api/v1/calendar", params={"school_name": SCHOOL, "month": month})
+        response.raise_for_status()
+        body = response.json()
+        async with AsyncSessionLocal() as session:
+            expected = sorted(
+                (day.isoformat(), counts)
+                for (sid, day), counts in (await recount(session)).items()
+                if sid == school_id and day.strftime("%Y-%m") == month
+            )
+        got = [(d["date"], (d["menu_count"], d["cafeteria_count"], d["image_count"])) for d in body["days"]]
+        if got != [(day, tuple(counts)) for day, counts in expected]:
+            failures.append("/calendar 응답이 menus를 센 것과 다름")
+
+        # 응답 캐시: 저장 후에는 새 숫자로
+        etag = response.headers["etag"]
+        with contextlib.redirect_stdout(io.StringIO()):
+            async with AsyncSessionLocal() as session:
+                data = make_school(SCHOOL, cafeterias, dates)
+                data.cafeterias.append(CafeteriaData(
+                    name="새 식당", menus=[MenuData(meal_type="DINNER", date=today, menu_items=["또 새 메뉴"])],
+                ))
+                await save_school_data(session, data)
+        response = await client.get("/api/v1/calendar", params={"school_name": SCHOOL, "month": month}, headers={"If-None-Match": etag})
+        if response.status_code != 200:
+            failures.append(f"저장 후에도 /calendar가 예전 응답({response.status_code})")
+
+        for params, status in (
+            ({"school_name": SCHOOL, "month": "2026-13"}, 400),
+            ({"school_name": SCHOOL, "month": "march"}, 400),
+            ({"school_name": "없는학교", "month": month}, 404),
+        ):
+            code = (await client.get("/api/v1/calendar", params=params)).status_code
+            if code != status:
+                failures.append(f"/calendar {params} -> {code} ({status}이어야 함)")
+
+        # 속도: 요약 테이블 vs 그때그때 세기 (응답 캐시 끔)
+        daily_cache.max_bytes = 0
+        first = today.replace(day=1)
+        last = (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        summary_ms, recount_ms = [], []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            (await client.get("/api/v1/calendar", params={"school_name": SCHOOL, "month": month})).raise_for_status()
+            summary_ms.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            async with AsyncSessionLocal() as session:
+                await session.execute(
+                    select(
+                        models.Menu.date, func.count(models.Menu.id),
+                        func.count(distinct(models.Menu.cafeteria_id)), func.count(models.Menu.image_url_3d),
+                    )
+                    .join(models.Cafeteria, models.Cafeteria.id == models.Menu.cafeteria_id)
+                    .where(models.Cafeteria.school_id == school_id, models.Menu.date.between(first, last))
+                    .group_by(models.Menu.date)
+                )
+            recount_ms.append((time.perf_counter() - started) * 1000)
+        print(f"\n⏱️ 한 달 조회 {rounds}번 (응답 캐시 끔)")
+        print(f"  /calendar (요약 테이블): p50 {statistics.median(summary_ms):6.2f}ms")
+        print(f"  menus 그때그때 세기(쿼리만): p50 {statistics.median(recount_ms):6.2f}ms")
+
+    await read_engine.dispose()
+    await engine.dispose()
+    shutil.rmtree(TMP_DIR, ignore_errors=True)
+
+    if failures:
+        print("\n❌ 실패:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("\n✅ 저장/이미지/청소 후에도 요약 = menus + 바뀐 날짜만 version +1 + /calendar 정상")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="캘린더 요약 테이블이 저장/청소를 따라가는지 + /calendar 속도 확인 (임시 DB)")
+    parser.add_argument("--days", type=int, default=45, help="메뉴를 넣을 날짜 수 (오늘+2일까지 거꾸로)")
+    parser.add_argument("--cafeterias", type=int, default=10, help="학교 하나의 식당 수")
+    parser.add_argument("--rounds", type=int, default=200, help="속도 측정 횟수")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(main(args.days, args.cafeterias, args.rounds)))
@@ -0,0 +1,197 @@
+"""
+크롤링이 DB에 쓰는 동안 /daily 응답이 얼마나 밀리는지 측정.
+
+  python benchmarks/db_contention.py
+  python benchmarks/db_contention.py --rounds 20 --readers 8
+
+같은 작업(저장 반복 + /daily 동시 조회)을 두 가지 설정으로 돌려서 비교함.
+  - 예전: 엔진 1개, 기본 설정 (rollback journal) - 읽기/쓰기가 같은 풀과 같은 잠금을 씀
+  - 지금: WAL + PRAGMA 설정 + 쓰기 엔진(연결 1개) / 읽기 전용 엔진(풀) 분리 (app/db/session.py)
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# backend 폴더를 파이썬 패스에 추가해서 app 모듈을 찾을 수 있게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# /daily 응답 캐시는 끔 (쓰기가 다른 프로세스라 캐시가 안 지워짐 + 매번 DB를 읽어야 측정이 됨)
+os.environ["DAILY_CACHE_MAX_BYTES"] = "0"
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.db.base import Base
+from app.db import models  # 테이블 정보를 Base에 등록
+from app.db.session import build_engine, get_read_db
+from app.api.v1.endpoints import menus
+from app.schemas.crawler import CafeteriaData, MenuData, SchoolData
+from app.services.db_service import save_school_data
+from app.services.dimension_cache import dimension_cache
+
+SCHOOL = "벤치마크대학교"
+MEAL_TYPES = ["BREAKFAST", "LUNCH", "DINNER", "LUNCH_A", "LUNCH_B", "DINNER_SPECIAL"]
+
+
+def daily_client(ReadSession) -> httpx.AsyncClient:
+    """/daily 라우터만 올린 앱에 HTTP로 요청 (읽기 세션은 비교하는 설정의 엔진으로 바꿔 끼움)"""
+    app = FastAPI()
+    app.include_router(menus.router, prefix="/api/v1")
+
+    async def read_db():
+        async with ReadSession() as session:
+            yield session
+
+    app.dependency_overrides[get_read_db] = read_db
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def make_school(start: date, cafeterias: int, days: int, version: int) -> SchoolData:
+    return SchoolData(
+        school_name=SCHOOL,
+        school_region="서울",
+        cafeterias=[
+            CafeteriaData(
+                name=f"식당 {c}",
+                menus=[
+                    MenuData(
+                        meal_type=meal_type,
+                        date=start + timedelta(days=d),
+                        menu_items=[f"메뉴{version}-{c}-{d}-{i}" for i in range(6)],
+                    )
+                    for d in range(days) for meal_type in MEAL_TYPES
+                ],
+            )
+            for c in range(cafeterias)
+        ],
+    )
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def legacy_engines(url):
+    """예전 session.py: 기본 엔진 하나를 읽기/쓰기가 같이 씀"""
+    engine = create_async_engine(url, echo=False, connect_args={"check_same_thread": False})
+    return engine, engine
+
+
+def tuned_engines(url):
+    """지금 session.py: 쓰기 엔진(연결 1개) + 읽기 전용 엔진(풀)"""
+    return (
+        build_engine(url, pool_timeout=settings.DB_WRITE_POOL_TIMEOUT),
+        build_engine(url, readonly=True, pool_size=settings.DB_READ_POOL_SIZE),
+    )
+
+
+CONFIGS = {
+    "legacy": ("예전 (엔진 1개)", legacy_engines),
+    "tuned": ("WAL + 읽기/쓰기 분리", tuned_engines),
+}
+
+
+async def write_loop(url, config, rounds, cafeterias, days, done):
+    """크롤링 역할: 매 회차 메뉴 내용을 바꿔서 전부 UPDATE (기간 전체를 다시 저장하는 상황)"""
+    write_engine, read_engine = CONFIGS[config][1](url)
+    WriteSession = sessionmaker(bind=write_engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for version in range(1, rounds + 1):
+                async with WriteSession() as session:
+                    await save_school_data(session, make_school(date.today(), cafeterias, days, version))
+    finally:
+        done.set()
+        await read_engine.dispose()
+        await write_engine.dispose()
+
+
+def writer_process(url, config, rounds, cafeterias, days, done):
+    # 저장 쿼리를 만드는 파이썬 CPU 시간이 측정에 섞이지 않게 쓰기는 다른 프로세스에서
+    asyncio.run(write_loop(url, config, rounds, cafeterias, days, done))
+
+
+async def run_config(config, url, rounds, readers, cafeterias, days):
+    name, make_engines = CONFIGS[config]
+    # 학교/식당 캐시는 프로세스 전역이라 DB를 바꿀 때마다 비워야 함
+    dimension_cache.invalidate()
+    write_engine, read_engine = make_engines(url)
+    async with write_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    # 처음 데이터 채우기
+    WriteSession = sessionmaker(bind=write_engine, class_=AsyncSession, expire_on_commit=False)
+    async with WriteSession() as session:
+        with contextlib.redirect_stdout(io.StringIO()):
+            await save_school_data(session, make_school(date.today(), cafeterias, days, 0))
+
+    ReadSession = sessionmaker(bind=read_engine, class_=AsyncSession, expire_on_commit=False)
+    client = daily_client(ReadSession)
+    latencies, errors = [], []
+    done = multiprocessing.get_context("spawn").Event()
+
+    async def reader():
+        while not done.is_set():
+            start = time.perf_counter()
+            try:
+                response = await client.get(
+                    "/api/v1/daily", params={"school_name": SCHOOL, "target_date": date.today().isoformat()}
+                )
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+            except Exception as e:
+                errors.append(str(e))
+            await asyncio.sleep(0)
+
+    writer = multiprocessing.get_context("spawn").Process(
+        target=writer_process, args=(url, config, rounds, cafeterias, days, done)
+    )
+    start = time.perf_counter()
+    writer.start()
+    await asyncio.gather(*[reader() for _ in range(readers)])
+    elapsed = time.perf_counter() - start
+    writer.join()
+
+    await client.aclose()
+    await read_engine.dispose()
+    await write_engine.dispose()
+
+    ms = [value * 1000 for value in latencies]
+    print(
+        f"  {name:<22} /daily {len(ms):5d}번  "
+        f"p50 {statistics.median(ms):7.1f}ms  p95 {percentile(ms, 95):7.1f}ms  "
+        f"p99 {percentile(ms, 99):7.1f}ms  최대 {max(ms):7.1f}ms  에러 {len(errors)}번  (저장 {rounds}회 {elapsed:.1f}초)"
+    )
+    if errors:
+        print(f"    예: {errors[0][:120]}")
+
+
+async def main(rounds, readers, cafeterias, days):
+    rows = cafeterias * days * len(MEAL_TYPES)
+    print(f"📦 저장 1회 = 메뉴 {rows}개 UPDATE, {rounds}회 반복하는 동안 /daily를 {readers}명이 계속 조회\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for config in CONFIGS:
+            url = f"sqlite+aiosqlite:///{os.path.join(tmp, config + '.db')}"
+            await run_config(config, url, rounds, readers, cafeterias, days)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="크롤링 저장 중 /daily 응답 시간 (예전 엔진 vs WAL + 읽기/쓰기 분리)")
+    parser.add_argument("--rounds", type=int, default=10, help="저장 반복 횟수")
+    parser.add_argument("--readers", type=int, default=4, help="동시에 /daily를 부르는 수")
+    parser.add_argument("--cafeterias", type=int, default=20, help="식당 수")
+    parser.add_argument("--days", type=int, default=30, help="한 번에 저장하는 날짜 수")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.rounds, args.readers, args.cafeterias, args.days))
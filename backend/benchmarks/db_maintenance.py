@@ -0,0 +1,235 @@
+"""
+매일 DB 정리 작업이 도는 동안 API 읽기/다른 쓰기가 얼마나 밀리는지 + 파일이 얼마나 줄어드는지 측정.
+
+  python benchmarks/db_maintenance.py
+  python benchmarks/db_maintenance.py --days 180 --cafeterias 40
+
+같은 데이터(지난 메뉴 잔뜩 + 오늘 메뉴)로 두 가지 방식을 비교함.
+  - 예전: DELETE 한 번 + 커밋 (auto_vacuum 없음 -> 지운 공간이 파일 안에 빈 페이지로 남음)
+  - 지금: run_maintenance (보관 후 조금씩 삭제 + incremental_vacuum + 통계 갱신, app/services/db_maintenance.py)
+정리하는 동안 /daily 조회와 작은 쓰기(문의 저장 = 크롤링 저장 대신)를 계속 보내서 응답 시간을 잼.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# backend 폴더를 파이썬 패스에 추가해서 app 모듈을 찾을 수 있게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 보관 파일은 임시 폴더에 (실제 /data는 건드리지 않음)
+TMP_DIR = tempfile.mkdtemp(prefix="haksik-maint-")
+os.environ["MENU_ARCHIVE_DIR"] = os.path.join(TMP_DIR, "archive")
+# /daily 응답 캐시는 끔 (매번 실제 쿼리가 나가야 측정/검사가 됨)
+os.environ["DAILY_CACHE_MAX_BYTES"] = "0"
+
+from sqlalchemy import delete
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.db.base import Base
+from app.db import models
+from app.db.session import build_engine, get_read_db
+from app.api.v1.endpoints import menus
+from app.schemas.crawler import CafeteriaData, MenuData, SchoolData
+from app.services.db_maintenance import db_file_stats, run_maintenance
+from app.services.db_service import save_school_data
+from app.services.dimension_cache import dimension_cache
+
+SCHOOL = "벤치마크대학교"
+MEAL_TYPES = ["BREAKFAST", "LUNCH", "DINNER", "LUNCH_A", "LUNCH_B", "DINNER_SPECIAL"]
+KEEP_DAYS = 3
+
+
+def daily_client(ReadSession) -> httpx.AsyncClient:
+    """/daily 라우터만 올린 앱에 HTTP로 요청 (읽기 세션은 비교하는 설정의 엔진으로 바꿔 끼움)"""
+    app = FastAPI()
+    app.include_router(menus.router, prefix="/api/v1")
+
+    async def read_db():
+        async with ReadSession() as session:
+            yield session
+
+    app.dependency_overrides[get_read_db] = read_db
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def make_school(start: date, cafeterias: int, days: int) -> SchoolData:
+    return SchoolData(
+        school_name=SCHOOL,
+        school_region="서울",
+        cafeterias=[
+            CafeteriaData(
+                name=f"식당 {c}",
+                menus=[
+                    MenuData(
+                        meal_type=meal_type,
+                        date=start + timedelta(days=d),
+                        menu_items=[f"메뉴-{c}-{d}-{meal_type}-{i} 볶음밥과 된장국" for i in range(6)],
+                    )
+                    for d in range(days) for meal_type in MEAL_TYPES
+                ],
+            )
+            for c in range(cafeterias)
+        ],
+    )
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def legacy_cleanup(session: AsyncSession, days: int):
+    """예전 delete_old_menus: 한 번에 DELETE 후 커밋 (보관/vacuum 없음)"""
+    cutoff = date.today() - timedelta(days=days)
+    old_ids = models.Menu.__table__.select().with_only_columns(models.Menu.id).where(models.Menu.date < cutoff)
+    await session.execute(delete(models.MenuDish).where(models.MenuDish.menu_id.in_(old_ids)))
+    result = await session.execute(delete(models.Menu).where(models.Menu.date < cutoff))
+    await session.commit()
+    return {"deleted": result.rowcount}
+
+
+def legacy_engines(url):
+    """예전 session.py: 기본 엔진 하나를 읽기/쓰기가 같이 씀 (auto_vacuum 없음)"""
+    engine = create_async_engine(url, echo=False, connect_args={"check_same_thread": False})
+    return engine, engine
+
+
+def tuned_engines(url):
+    """지금 session.py: 쓰기 엔진(연결 1개, auto_vacuum=INCREMENTAL) + 읽기 전용 엔진(풀)"""
+    return (
+        build_engine(url, pool_timeout=settings.DB_WRITE_POOL_TIMEOUT),
+        build_engine(url, readonly=True, pool_size=settings.DB_READ_POOL_SIZE),
+    )
+
+
+CONFIGS = {
+    "legacy": ("예전 (DELETE 한 번)", legacy_engines, lambda s: legacy_cleanup(s, KEEP_DAYS)),
+    "tuned": ("run_maintenance", tuned_engines, lambda s: run_maintenance(s, days=KEEP_DAYS)),
+}
+
+
+def summary(label, seconds):
+    if not seconds:
+        return f"{label} 0번"
+    ms = [value * 1000 for value in seconds]
+    return f"{label} {len(ms):5d}번 p50 {statistics.median(ms):6.1f}ms p99 {percentile(ms, 99):7.1f}ms 최대 {max(ms):7.1f}ms"
+
+
+async def run_config(config, url, cafeterias, days):
+    name, make_engines, cleanup = CONFIGS[config]
+    # 학교/식당 캐시는 프로세스 전역이라 DB를 바꿀 때마다 비워야 함
+    dimension_cache.invalidate()
+    write_engine, read_engine = make_engines(url)
+    async with write_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    WriteSession = sessionmaker(bind=write_engine, class_=AsyncSession, expire_on_commit=False)
+    ReadSession = sessionmaker(bind=read_engine, class_=AsyncSession, expire_on_commit=False)
+    client = daily_client(ReadSession)
+    with contextlib.redirect_stdout(io.StringIO()):
+        async with WriteSession() as session:
+            # 지난 메뉴 days일치 + 오늘부터 며칠치
+            await save_school_data(session, make_school(date.today() - timedelta(days=days), cafeterias, days + 3))
+
+    before = await db_file_stats(write_engine)
+    reads, writes, errors = [], [], []
+    done = asyncio.Event()
+
+    async def reader():
+        while not done.is_set():
+            start = time.perf_counter()
+            try:
+                response = await client.get(
+                    "/api/v1/daily", params={"school_name": SCHOOL, "target_date": date.today().isoformat()}
+                )
+                response.raise_for_status()
+                reads.append(time.perf_counter() - start)
+            except Exception as e:
+                errors.append(str(e))
+            await asyncio.sleep(0.005)
+
+    async def writer():
+        # 정리 중에 들어오는 다른 쓰기 (크롤링 저장/문의 저장이 쓰기 연결을 얼마나 기다리는지)
+        while not done.is_set():
+            start = time.perf_counter()
+            try:
+                async with WriteSession() as session:
+                    session.add(models.Inquiry(category="벤치마크", content="정리 중 쓰기"))
+                    await session.commit()
+                writes.append(time.perf_counter() - start)
+            except Exception as e:
+                errors.append(str(e))
+            await asyncio.sleep(0.02)
+
+    async def maintain():
+        await asyncio.sleep(0.2)
+        try:
+            async with WriteSession() as session:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    return await cleanup(session)
+        finally:
+            await asyncio.sleep(0.2)
+            done.set()
+
+    start = time.perf_counter()
+    result, *_ = await asyncio.gather(maintain(), reader(), reader(), writer())
+    elapsed = time.perf_counter() - start
+    after = await db_file_stats(write_engine)
+
+    await client.aclose()
+    await read_engine.dispose()
+    await write_engine.dispose()
+
+    print(f"  {name}")
+    print(f"    메뉴 {result['deleted']}개 삭제, 전체 {elapsed:.1f}초 / 에러 {len(errors)}번")
+    print(f"    {summary('/daily', reads)}")
+    print(f"    {summary('쓰기 ', writes)}")
+    print(
+        f"    DB 파일 {before['file_bytes'] / 1024 / 1024:.1f}MB -> {after['file_bytes'] / 1024 / 1024:.1f}MB, "
+        f"빈 페이지 {before['freelist_count']} -> {after['freelist_count']}개 (auto_vacuum {after['auto_vacuum']})"
+    )
+    if errors:
+        print(f"    예: {errors[0][:120]}")
+    return after
+
+
+async def main(cafeterias, days):
+    rows = cafeterias * days * len(MEAL_TYPES)
+    print(f"📦 지난 메뉴 {rows}개 ({days}일치)를 정리하는 동안 /daily 2명 + 쓰기 1명이 계속 요청\n")
+
+    failures = []
+    try:
+        for config in CONFIGS:
+            url = f"sqlite+aiosqlite:///{os.path.join(TMP_DIR, config + '.db')}"
+            after = await run_config(config, url, cafeterias, days)
+            if config == "tuned" and after["freelist_count"] > 0:
+                failures.append(f"정리 후에도 빈 페이지가 {after['freelist_count']}개 남음 (시간 예산 안에 다 못 반납)")
+    finally:
+        shutil.rmtree(TMP_DIR, ignore_errors=True)
+
+    if failures:
+        print("\n❌ 실패:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DB 정리 작업 중 API 응답/쓰기 대기 시간 + 파일 크기 (예전 DELETE vs run_maintenance)")
+    parser.add_argument("--cafeterias", type=int, default=20, help="식당 수")
+    parser.add_argument("--days", type=int, default=90, help="정리할 지난 날짜 수")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(main(args.cafeterias, args.days)))
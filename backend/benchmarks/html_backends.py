@@ -0,0 +1,97 @@
+import argparse
+import glob
+import os
+import sys
+import time
+
+# backend 폴더를 파이썬 패스에 추가해서 app 모듈을 찾을 수 있게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.crawler.html import BACKENDS, decode_html, make_soup, resolve_backend
+from app.services.crawler.scrapers import get_scrapers
+from app.services.crawler.snapshot_store import snapshot_store
+
+
+def load_targets():
+    """학교(http 프로필) -> 그 학교 파서가 보는 부분"""
+    targets = {}
+    for scraper in get_scrapers():
+        target = getattr(scraper, "html_target", None)
+        if target is None and getattr(scraper, "parsers", None):
+            target = scraper.parsers[0].html_target
+        targets[scraper.http_profile] = target
+    return targets
+
+
+def load_pages(html_dir: str = None, limit: int = 50):
+    """스냅샷 저장소(또는 폴더의 <학교>_*.html 파일)에서 학교별 페이지를 모음"""
+    pages = {}
+    if html_dir:
+        for path in sorted(glob.glob(os.path.join(html_dir, "*.html"))):
+            source = os.path.basename(path).split("_", 1)[0]
+            with open(path, "rb") as f:
+                pages.setdefault(source, []).append(decode_html(source, f.read()))
+        return pages
+
+    for entry in snapshot_store.iter_entries():
+        source_pages = pages.setdefault(entry["source"], [])
+        if len(source_pages) >= limit:
+            continue
+        content = snapshot_store.read(entry["hash"])
+        if content:
+            source_pages.append(decode_html(entry["source"], content))
+    return pages
+
+
+def extract(soup, target):
+    """결과 비교용: 파서가 보는 부분의 텍스트"""
+    return [node.get_text("\n", strip=True) for node in soup.select(target.css)]
+
+
+def run(html_dir: str = None, repeat: int = 5, limit: int = 50):
+    targets = load_targets()
+    pages = load_pages(html_dir, limit)
+    if not pages:
+        print("💤 비교할 페이지가 없음 (스냅샷 저장소가 비어 있음). --dir 로 HTML 폴더를 지정해도 됨")
+        return
+
+    # 같은 이름이라도 설치 안 된 백엔드는 다른 걸로 대체되니까 실제로 쓰이는 것만 비교
+    backends = sorted({resolve_backend(b) for b in BACKENDS}, key=BACKENDS.index)
+
+    for source, htmls in sorted(pages.items()):
+        target = targets.get(source)
+        total_kb = sum(len(h) for h in htmls) / 1024
+        print(f"\n🏫 {source}: 페이지 {len(htmls)}개 ({total_kb:.0f}KB) / 대상 {target}")
+
+        # 결과 기준: 예전 방식 (html.parser로 전체 트리)
+        baseline = [extract(make_soup(h, backend="html.parser"), target) for h in htmls] if target else None
+        base_time = None
+
+        # 예전 방식(html.parser 전체)이 맨 처음 = 배속 기준. selectolax는 부분 추출에만 쓰이니 '전체'는 lxml과 같아서 뺌
+        for backend in reversed(backends):
+            for partial in (False, True):
+                if (partial and target is None) or (backend == "selectolax" and not partial):
+                    continue
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    soups = [make_soup(h, target if partial else None, backend) for h in htmls]
+                elapsed = (time.perf_counter() - start) / repeat * 1000
+
+                same = "-"
+                if baseline is not None:
+                    same = "✅" if [extract(s, target) for s in soups] == baseline else "❌ 결과 다름"
+                if base_time is None:
+                    base_time = elapsed
+
+                mode = "부분" if partial else "전체"
+                print(f"  {backend:<12} {mode}  {elapsed:8.1f}ms  x{base_time / elapsed:5.1f}  {same}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HTML 파싱 백엔드 속도 비교 (저장된 실제 페이지 사용)")
+    parser.add_argument("--dir", help="스냅샷 저장소 대신 쓸 HTML 폴더 (파일 이름: <학교>_아무거나.html)")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수 (평균)")
+    parser.add_argument("--limit", type=int, default=50, help="학교별 최대 페이지 수")
+    args = parser.parse_args()
+
+    run(args.dir, args.repeat, args.limit)
@@ -0,0 +1,241 @@
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from datetime import date
+
+# backend 폴더를 파이썬 패스에 추가해서 app 모듈을 찾을 수 있게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.schemas.crawler import MenuData
+from app.services.crawler.parsers.kaist import KaimaruParser, MunjiParser
+from app.services.crawler.parsers.snu import SnuScraper
+from app.services.crawler.parsers.uos import StudentHall1Parser
+
+# =============================================================================
+# 예전 코드 그대로 (비교 기준)
+# =============================================================================
+
+def legacy_snu_clean(text):
+    if not text: return ""
+    if "※" in text:
+        return ""
+    text = text.strip()
+    if text.startswith(">") or text.endswith("코너>") or text in ["식 메뉴", "메뉴"]:
+        return ""
+    if re.match(r'^\s*[\d,]+\s*원?\s*$', text):
+        return ""
+    text = re.sub(r'<([^>]+)>', r'[\1]', text)
+    text = re.sub(r'\([#]\)', '', text)
+    ignore_keywords = [
+        "제공", "운영", "식단", "참고", "안내", "문의", "품절",
+        "배식", "kcal", "원산지", "마감", "종료", "시간", "부탁"
+    ]
+    if any(keyword in text for keyword in ignore_keywords):
+        return ""
+    return text.strip()
+
+
+def legacy_snu_column(lines, meal_type, target_date):
+    generated_menus = []
+    current_meal_type = meal_type
+    current_items = []
+    ignore_mode = False
+    for line in lines:
+        if "※" in line: continue
+        new_suffix = None
+        content_to_add = line
+        add_this_line = True
+        if "뷔페" in line:
+            new_suffix = "_BUFFET"; add_this_line = False
+        elif "천원의" in line and "아침" in line:
+            new_suffix = "_1000"; add_this_line = False
+        elif "교직원" in line:
+            new_suffix = "_FACULTY"; add_this_line = False
+        elif "[식사]" in line or "<식사>" in line:
+            new_suffix = "_RESET"; add_this_line = False
+        elif re.search(r'Take\s*-?\s*out|테이크\s*아웃|카페|Cafe', line, re.IGNORECASE):
+            new_suffix = "_TAKEOUT"; add_this_line = False
+        elif re.search(r'[\[\<]?\s*A코너\s*[\]\>]?', line):
+            new_suffix = "_A"
+            content_to_add = re.sub(r'[\[\<]?\s*A코너\s*[\]\>]?[\s:]*', '', line)
+        elif re.search(r'[\[\<]?\s*B코너\s*[\]\>]?', line):
+            new_suffix = "_B"
+            content_to_add = re.sub(r'[\[\<]?\s*B코너\s*[\]\>]?[\s:]*', '', line)
+        elif re.search(r'[\[\<]?\s*C코너\s*[\]\>]?', line):
+            new_suffix = "_C"
+            content_to_add = re.sub(r'[\[\<]?\s*C코너\s*[\]\>]?[\s:]*', '', line)
+        elif "셀프" in line:
+            new_suffix = "_SELF"
+            content_to_add = re.sub(r'[\[\<]?\s*(셀프코너|셀프)\s*[\]\>]?[\s:]*', '', line)
+        elif "주문" in line:
+            if any(bad in line for bad in ["마감", "시간", "종료"]):
+                continue
+            new_suffix = "_ORDER"
+            content_to_add = re.sub(r'[\[\<]?\s*(주문식\s*메뉴|주문식|주문)\s*[\]\>]?[\s:]*', '', line)
+
+        if new_suffix:
+            if current_items and not ignore_mode:
+                generated_menus.append(MenuData(meal_type=current_meal_type, menu_items=current_items, date=target_date))
+            if new_suffix == "_RESET":
+                ignore_mode = False; current_meal_type = meal_type; current_items = []
+            else:
+                ignore_mode = False; current_meal_type = f"{meal_type}{new_suffix}"; current_items = []
+            if add_this_line and not ignore_mode:
+                cleaned = legacy_snu_clean(content_to_add)
+                if cleaned and len(cleaned) > 1:
+                    current_items.append(cleaned)
+            continue
+        if not ignore_mode:
+            cleaned = legacy_snu_clean(line)
+            if cleaned and len(cleaned) > 1:
+                current_items.append(cleaned)
+    if current_items and not ignore_mode:
+        generated_menus.append(MenuData(meal_type=current_meal_type, menu_items=current_items, date=target_date))
+    return generated_menus
+
+
+def legacy_kaist_clean(text, tail_numbers=False):
+    text = re.sub(r'[\[\(][0-9.,원\s]+[\]\)]', '', text)
+    text = text.replace('"', '').replace('★', '').strip()
+    ignore_keywords = [
+        "천원", "제공", "캠페인", "운영시간", "안녕하세요",
+        "학생증", "간식", "참고", "감사합니다", "부탁", "소지", "kcal",
+        "원산지", "게시", "주간", "변경", "문의", "종료", "함께", "리더십", "미운영"
+    ]
+    if any(keyword in text for keyword in ignore_keywords):
+        text = ""
+    elif len(text) <= 1:
+        text = ""
+    text = text.strip()
+    if tail_numbers:
+        text = re.sub(r'\d+(?:,\d+)*$', '', text).strip()
+    return text
+
+
+def legacy_kaist_column(lines, target_date, keywords_map, default_category=None, tail_numbers=False):
+    extracted_menus = []
+    current_category = default_category
+    current_items = []
+    for line in lines:
+        is_header = False
+        for key, category_code in keywords_map.items():
+            if key in line:
+                if current_category and current_items:
+                    extracted_menus.append(MenuData(meal_type=current_category, menu_items=current_items, date=target_date))
+                current_category = category_code
+                current_items = []
+                is_header = True
+                break
+        if is_header:
+            continue
+        if current_category:
+            cleaned = legacy_kaist_clean(line, tail_numbers)
+            if cleaned and "원" not in cleaned:
+                current_items.append(cleaned)
+    if current_category and current_items:
+        extracted_menus.append(MenuData(meal_type=current_category, menu_items=current_items, date=target_date))
+    return extracted_menus
+
+
+def legacy_uos_clean(text):
+    text = re.sub(r'\([0-9,]+원\)', '', text)
+    text = text.replace('"', '').strip()
+    ignore_keywords = [
+        "kcal", "g/", "원산지", "돈육", "계육", "우육", "국내산", "호주산", "브라질산",
+        "중국산", "식재료", "조달", "내부", "사정", "변동", "토핑", "코너", "운영시간",
+        "식단", "제공", "마감", "입장", "예약", "신청", "이메일", "접수", "회신", "인원",
+        "주간별", "미운영"
+    ]
+    if re.search(r'\d{1,2}:\d{2}~\d{1,2}:\d{2}', text): return ""
+    if "원" in text and re.search(r'[0-9,]', text): return ""
+    if not re.search(r'[가-힣]', text): return ""
+    if any(keyword in text for keyword in ignore_keywords): return ""
+    if len(text) <= 1: return ""
+    return text.strip()
+
+# =============================================================================
+# 벤치마크용 줄 묶음 (실제 식단 페이지에 나오는 줄 모양을 섞음)
+# =============================================================================
+
+SAMPLE_LINES = [
+    "잡곡밥", "된장찌개", "제육볶음(돼지고기:국내산)", "배추김치", "<A코너> 돈까스", "[B코너]: 순두부찌개",
+    "C코너", "뷔페", "천원의 아침밥", "교직원", "[식사]", "Take-out", "테이크 아웃", "카페 메뉴",
+    "셀프코너: 라면", "주문식 메뉴 : 우동", "주문 마감 19:00", "※ 식단은 사정에 따라 변경될 수 있습니다",
+    "5,000원", "(4,500원)", "운영시간 11:30~13:30", "찌개5,6,10", "★오늘의 특식★", "kcal 850",
+    "원산지: 쌀(국내산)", "자율배식", "A코너", "B코너", "계란말이", "콩나물국", "닭갈비(#)", "요거트",
+]
+
+
+class _Lines:
+    """SnuScraper._parse_menu_column에 줄 목록을 TD 요소처럼 넘기기 위한 껍데기"""
+
+    def __init__(self, lines):
+        self.lines = lines
+
+    def get_text(self, separator=""):
+        return separator.join(self.lines)
+
+
+def make_columns(count: int, size: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [[rng.choice(SAMPLE_LINES) for _ in range(size)] for _ in range(count)]
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def run(count: int, size: int, repeat: int):
+    today = date.today()
+    columns = make_columns(count, size)
+    print(f"📏 {count}칸 x {size}줄 ({count * size}줄), {repeat}회 평균\n")
+
+    snu = SnuScraper()
+    kaimaru, munji, uos = KaimaruParser(), MunjiParser(), StudentHall1Parser()
+    kaimaru_map = {"자율배식": "LUNCH", "A코너": "LUNCH_A", "B코너": "LUNCH_B"}
+    all_lines = [line for column in columns for line in column]
+
+    cases = [
+        (
+            "SNU 줄 분류 + 정리",
+            lambda: [legacy_snu_column(c, "LUNCH", today) for c in columns],
+            lambda: [snu._parse_menu_column(_Lines(c), "LUNCH", today) for c in columns],
+        ),
+        (
+            "KAIST 헤더 + 정리",
+            lambda: [legacy_kaist_column(c, today, kaimaru_map) for c in columns],
+            lambda: [kaimaru._parse_column(c, today, kaimaru_map) for c in columns],
+        ),
+        (
+            "KAIST 문지 (꼬리 숫자)",
+            lambda: [legacy_kaist_column(c, today, {}, "LUNCH", tail_numbers=True) for c in columns],
+            lambda: [munji._parse_column(c, today, {}, "LUNCH") for c in columns],
+        ),
+        (
+            "UOS 정리",
+            lambda: [legacy_uos_clean(line) for line in all_lines],
+            lambda: [uos._clean_menu_item(line) for line in all_lines],
+        ),
+    ]
+
+    for name, legacy, current in cases:
+        legacy_ms, legacy_result = timed(legacy, repeat)
+        current_ms, current_result = timed(current, repeat)
+        same = "✅ 결과 같음" if legacy_result == current_result else "❌ 결과 다름"
+        print(f"  {name:<20} 예전 {legacy_ms:8.2f}ms -> 지금 {current_ms:8.2f}ms  (x{legacy_ms / current_ms:4.1f})  {same}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="메뉴 줄 분류/정리 규칙 마이크로 벤치마크 (예전 코드 vs 컴파일된 규칙)")
+    parser.add_argument("--columns", type=int, default=300, help="식단 칸 개수")
+    parser.add_argument("--lines", type=int, default=12, help="칸당 줄 수")
+    parser.add_argument("--repeat", type=int, default=10, help="반복 횟수 (평균)")
+    args = parser.parse_args()
+
+    run(args.columns, args.lines, args.repeat)
@@ -0,0 +1,143 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# backend 폴더를 파이썬 패스에 추가해서 app 모듈을 찾을 수 있게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.db import models
+from app.db.base import Base
+from app.schemas.crawler import CafeteriaData, MenuData, SchoolData
+from app.services.db_service import save_school_data
+from app.services.dimension_cache import dimension_cache
+
+MEAL_TYPES = ["BREAKFAST", "LUNCH", "LUNCH_A", "LUNCH_B", "DINNER", "DINNER_SPECIAL"]
+
+
+async def legacy_save_school_data(session: AsyncSession, data: SchoolData):
+    """예전 저장 로직 그대로 (메뉴마다 SELECT 후 INSERT/UPDATE)"""
+    result = await session.execute(select(models.School).where(models.School.name == data.school_name))
+    school = result.scalars().first()
+    if not school:
+        school = models.School(name=data.school_name, region=data.school_region)
+        session.add(school)
+        await session.flush()
+
+    for caf_data in data.cafeterias:
+        result = await session.execute(
+            select(models.Cafeteria)
+            .where(models.Cafeteria.school_id == school.id)
+            .where(models.Cafeteria.name == caf_data.name)
+        )
+        cafeteria = result.scalars().first()
+        if not cafeteria:
+            cafeteria = models.Cafeteria(school_id=school.id, name=caf_data.name)
+            session.add(cafeteria)
+            await session.flush()
+
+        for menu_data in caf_data.menus:
+            final_menu_text = "\n".join(menu_data.menu_items)
+            result = await session.execute(
+                select(models.Menu)
+                .where(models.Menu.cafeteria_id == cafeteria.id)
+                .where(models.Menu.date == menu_data.date)
+                .where(models.Menu.meal_type == menu_data.meal_type)
+            )
+            existing_menu = result.scalars().first()
+            if existing_menu:
+                existing_menu.menu_text = final_menu_text
+            else:
+                session.add(models.Menu(
+                    cafeteria_id=cafeteria.id,
+                    date=menu_data.date,
+                    meal_type=menu_data.meal_type,
+                    menu_text=final_menu_text,
+                ))
+    await session.commit()
+
+
+def make_school(cafeterias: int, days: int, version: int) -> SchoolData:
+    start = date(2026, 3, 2)
+    return SchoolData(
+        school_name="벤치마크대학교",
+        school_region="서울",
+        cafeterias=[
+            CafeteriaData(
+                name=f"식당 {c}",
+                menus=[
+                    MenuData(
+                        meal_type=meal_type,
+                        date=start + timedelta(days=d),
+                        menu_items=[f"메뉴{version}-{c}-{d}-{i}" for i in range(5)],
+                    )
+                    for d in range(days) for meal_type in MEAL_TYPES
+                ],
+            )
+            for c in range(cafeterias)
+        ],
+    )
+
+
+async def run_path(name, save, data_v1, data_v2):
+    # 학교/식당 캐시는 프로세스 전역이라 DB를 바꿀 때마다 비워야 함
+    dimension_cache.invalidate()
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        statements = {"count": 0}
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def count(*args):
+            statements["count"] += 1
+
+        Session = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        results = []
+        # 처음 저장(전부 INSERT) -> 내용이 바뀐 같은 데이터 다시 저장(전부 UPDATE) -> 똑같은 데이터 또 저장(바뀐 것 없음)
+        for label, data in (("신규", data_v1), ("갱신", data_v2), ("그대로", data_v2)):
+            statements["count"] = 0
+            async with Session() as session:
+                start = time.perf_counter()
+                await save(session, data)
+                elapsed = time.perf_counter() - start
+            results.append((label, elapsed, statements["count"]))
+
+        async with Session() as session:
+            rows = (await session.execute(select(func.count(models.Menu.id)))).scalar()
+        await engine.dispose()
+
+    for label, elapsed, count in results:
+        print(f"  {name:<8} {label}: {elapsed * 1000:9.1f}ms  SQL {count:6d}번  (저장된 메뉴 {rows}개)")
+    return results
+
+
+async def main(cafeterias: int, days: int):
+    data_v1 = make_school(cafeterias, days, 1)
+    data_v2 = make_school(cafeterias, days, 2)
+    total = cafeterias * days * len(MEAL_TYPES)
+    print(f"📦 식당 {cafeterias}곳 x {days}일 x 식사 {len(MEAL_TYPES)}종 = 메뉴 {total}개\n")
+
+    # 저장 로그(print)가 섞여도 결과 줄은 맨 아래에 모아서 보여줌
+    legacy = await run_path("예전", legacy_save_school_data, data_v1, data_v2)
+    upsert = await run_path("upsert", save_school_data, data_v1, data_v2)
+
+    print()
+    for (label, old_s, old_n), (_, new_s, new_n) in zip(legacy, upsert):
+        print(f"  {label}: {old_s * 1000:.0f}ms -> {new_s * 1000:.0f}ms (x{old_s / new_s:.1f}), SQL {old_n}번 -> {new_n}번")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="메뉴 저장: 예전 N+1 방식 vs INSERT ... ON CONFLICT 일괄 저장")
+    parser.add_argument("--cafeterias", type=int, default=20, help="식당 수")
+    parser.add_argument("--days", type=int, default=90, help="날짜 수")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.cafeterias, args.days))
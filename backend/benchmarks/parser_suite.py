@@ -0,0 +1,184 @@
+"""
+파서 회귀 테스트 + 성능 측정 (네트워크 없이 fixtures 폴더만 사용).
+
+  python benchmarks/parser_suite.py                  # 정답 비교 + 속도/메모리 측정
+  python benchmarks/parser_suite.py --update-golden  # 파서를 일부러 바꿨을 때 정답 갱신
+  python benchmarks/parser_suite.py --save-baseline  # 지금 속도를 기준값으로 저장
+  python benchmarks/parser_suite.py --threshold 1.3  # 기준값보다 1.3배 넘게 느려지면 실패
+
+fixtures/manifest.json 한 줄 = 사례 하나 (학교, 날짜, 페이지 파일들).
+페이지는 스냅샷 저장소(/data/snapshots)에 쌓인 실제 HTML로 바꿔 넣어도 됨.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+# backend 폴더를 파이썬 패스에 추가해서 app 모듈을 찾을 수 있게 함
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(BENCH_DIR))
+
+from app.core.config import settings
+from app.schemas.crawler import RawPage
+from app.services.crawler.html import BACKENDS, resolve_backend
+from app.services.crawler.registry import SCRAPER_REGISTRY
+
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "results", "parser_baseline.json")
+# 정답(golden)은 항상 이 백엔드로 만듦 (어디서나 설치돼 있는 기본 파서)
+REFERENCE_BACKEND = "html.parser"
+
+
+def load_manifest():
+    with open(os.path.join(FIXTURE_DIR, "manifest.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_pages(case):
+    pages = []
+    for page in case["pages"]:
+        with open(os.path.join(FIXTURE_DIR, page["file"]), encoding="utf-8") as f:
+            pages.append(RawPage(
+                key=page["key"],
+                html=f.read(),
+                target_date=date.fromisoformat(page["target_date"]),
+            ))
+    return pages
+
+
+def golden_path(case):
+    return os.path.join(FIXTURE_DIR, case["school"], f"{case['name']}.golden.json")
+
+
+def parse_case(scraper, case, pages, backend):
+    """사례 하나를 파싱해서 {날짜: SchoolData(JSON)} 형태로 (파서 로그는 숨김)"""
+    settings.CRAWLER_HTML_BACKEND = backend
+    dates = [date.fromisoformat(d) for d in case["dates"]]
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = scraper.parse_range_pages(pages, dates)
+    return {d.isoformat(): data.model_dump(mode="json") for d, data in sorted(results.items())}
+
+
+def describe_diff(expected, actual):
+    """어디가 달라졌는지 첫 번째 차이만 짧게"""
+    for day in sorted(set(expected) | set(actual)):
+        if day not in actual:
+            return f"{day}: 결과 없음"
+        if day not in expected:
+            return f"{day}: 정답에 없는 날짜"
+        exp_cafs = {c["name"]: c["menus"] for c in expected[day]["cafeterias"]}
+        act_cafs = {c["name"]: c["menus"] for c in actual[day]["cafeterias"]}
+        for name in sorted(set(exp_cafs) | set(act_cafs)):
+            if exp_cafs.get(name) != act_cafs.get(name):
+                return f"{day} / {name}: {exp_cafs.get(name)} != {act_cafs.get(name)}"
+    return "알 수 없는 차이"
+
+
+def measure(scraper, case, pages, backend, repeat):
+    """페이지당 파싱 시간(ms)과 최대 메모리(KB)"""
+    parse_case(scraper, case, pages, backend)  # 워밍업 (import, 정규식 컴파일 등)
+
+    # 평균 대신 가장 빠른 회차를 씀 (다른 프로세스 때문에 튀는 값에 덜 흔들림)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse_case(scraper, case, pages, backend)
+        best = min(best, time.perf_counter() - start)
+    ms_per_page = best / len(pages) * 1000
+
+    tracemalloc.start()
+    parse_case(scraper, case, pages, backend)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return ms_per_page, peak / 1024
+
+
+def run(update_golden=False, repeat=5, baseline_path=DEFAULT_BASELINE, save_baseline=False, threshold=None, only=None):
+    # 설치 안 된 백엔드는 다른 걸로 대체되니까 실제로 다른 것만
+    backends = sorted({resolve_backend(b) for b in BACKENDS}, key=BACKENDS.index)
+    original_backend = settings.CRAWLER_HTML_BACKEND
+
+    baseline = {}
+    if os.path.exists(baseline_path):
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    failures = []
+    measured = {}
+    print(f"🧪 파서 회귀 테스트 + 벤치마크 (백엔드: {', '.join(backends)})\n")
+
+    for case in load_manifest():
+        if only and case["school"] != only:
+            continue
+        scraper = SCRAPER_REGISTRY[case["school"]].load()
+        pages = load_pages(case)
+        path = golden_path(case)
+
+        if update_golden:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(parse_case(scraper, case, pages, REFERENCE_BACKEND), f, ensure_ascii=False, indent=2)
+                f.write("\n")
+            print(f"  ✍️ 정답 갱신: {os.path.relpath(path, BENCH_DIR)}")
+            continue
+
+        if not os.path.exists(path):
+            failures.append(f"{case['name']}: 정답 파일 없음 (--update-golden으로 먼저 만들어야 함)")
+            continue
+        with open(path, encoding="utf-8") as f:
+            expected = json.load(f)
+
+        print(f"🏫 {case['name']} (페이지 {len(pages)}장)")
+        for backend in backends:
+            actual = parse_case(scraper, case, pages, backend)
+            ok = actual == expected
+            if not ok:
+                failures.append(f"{case['name']} [{backend}]: {describe_diff(expected, actual)}")
+
+            ms, peak_kb = measure(scraper, case, pages, backend, repeat)
+            key = f"{case['name']}|{backend}"
+            measured[key] = {"ms_per_page": round(ms, 3), "peak_kb": round(peak_kb, 1)}
+
+            note = ""
+            if key in baseline:
+                ratio = ms / baseline[key]["ms_per_page"]
+                note = f"기준 대비 x{ratio:.2f}"
+                if threshold and ratio > threshold:
+                    failures.append(f"{case['name']} [{backend}]: {ms:.2f}ms/page (기준 {baseline[key]['ms_per_page']}ms, x{ratio:.2f} > x{threshold})")
+                    note += " 🐢"
+            mark = "✅" if ok else "❌"
+            print(f"  {mark} {backend:<12} {ms:8.2f}ms/page  최대 {peak_kb:8.1f}KB  {note}")
+
+    settings.CRAWLER_HTML_BACKEND = original_backend
+
+    if save_baseline and measured:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(measured, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 기준값 저장: {baseline_path}")
+
+    if failures:
+        print("\n❌ 실패:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    if not update_golden:
+        print("\n✅ 전부 통과!")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="파서 정답(golden) 비교 + 파싱 속도/메모리 측정 (오프라인)")
+    parser.add_argument("--update-golden", action="store_true", help="지금 파서 결과로 정답 파일을 다시 만듦")
+    parser.add_argument("--repeat", type=int, default=5, help="속도 측정 반복 횟수")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="속도 기준값 파일")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 측정값을 기준값으로 저장")
+    parser.add_argument("--threshold", type=float, help="기준값 대비 이 배수보다 느려지면 실패 (예: 1.3)")
+    parser.add_argument("--school", help="이 학교(레지스트리 짧은 이름, 예: kaist)만")
+    args = parser.parse_args()
+
+    sys.exit(run(args.update_golden, args.repeat, args.baseline, args.save_baseline, args.threshold, args.school))
@@ -0,0 +1,189 @@
+"""
+자주 도는 쿼리가 인덱스를 타는지 확인 (EXPLAIN QUERY PLAN).
+
+  python benchmarks/query_plans.py            # 계획 출력 + 테이블 통째로 훑는(SCAN) 쿼리가 있으면 실패
+  python benchmarks/query_plans.py --analyze  # ANALYZE 통계를 만든 뒤에 확인
+
+임시 SQLite 파일에 alembic 마이그레이션(head)을 그대로 적용하고,
+실제 코드(/daily, /range, /calendar, AutoFiller, AIService, 저장, 청소)를 돌리면서 나가는 SELECT/UPDATE/DELETE를 모아 계획을 봄.
+쿼리를 여기에 따로 베껴두지 않아서 코드가 바뀌면 바뀐 쿼리가 그대로 검사됨.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+from datetime import date, timedelta
+
+# backend 폴더를 파이썬 패스에 추가해서 app 모듈을 찾을 수 있게 함
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+# app을 import하기 전에 DB 주소를 임시 파일로 바꿔둠 (실제 DB는 건드리지 않음)
+TMP_DIR = tempfile.mkdtemp(prefix="haksik-plan-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(TMP_DIR, 'plan.db')}"
+os.environ["MENU_ARCHIVE_DIR"] = os.path.join(TMP_DIR, "archive")
+# /daily 응답 캐시는 끔 (매번 실제 쿼리가 나가야 측정/검사가 됨)
+os.environ["DAILY_CACHE_MAX_BYTES"] = "0"
+
+import httpx
+from alembic import command
+from alembic.config import Config
+from fastapi import FastAPI
+from sqlalchemy import event, update
+from app.db import models
+from app.db.session import AsyncSessionLocal, engine, get_read_db
+from app.db.init_data import initialize_school_data
+from app.api.v1.endpoints import calendar, menus
+from app.schemas.crawler import CafeteriaData, MenuData, SchoolData
+from app.services.ai_service import AIService
+from app.services.auto_filler import AutoFiller
+from app.services.crawler.registry import SCRAPER_REGISTRY
+from app.services.db_service import save_school_data, delete_old_menus
+
+CHECKED = ("SELECT", "UPDATE", "DELETE")
+
+
+def sample_school(spec, dates):
+    return SchoolData(
+        school_name=spec.school_name,
+        school_region=spec.region,
+        cafeterias=[
+            CafeteriaData(
+                name=name,
+                menus=[
+                    MenuData(meal_type=meal_type, date=d, menu_items=["쌀밥", f"{name} 국"])
+                    for d in dates for meal_type in ("BREAKFAST", "LUNCH", "DINNER")
+                ],
+            )
+            for name in spec.cafeterias
+        ],
+    )
+
+
+async def seed(today):
+    """레지스트리 학교/식당 + 며칠치 메뉴 (이미지는 다 있는 걸로 해서 AIService가 외부 호출을 안 하게)"""
+    dates = [today + timedelta(days=i) for i in range(-5, 3)]
+    async with AsyncSessionLocal() as session:
+        await initialize_school_data(session)
+        for spec in SCRAPER_REGISTRY.values():
+            await save_school_data(session, sample_school(spec, dates))
+        await session.execute(update(models.Menu).values(image_url_3d="seed.png"))
+        await session.commit()
+
+
+async def capture_hot_queries(today):
+    """{이름: [(SQL, 파라미터)]} - 실제 코드 경로를 돌리면서 나간 쿼리들"""
+    captured = {}
+    current = {"label": None}
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        label = current["label"]
+        if label and statement.lstrip().upper().startswith(CHECKED):
+            queries = captured.setdefault(label, [])
+            if statement not in [sql for sql, _ in queries]:
+                queries.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+
+    # API는 HTTP로 (읽기 세션은 쿼리를 잡는 쓰기 엔진 세션으로 바꿔 끼움 - 계획은 같음)
+    app = FastAPI()
+    app.include_router(menus.router, prefix="/api/v1")
+    app.include_router(calendar.router, prefix="/api/v1")
+
+    async def read_db():
+        async with AsyncSessionLocal() as session:
+            yield session
+
+    app.dependency_overrides[get_read_db] = read_db
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+    async def api(path, **params):
+        response = await client.get(f"/api/v1{path}", params=params)
+        response.raise_for_status()
+
+    kaist = SCRAPER_REGISTRY["kaist"]
+    paths = [
+        ("/daily", lambda s: api("/daily", school_name=kaist.school_name, target_date=today.isoformat())),
+        ("/range", lambda s: api("/range", school_name=kaist.school_name, start=(today - timedelta(days=3)).isoformat(), end=(today + timedelta(days=3)).isoformat())),
+        ("/calendar", lambda s: api("/calendar", school_name=kaist.school_name, month=today.strftime("%Y-%m"))),
+        ("AutoFiller 개수 확인", lambda s: AutoFiller(["kaist"])._plan_jobs(s, [today], today)),
+        ("AIService 이미지 없는 메뉴", lambda s: AIService().generate_daily_images(s, today, kaist.school_name)),
+        ("save_school_data", lambda s: save_school_data(s, sample_school(kaist, [today]))),
+        ("delete_old_menus", lambda s: delete_old_menus(s, days=3)),
+    ]
+    try:
+        for label, run in paths:
+            current["label"] = label
+            async with AsyncSessionLocal() as session:
+                # 각 경로가 찍는 로그는 숨김 (계획만 보기 좋게)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    await run(session)
+    finally:
+        current["label"] = None
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+        await client.aclose()
+    return captured
+
+
+def full_scans(plan):
+    """
+    계획에서 테이블/인덱스를 처음부터 끝까지 훑는 단계.
+    "SCAN t USING INDEX ..."도 인덱스 전체를 도는 거라 같이 잡음 (SEARCH만 통과)
+    """
+    return [detail for detail in plan if detail.startswith("SCAN ")]
+
+
+async def main(analyze: bool):
+    today = date.today()
+    # env.py가 자기 이벤트 루프를 돌리니까 여기서는 스레드로 (이미 돌고 있는 루프 안이라서)
+    await asyncio.to_thread(command.upgrade, Config(os.path.join(BACKEND_DIR, "alembic.ini")), "head")
+    with contextlib.redirect_stdout(io.StringIO()):
+        await seed(today)
+
+    if analyze:
+        async with engine.begin() as conn:
+            await conn.exec_driver_sql("ANALYZE")
+    captured = await capture_hot_queries(today)
+
+    async with engine.connect() as conn:
+        failures = []
+        print(f"🔎 자주 도는 쿼리 실행 계획 (ANALYZE {'함' if analyze else '안 함'})\n")
+        for label, queries in captured.items():
+            print(f"📌 {label}")
+            for sql, parameters in queries:
+                result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", parameters)
+                plan = [row[3] for row in result.all()]
+                scans = full_scans(plan)
+                if scans:
+                    failures.append(f"{label}: {' / '.join(scans)}\n      {' '.join(sql.split())}")
+                print(f"  {'❌' if scans else '✅'} {' '.join(sql.split())[:110]}")
+                for detail in plan:
+                    print(f"       - {detail}")
+            print()
+
+        missing = [label for label in ("/daily", "/range", "/calendar", "AutoFiller 개수 확인", "AIService 이미지 없는 메뉴", "save_school_data") if label not in captured]
+        for label in missing:
+            failures.append(f"{label}: 쿼리를 하나도 못 잡음 (코드 경로가 바뀌었는지 확인)")
+
+    await engine.dispose()
+    shutil.rmtree(TMP_DIR, ignore_errors=True)
+
+    if failures:
+        print("❌ 실패:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("✅ 전부 인덱스를 탐 (SCAN 없음)")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="자주 도는 쿼리의 EXPLAIN QUERY PLAN 확인 (테이블 전체 스캔이면 실패)")
+    parser.add_argument("--analyze", action="store_true", help="ANALYZE로 통계를 만든 다음 확인")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(main(args.analyze)))
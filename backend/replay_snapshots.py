@@ -0,0 +1,56 @@
+import argparse
+import asyncio
+import sys
+import os
+from datetime import date
+
+# 현재 경로(backend)를 파이썬 패스에 추가해서 app 모듈을 찾을 수 있게 함
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import settings
+
+# 🔴 네트워크 대신 스냅샷 저장소에서 읽도록 강제 (학교 사이트는 절대 안 건드림)
+settings.CRAWLER_REPLAY = True
+
+from app.db.session import AsyncSessionLocal
+from app.services.crawler.scrapers import get_scrapers
+from app.services.db_service import save_school_data
+from app.services.normalizer import normalize_results
+
+
+async def replay(start: date, end: date, school: str = None, dry_run: bool = False):
+    """
+    저장된 HTML 원본으로 start ~ end 기간을 다시 파싱해서 DB에 넣음.
+    파서를 고친 뒤 과거 날짜를 재수집할 때 사용.
+    """
+    print(f"⏪ 스냅샷 재파싱 시작: {start} ~ {end} (대상: {school or '전체'})")
+
+    async with AsyncSessionLocal() as session:
+        for scraper in get_scrapers([school] if school else None):
+            results = normalize_results(await scraper.parse_range(start, end))
+            if not results:
+                print(f"  💤 {scraper.school_name}: 저장된 스냅샷 없음")
+                continue
+
+            for target_date, school_data in sorted(results.items()):
+                menu_count = sum(len(caf.menus) for caf in school_data.cafeterias)
+                print(f"  ✅ {scraper.school_name} {target_date}: 식당 {len(school_data.cafeterias)}곳 / 메뉴 {menu_count}개")
+                if not dry_run:
+                    await save_school_data(session, school_data)
+
+    print("✅ 재파싱 완료!")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="스냅샷 저장소의 HTML로 오프라인 재파싱")
+    parser.add_argument("start", type=date.fromisoformat, help="시작 날짜 (예: 2026-03-02)")
+    parser.add_argument("end", type=date.fromisoformat, help="끝 날짜 (예: 2026-03-06)")
+    parser.add_argument("--school", help="학교 이름 또는 짧은 이름 (예: KAIST, snu). 없으면 전체")
+    parser.add_argument("--dry-run", action="store_true", help="DB에 저장하지 않고 파싱 결과만 출력")
+    args = parser.parse_args()
+
+    # 윈도우 사용자라면 이벤트 루프 정책 설정이 필요할 수 있어
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(replay(args.start, args.end, args.school, args.dry_run))
@@ -8,6 +8,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from app.db.session import engine
 from app.db.base import Base
 from app.db import models # 🔴 이걸 임포트해야 테이블 정보가 Base에 등록돼!
+from app.services.crawler.fetch_cache import fetch_cache
 
 async def reset_database():
     print("💣 데이터베이스 초기화 시작...")
@@ -20,6 +21,9 @@ async def reset_database():
         # 2. 테이블 다시 생성
         print("✨ 새 테이블 생성 중...")
         await conn.run_sync(Base.metadata.create_all)
+
+    # DB가 비었으니 크롤러 캐시도 비워야 다음 크롤링에서 전부 다시 받아옴
+    fetch_cache.clear()
         
     print("✅ 초기화 완료! 이제 아주 깨끗해졌어.")
 
@@ -0,0 +1,55 @@
+import argparse
+import asyncio
+import sys
+import os
+
+# 현재 경로(backend)를 파이썬 패스에 추가해서 app 모듈을 찾을 수 있게 함
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import settings
+from app.db.session import IS_SQLITE, engine
+from app.services.db_maintenance import convert_auto_vacuum, db_file_stats
+
+
+async def vacuum_database(dry_run: bool = False):
+    """
+    이미 있는 SQLite DB의 auto_vacuum 모드를 설정값(DB_AUTO_VACUUM)으로 바꾸는 1회용 작업.
+    VACUUM이 DB 파일 전체를 다시 쓰는 동안 크롤링/청소 저장이 전부 기다리니까 점검 시간(크롤링 없는 때)에 실행.
+    한 번 바꾸면 그다음부터는 매일 정리 작업이 빈 페이지를 조금씩 반납함.
+    """
+    if not IS_SQLITE:
+        print("💤 SQLite가 아니라서 할 일 없음 (PostgreSQL은 autovacuum이 알아서 함)")
+        return
+
+    stats = await db_file_stats(engine)
+    print(
+        f"📦 DB 파일 {stats['file_bytes'] / 1024 / 1024:.1f}MB / 빈 페이지 {stats['freelist_count']}개 "
+        f"/ auto_vacuum {stats['auto_vacuum']} (설정값 {settings.DB_AUTO_VACUUM.upper()})"
+    )
+    if dry_run:
+        return
+    if not await convert_auto_vacuum(engine):
+        print("✅ 이미 설정값이라 할 일 없음")
+        return
+
+    stats = await db_file_stats(engine)
+    print(f"✅ 전환 완료! DB 파일 {stats['file_bytes'] / 1024 / 1024:.1f}MB / auto_vacuum {stats['auto_vacuum']}")
+
+
+async def main(dry_run: bool):
+    try:
+        await vacuum_database(dry_run)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SQLite auto_vacuum 모드 전환 (VACUUM 1번, 점검 시간에 실행)")
+    parser.add_argument("--dry-run", action="store_true", help="지금 상태만 보고 바꾸지는 않음")
+    args = parser.parse_args()
+
+    # 윈도우 사용자라면 이벤트 루프 정책 설정이 필요할 수 있어
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+    asyncio.run(main(args.dry_run))
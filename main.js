@@ -22,6 +22,10 @@ let schoolSetupWin = null;
 let calendarWin = null;
 let updateWin = null;
 
+// 🍱 메뉴 응답 캐시 ("학교|날짜" -> { etag, data }). 새로고침할 때 ETag로 물어보고 바뀐 것만 다시 받음
+const dailyMenuCache = new Map();
+const DAILY_MENU_CACHE_SIZE = 30;
+
 // 💾 저장된 설정 불러오기
 let currentZoomLevel = Number(store.get('zoomLevel', 1.0));
 let currentLang = store.get('language', 'ko');
@@ -400,12 +404,27 @@ app.whenReady().then(() => {
   // ipcMain 핸들러들이 모여있는 곳에 추가해
   ipcMain.handle('fetch-daily-menu', async (event, { schoolName, date }) => {
       try {
+          // 지난번에 받은 ETag를 같이 보내서, 메뉴가 그대로면 서버가 본문 없이 304만 보냄
+          const key = `${schoolName}|${date}`;
+          const cached = dailyMenuCache.get(key);
           const response = await axios.get('https://haksikmukja-server.fly.dev/api/v1/daily', {
               params: {
                   school_name: schoolName,
                   target_date: date
-              }
+              },
+              headers: cached ? { 'If-None-Match': cached.etag } : {},
+              validateStatus: (status) => (status >= 200 && status < 300) || status === 304
           });
+          if (response.status === 304 && cached) {
+              return cached.data; // 그대로니까 가지고 있던 걸 반환
+          }
+          if (response.headers.etag) {
+              dailyMenuCache.delete(key); // 최근에 받은 걸 맨 뒤로 (오래된 것부터 버림)
+              dailyMenuCache.set(key, { etag: response.headers.etag, data: response.data });
+              if (dailyMenuCache.size > DAILY_MENU_CACHE_SIZE) {
+                  dailyMenuCache.delete(dailyMenuCache.keys().next().value);
+              }
+          }
           return response.data; // 데이터를 렌더러에게 반환
       } catch (error) {
           console.error("API Error:", error);